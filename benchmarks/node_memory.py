@@ -0,0 +1,122 @@
+"""
+Reports the memory used per BlockInfo and ParameterInfo of the syntax tree
+of an executable, built eagerly.
+
+The size of a node is the size of the object, its attribute dict if it has
+one, and the lists and dicts it owns. Strings and the shared ParameterSchema
+are not counted.
+
+Usage:
+    python benchmarks/node_memory.py [--json dump.json] [--baseline /path/to/other/checkout]
+
+Without --json a synthetic syntax dump is generated. With --baseline the
+same measure is also made with the peacock_trame of another checkout, for
+example one made with "git worktree add /tmp/baseline HEAD~1".
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Attributes that point to nodes owned by another block
+_NOT_OWNED = {"parent", "schema", "_pending", "_children_source"}
+
+
+def _attributes(obj):
+    attrs = getattr(obj, "__dict__", None)
+    if attrs is not None:
+        return attrs.items()
+    return ((name, getattr(obj, name)) for name in type(obj).__slots__)
+
+
+def measure(root, node_types):
+    """
+    Walks the nodes owned by root.
+    Return:
+        dict: class name -> [number of nodes, total bytes]
+    """
+    totals = {}
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        size = sys.getsizeof(node)
+        if hasattr(node, "__dict__"):
+            size += sys.getsizeof(node.__dict__)
+        for name, value in _attributes(node):
+            if name in _NOT_OWNED:
+                continue
+            if isinstance(value, (list, dict)):
+                size += sys.getsizeof(value)
+                if isinstance(value, dict):
+                    stack.extend(v for v in value.values() if isinstance(v, node_types))
+            elif isinstance(value, node_types):
+                stack.append(value)
+        total = totals.setdefault(type(node).__name__, [0, 0])
+        total[0] += 1
+        total[1] += size
+    return totals
+
+
+def runMeasure(args):
+    sys.path.insert(0, args.source)
+    from peacock_trame.app.core.input.BlockInfo import BlockInfo
+    from peacock_trame.app.core.input.ExecutableInfo import ExecutableInfo
+    from peacock_trame.app.core.input.ParameterInfo import ParameterInfo
+
+    exe_info = ExecutableInfo()
+    exe_info.readFromFiles(args.json)
+    print(json.dumps(measure(exe_info.path_map["/"], (BlockInfo, ParameterInfo))))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--json", help="Json syntax dump to load")
+    parser.add_argument(
+        "--baseline", help="Checkout of peacock-trame to compare against"
+    )
+    parser.add_argument("--source", default=ROOT, help=argparse.SUPPRESS)
+    parser.add_argument("--measure", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        runMeasure(args)
+        return
+
+    tmp = None
+    if not args.json:
+        sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+        from synthetic_schema import syntheticSchema
+
+        tmp = tempfile.NamedTemporaryFile("w", suffix=".json", delete=False)
+        json.dump(syntheticSchema(), tmp)
+        tmp.close()
+        args.json = tmp.name
+
+    sources = [("current", ROOT)]
+    if args.baseline:
+        sources.insert(0, ("baseline", os.path.abspath(args.baseline)))
+
+    env = dict(os.environ, PEACOCK_DISABLE_EXE_CACHE="1")
+    try:
+        print("%-10s %-14s %10s %14s" % ("tree", "node", "count", "bytes/node"))
+        for label, source in sources:
+            cmd = [sys.executable, __file__, "--measure", "--json", args.json]
+            cmd += ["--source", source]
+            out = subprocess.run(
+                cmd, env=env, check=True, stdout=subprocess.PIPE, text=True
+            ).stdout
+            result = json.loads(out.strip().splitlines()[-1])
+            for name, (count, size) in sorted(result.items()):
+                print("%-10s %-14s %10d %14.1f" % (label, name, count, size / count))
+    finally:
+        if tmp:
+            os.remove(tmp.name)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Compares the startup time and peak memory of building the syntax tree
+eagerly against the lazy mode of ExecutableInfo, and building it in this
+process against building it with a pool of workers.
+
+Each mode runs in its own process so that the peak RSS can be compared.
+The peak RSS doesn't include the workers.
+
+Usage:
+    python benchmarks/schema_load.py [--json dump.json | --exe /path/to/app-opt] [-i input.i] [--workers N]
+
+Without --json or --exe a synthetic syntax dump is generated.
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _maxRSS():
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        return rss / (1024 * 1024)
+    return rss / 1024
+
+
+def runMode(args):
+    from peacock_trame.app.core.input.ExecutableInfo import ExecutableInfo
+
+    base_rss = _maxRSS()
+    start = time.perf_counter()
+    exe_info = ExecutableInfo(lazy=args.mode == "lazy", workers=args.workers)
+    if args.exe:
+        exe_info.setPath(args.exe)
+    else:
+        exe_info.readFromFiles(args.json)
+    load_time = time.perf_counter() - start
+
+    tree_time = 0
+    if args.input:
+        from peacock_trame.app.core.input.InputTree import InputTree
+
+        start = time.perf_counter()
+        tree = InputTree(exe_info)
+        tree.setInputFile(args.input)
+        tree.getInputFileString()
+        tree_time = time.perf_counter() - start
+
+    print(
+        json.dumps(
+            {
+                "load": load_time,
+                "merge": exe_info.timings.get("merge", 0),
+                "tree": tree_time,
+                "rss": _maxRSS() - base_rss,
+            }
+        )
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--json", help="Json syntax dump to load")
+    parser.add_argument("--exe", help="Executable to load the syntax from")
+    parser.add_argument("-i", "--input", help="Input file to load into an InputTree")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=0,
+        help="Also build the syntax with this number of workers",
+    )
+    parser.add_argument("--mode", choices=["eager", "lazy"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        runMode(args)
+        return
+
+    tmp = None
+    if not args.json and not args.exe:
+        from synthetic_schema import syntheticSchema
+
+        tmp = tempfile.NamedTemporaryFile("w", suffix=".json", delete=False)
+        json.dump(syntheticSchema(), tmp)
+        tmp.close()
+        args.json = tmp.name
+
+    env = dict(os.environ, PEACOCK_DISABLE_EXE_CACHE="1")
+    try:
+        print(
+            "%-8s %8s %12s %12s %12s %12s"
+            % ("mode", "workers", "load (s)", "merge (s)", "tree (s)", "+RSS (MB)")
+        )
+        workers = sorted({0, args.workers})
+        for mode in ["eager", "lazy"]:
+            for num_workers in workers:
+                cmd = [sys.executable, __file__, "--mode", mode]
+                cmd += ["--workers", str(num_workers)]
+                for opt in ["json", "exe", "input"]:
+                    if getattr(args, opt):
+                        cmd += ["--%s" % opt, getattr(args, opt)]
+                out = subprocess.run(
+                    cmd, env=env, check=True, stdout=subprocess.PIPE, text=True
+                ).stdout
+                result = json.loads(out.strip().splitlines()[-1])
+                print(
+                    "%-8s %8d %12.3f %12.3f %12.3f %12.1f"
+                    % (
+                        mode,
+                        num_workers,
+                        result["load"],
+                        result["merge"],
+                        result["tree"],
+                        result["rss"],
+                    )
+                )
+    finally:
+        if tmp:
+            os.remove(tmp.name)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Generates a synthetic json syntax dump shaped like the output of a MOOSE
+executable run with "--json", for benchmarking without a real application.
+"""
+
+import argparse
+import json
+
+
+def _param(name, cpp_type, basic_type, default="", options=None, required=False):
+    data = {
+        "name": name,
+        "cpp_type": cpp_type,
+        "basic_type": basic_type,
+        "default": default,
+        "required": required,
+        "group_name": "",
+        "description": "Description of the %s parameter" % name,
+    }
+    if options:
+        data["options"] = options
+    return data
+
+
+def _objectParams(num_params):
+    params = {
+        "type": _param("type", "std::string", "String", required=True),
+        "variable": _param("variable", "NonlinearVariableName", "String"),
+        "block": _param("block", "std::vector<SubdomainName>", "Array:String"),
+        "boundary": _param("boundary", "std::vector<BoundaryName>", "Array:String"),
+        "enable": _param("enable", "bool", "Boolean", "1"),
+        "execute_on": _param(
+            "execute_on", "ExecFlagEnum", "String", "LINEAR", "NONE INITIAL LINEAR"
+        ),
+    }
+    for i in range(num_params):
+        name = "coef_%d" % i
+        params[name] = _param(name, "double", "Real", str(i * 0.5))
+    return params
+
+
+def _system(name, num_types, num_params):
+    types = {}
+    for i in range(num_types):
+        types["%sObject%d" % (name, i)] = {
+            "description": "Object %d of the %s system" % (i, name),
+            "parameters": _objectParams(num_params),
+        }
+    return {
+        "description": "The %s system" % name,
+        "associated_types": ["%sName" % name],
+        "actions": {
+            "AddAction": {
+                "parameters": {
+                    "active": _param(
+                        "active", "std::vector<std::string>", "Array:String", "__all__"
+                    ),
+                    "inactive": _param(
+                        "inactive", "std::vector<std::string>", "Array:String"
+                    ),
+                }
+            }
+        },
+        "star": {
+            "description": "",
+            "actions": {
+                "AddObjectAction": {
+                    "parameters": {
+                        "isObjectAction": _param(
+                            "isObjectAction", "bool", "Boolean", "1"
+                        )
+                    }
+                }
+            },
+            "subblock_types": types,
+        },
+    }
+
+
+def syntheticSchema(num_systems=20, num_types=200, num_params=20):
+    """
+    Input:
+        num_systems[int]: Number of top level blocks
+        num_types[int]: Number of object types in each block
+        num_params[int]: Number of extra parameters on each object type
+    Return:
+        dict: The json data
+    """
+    blocks = {}
+    for i in range(num_systems):
+        name = "System%d" % i
+        blocks[name] = _system(name, num_types, num_params)
+    return {"blocks": blocks}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("output", help="Json file to write")
+    parser.add_argument("--systems", type=int, default=20)
+    parser.add_argument("--types", type=int, default=200)
+    parser.add_argument("--params", type=int, default=20)
+    args = parser.parse_args()
+    with open(args.output, "w") as f:
+        json.dump(syntheticSchema(args.systems, args.types, args.params), f)
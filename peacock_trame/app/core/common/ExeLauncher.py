@@ -7,6 +7,7 @@
 # * Licensed under LGPL 2.1, please see LICENSE for details
 # * https://www.gnu.org/licenses/lgpl-2.1.html
 
+import codecs
 import os
 import subprocess
 
@@ -59,3 +60,64 @@ def runExe(app_path, args, print_errors=True):
             mooseutils.mooseWarning(msg)
         raise BadExecutableException(msg)
     return stdout_data
+
+
+def streamExe(app_path, args, chunk_size=1 << 16, print_errors=True):
+    """
+    Like runExe() but yields the output of the executable in chunks as it is produced
+    instead of buffering all of it in memory.
+    Input:
+        app_path: str: Path to the executable
+        args: either str or list: Arguments to pass to the executable
+        chunk_size: int: Number of bytes to read at a time
+    Return:
+        generator of str: Chunks of the output of running the command
+    Exceptions:
+        FileExistsException: If there was a problem running the executable
+        BadExecutableException: If the executable didn't exit cleanly.
+            This is raised once all the output has been read.
+    """
+    popen_args = [str(app_path)]
+    if isinstance(args, str):
+        popen_args.append(args)
+    else:
+        popen_args.extend(args)
+
+    try:
+        proc = subprocess.Popen(
+            popen_args, stdout=subprocess.PIPE, stderr=subprocess.STDOUT
+        )
+    except OSError as e:
+        msg = "Problem running '%s'" % " ".join(popen_args)
+        if print_errors:
+            mooseutils.mooseWarning(msg)
+        msg += "\nError: %s" % e
+        raise FileExistsException(msg)
+
+    # Only keep the end of the output around for error messages
+    tail_size = 1 << 16
+    tail = ""
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    try:
+        while True:
+            data = proc.stdout.read(chunk_size)
+            chunk = decoder.decode(data, final=not data)
+            if chunk:
+                tail = (tail + chunk)[-tail_size:]
+                yield chunk
+            if not data:
+                break
+    finally:
+        proc.stdout.close()
+        proc.wait()
+
+    if proc.returncode != 0:
+        msg = (
+            "'%s' exited with non zero status %s.\n\n"
+            "Please make sure your application is built and able to execute the given arguments.\n"
+            "Working dir: %s\n"
+            "Output: %s" % (" ".join(popen_args), proc.returncode, os.getcwd(), tail)
+        )
+        if print_errors:
+            mooseutils.mooseWarning(msg)
+        raise BadExecutableException(msg)
@@ -18,3 +18,7 @@ class FileExistsException(PeacockException):
 
 class BadExecutableException(PeacockException):
     pass
+
+
+class BadSchemaException(PeacockException):
+    pass
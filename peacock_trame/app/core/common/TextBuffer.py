@@ -0,0 +1,120 @@
+# * This file is part of the MOOSE framework
+# * https://www.mooseframework.org
+# *
+# * All rights reserved, see COPYRIGHT for full restrictions
+# * https://github.com/idaholab/moose/blob/master/COPYRIGHT
+# *
+# * Licensed under LGPL 2.1, please see LICENSE for details
+# * https://www.gnu.org/licenses/lgpl-2.1.html
+
+from .utils import utf16_length
+
+
+class TextBuffer(object):
+    """
+    Copy of the text of the editor that is patched with the changes made in it.
+    The text is kept as a list of lines so that a change only touches the lines
+    it is on. Positions are (line, column) starting at 0, with the columns
+    counted in UTF-16 code units like in the browser.
+    """
+
+    def __init__(self, text=""):
+        super(TextBuffer, self).__init__()
+        self._lines = []
+        self._text = None
+        # length of the text in UTF-16 code units
+        self.length = 0
+        # changes each time the text is changed
+        self.revision = 0
+        self.setText(text)
+
+    def setText(self, text):
+        self._lines = text.split("\n")
+        self._text = text
+        self.length = utf16_length(text)
+        self.revision += 1
+
+    def text(self):
+        if self._text is None:
+            self._text = "\n".join(self._lines)
+        return self._text
+
+    def lineCount(self):
+        return len(self._lines)
+
+    def line(self, index):
+        return self._lines[index]
+
+    def _index(self, line, column):
+        """
+        Index in a line of a column counted in UTF-16 code units
+        """
+        text = self._lines[line]
+        if text.isascii():
+            return min(column, len(text))
+        units = 0
+        for index, char in enumerate(text):
+            if units >= column:
+                return index
+            units += 2 if ord(char) > 0xFFFF else 1
+        return len(text)
+
+    def applyChange(self, start_line, start_column, end_line, end_column, text):
+        """
+        Replaces a range of the text
+        Input:
+            start_line[int], start_column[int]: Start of the range
+            end_line[int], end_column[int]: End of the range
+            text[str]: The new text of the range
+        Return:
+            tuple(int, int): The first and last lines that changed in the new text
+        Exceptions:
+            ValueError: If the range is not in the text
+        """
+        if not 0 <= start_line <= end_line < len(self._lines):
+            raise ValueError(
+                "Lines %s to %s are not in the text" % (start_line, end_line)
+            )
+        first = self._lines[start_line]
+        last = self._lines[end_line]
+        start = self._index(start_line, start_column)
+        end = self._index(end_line, end_column)
+        if start_line == end_line and end < start:
+            raise ValueError("The range ends before it starts")
+
+        old = self._lines[start_line : end_line + 1]
+        removed = sum(utf16_length(line) for line in old) + len(old) - 1
+        removed -= utf16_length(first[:start]) + utf16_length(last[end:])
+        new = (first[:start] + text + last[end:]).split("\n")
+        self._lines[start_line : end_line + 1] = new
+        self._text = None
+        self.length += utf16_length(text) - removed
+        self.revision += 1
+        return start_line, start_line + len(new) - 1
+
+    def applyChanges(self, changes, length=None):
+        """
+        Applies the changes of an edit one after the other, like the content
+        changes of the language server protocol
+        Input:
+            changes[list]: [start_line, start_column, end_line, end_column, text] of each change
+            length[int]: Length of the text the changes were made to, if known
+        Return:
+            tuple(int, int): The first and last lines that changed in the new text,
+            None if the text doesn't have the given length or a change doesn't fit.
+        """
+        if length is not None and length != self.length:
+            return None
+        lines = None
+        for change in changes:
+            try:
+                first, last = self.applyChange(*change)
+            except ValueError:
+                return None
+            if lines is not None:
+                # the lines after the change moved
+                shift = last - first - (change[2] - change[0])
+                end = lines[1] + shift if lines[1] > change[2] else lines[1]
+                first, last = min(lines[0], first), max(end, last)
+            lines = (first, min(last, len(self._lines) - 1))
+        return lines
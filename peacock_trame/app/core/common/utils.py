@@ -1,4 +1,5 @@
 import asyncio
+import difflib
 
 DEBOUNCE_TASKS = {}
 THROTTLE_VALS = {}
@@ -35,3 +36,67 @@ def throttled_run(callback, args=[], rate=float("inf")):
             await asyncio.sleep(1 / rate)
 
     THROTTLE_TASKS[func_name] = asyncio.create_task(task())
+
+
+def utf16_length(text):
+    # offsets in the browser are counted in UTF-16 code units
+    if text.isascii():
+        return len(text)
+    return len(text.encode("utf-16-le")) // 2
+
+
+def text_edits(old, new):
+    """
+    Replacements that turn the old text into the new one, as a list of
+    [start, end, text] where start and end are offsets in the old text.
+    Lines are compared first and the replaced lines are then trimmed down
+    to the characters that differ, so the edits are as small as what changed.
+    The offsets are in UTF-16 code units like the strings of the editor and
+    all of them refer to the old text.
+    """
+    if old == new:
+        return []
+    old_lines = old.splitlines(keepends=True)
+    new_lines = new.splitlines(keepends=True)
+
+    # most changes are local, only compare the lines in between
+    start = 0
+    end = min(len(old_lines), len(new_lines))
+    while start < end and old_lines[start] == new_lines[start]:
+        start += 1
+    old_end, new_end = len(old_lines), len(new_lines)
+    while (
+        old_end > start
+        and new_end > start
+        and old_lines[old_end - 1] == new_lines[new_end - 1]
+    ):
+        old_end -= 1
+        new_end -= 1
+    offset = utf16_length("".join(old_lines[:start]))
+    old_lines = old_lines[start:old_end]
+    new_lines = new_lines[start:new_end]
+
+    edits = []
+    matcher = difflib.SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        removed = "".join(old_lines[i1:i2])
+        if tag != "equal":
+            added = "".join(new_lines[j1:j2])
+            # trim what the lines have in common
+            size = min(len(removed), len(added))
+            head = 0
+            while head < size and removed[head] == added[head]:
+                head += 1
+            tail = 0
+            while tail < size - head and removed[-1 - tail] == added[-1 - tail]:
+                tail += 1
+            begin = offset + utf16_length(removed[:head])
+            edits.append(
+                [
+                    begin,
+                    begin + utf16_length(removed[head : len(removed) - tail]),
+                    added[head : len(added) - tail],
+                ]
+            )
+        offset += utf16_length(removed)
+    return edits
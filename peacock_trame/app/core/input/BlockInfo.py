@@ -8,6 +8,10 @@
 # * https://www.gnu.org/licenses/lgpl-2.1.html
 
 import copy
+import hashlib
+import itertools
+import marshal
+import operator
 import os
 
 try:
@@ -18,13 +22,59 @@ except ImportError:
 import mooseutils
 
 from .ParameterInfo import ParameterInfo
+from .ValueCodec import NumericArray
+
+
+def _valueBytes(value):
+    """
+    Bytes of a parameter value for the fingerprint of its block.
+    Numeric arrays give the same bytes as the list of their numbers.
+    """
+    if type(value) is NumericArray:
+        value = value.tolist()
+    try:
+        return marshal.dumps(value, 2)
+    except ValueError:
+        return repr(value).encode("utf-8")
 
 
 class BlockInfo(object):
     """
     Holds information about a block.
+    The containers are only allocated when first accessed, most blocks of an
+    executable have no types, children or parameters written first.
     """
 
+    __slots__ = (
+        "_pending",
+        "_pending_children",
+        "_children_source",
+        "shared",
+        "_parameters",
+        "_parameters_list",
+        "_parameters_write_first",
+        "_user_added",
+        "star",
+        "_star_node",
+        "_types",
+        "_included",
+        "comments",
+        "name",
+        "_path",
+        "_children",
+        "_children_list",
+        "_children_write_first",
+        "hard",
+        "description",
+        "parent",
+        "_changed_by_user",
+        "_saving_children",
+        # not pickled, ids and fingerprints are only unique within a process
+        "rendered",
+        "_fingerprint",
+        "_id",
+    )
+
     def __init__(self, parent, path, hard=False, description=""):
         """
         Input:
@@ -34,41 +84,368 @@ class BlockInfo(object):
             description[str]: Description of this block.
         """
         super(BlockInfo, self).__init__()
-        self.parameters = {}
-        self.parameters_list = []
-        self.parameters_write_first = []
-        self.user_added = False
+        # Set when the types, star node and parameters of this block have not been built yet.
+        # Either a (builder, json data) tuple or a BlockInfo this block is a copy of.
+        self._pending = None
+        # Set when the children of this block are also built from the pending json data.
+        self._pending_children = False
+        # Set when the children of this block are still to be copied from a shared block.
+        self._children_source = None
+        # Blocks that belong to an ExecutableInfo are shared by all the trees
+        # and never modified, so copies of them are only made when needed.
+        self.shared = False
+        # None until first accessed
+        self._parameters = None
+        self._parameters_list = None
+        self._parameters_write_first = None
+        self._user_added = False
         self.star = False
-        self.star_node = None
-        self.types = {}
-        self.included = False
+        self._star_node = None
+        self._types = None
+        self._included = False
         self.comments = ""
         self.name = os.path.basename(path)
-        self.path = path
-        self.children = {}
-        self.children_list = []
-        self.children_write_first = []
+        # None when the path follows the parent, which is the case for children.
+        # Types and star nodes keep the path they have in the executable syntax.
+        self._path = path
+        self._children = None
+        self._children_list = None
+        self._children_write_first = None
         self.hard = hard
-        self.description = ""
+        self.description = description
         self.parent = parent
-        self.changed_by_user = False
+        self._changed_by_user = False
+        # Number of children that want to be saved, kept up to date when they change
+        self._saving_children = 0
+        # (indent, text) written for this block and its children by InputTreeWriter,
+        # None when out of date
+        self.rendered = None
+        # Hash of the contents of this block and its children, None when out of date
+        self._fingerprint = None
+        # Allocated when first used
+        self._id = None
+
+    def __getstate__(self):
+        # A plain tuple pickles faster and smaller than the default state of slots.
+        # The order is the one of __slots__, the caches and the id are left out.
+        return _getState(self)
+
+    def __setstate__(self, state):
+        (
+            self._pending,
+            self._pending_children,
+            self._children_source,
+            self.shared,
+            self._parameters,
+            self._parameters_list,
+            self._parameters_write_first,
+            self._user_added,
+            self.star,
+            self._star_node,
+            self._types,
+            self._included,
+            self.comments,
+            self.name,
+            self._path,
+            self._children,
+            self._children_list,
+            self._children_write_first,
+            self.hard,
+            self.description,
+            self.parent,
+            self._changed_by_user,
+            self._saving_children,
+        ) = state
+        self.rendered = None
+        self._fingerprint = None
+        self._id = None
+
+    @property
+    def id(self):
+        if self._id is None:
+            self._id = next(_node_ids)
+        return self._id
+
+    @property
+    def path(self):
+        if self._path is not None:
+            return self._path
+        return os.path.join(self.parent.path, self.name)
+
+    @path.setter
+    def path(self, path):
+        self._path = path
+
+    @property
+    def included(self):
+        return self._included
+
+    @included.setter
+    def included(self, included):
+        was_saving = self.wantsToSave()
+        self._included = included
+        self._saveStateChanged(was_saving)
+        self._contentChanged()
+
+    @property
+    def user_added(self):
+        return self._user_added
+
+    @user_added.setter
+    def user_added(self, user_added):
+        was_saving = self.wantsToSave()
+        self._user_added = user_added
+        self._saveStateChanged(was_saving)
+
+    @property
+    def changed_by_user(self):
+        return self._changed_by_user
+
+    @changed_by_user.setter
+    def changed_by_user(self, changed_by_user):
+        was_saving = self.wantsToSave()
+        self._changed_by_user = changed_by_user
+        self._saveStateChanged(was_saving)
+
+    def _saveStateChanged(self, was_saving):
+        """
+        Updates the count of saving children of the parents after wantsToSave()
+        of this block might have changed. This only goes up as long as
+        wantsToSave() of the parent changes too.
+        Input:
+            was_saving[bool]: wantsToSave() before the change
+        """
+        block = self
+        saving = block.wantsToSave()
+        while saving != was_saving:
+            parent = block.parent
+            if parent is None:
+                return
+            # the parent writes this block or not
+            parent._textChanged()
+            # Types and star nodes don't count for their parent
+            if not parent._children or parent._children.get(block.name) is not block:
+                return
+            was_saving = parent.wantsToSave()
+            parent._saving_children += 1 if saving else -1
+            block = parent
+            saving = block.wantsToSave()
+
+    @property
+    def parameters(self):
+        if self._pending is not None:
+            self._materialize()
+        if self._parameters is None:
+            self._parameters = {}
+        return self._parameters
+
+    @parameters.setter
+    def parameters(self, parameters):
+        self._parameters = parameters
+        self._contentChanged()
+
+    @property
+    def parameters_list(self):
+        if self._pending is not None:
+            self._materialize()
+        if self._parameters_list is None:
+            self._parameters_list = []
+        return self._parameters_list
+
+    @parameters_list.setter
+    def parameters_list(self, parameters_list):
+        self._parameters_list = parameters_list
+
+    @property
+    def children(self):
+        if self._pending_children:
+            self._materialize()
+        if self._children_source is not None:
+            self._materializeChildren()
+        if self._children is None:
+            self._children = {}
+        return self._children
+
+    @children.setter
+    def children(self, children):
+        self._children = children
+        self._contentChanged()
+
+    @property
+    def children_list(self):
+        if self._pending_children:
+            self._materialize()
+        if self._children_source is not None:
+            self._materializeChildren()
+        if self._children_list is None:
+            self._children_list = []
+        return self._children_list
+
+    @children_list.setter
+    def children_list(self, children_list):
+        self._children_list = children_list
+        self._contentChanged()
+
+    @property
+    def types(self):
+        if self._pending is not None:
+            self._materialize()
+        if self._types is None:
+            self._types = {}
+        return self._types
+
+    @types.setter
+    def types(self, types):
+        self._types = types
+
+    @property
+    def parameters_write_first(self):
+        if self._parameters_write_first is None:
+            self._parameters_write_first = []
+        return self._parameters_write_first
+
+    @parameters_write_first.setter
+    def parameters_write_first(self, names):
+        self._parameters_write_first = names
+        self._textChanged()
+
+    @property
+    def children_write_first(self):
+        if self._children_write_first is None:
+            self._children_write_first = []
+        return self._children_write_first
+
+    @children_write_first.setter
+    def children_write_first(self, names):
+        self._children_write_first = names
+        self._textChanged()
+
+    @property
+    def star_node(self):
+        if self._pending is not None:
+            self._materialize()
+        return self._star_node
+
+    @star_node.setter
+    def star_node(self, star_node):
+        self._star_node = star_node
+
+    def setPending(self, builder, jdata, children=False):
+        """
+        Defer building the types, star node and parameters of this block until
+        one of them is first accessed.
+        Input:
+            builder[BlockBuilder]: Object with a materializeBlock(info, jdata) method
+            jdata[dict]: Json data of this block
+            children[bool]: The children are built by materializeBlock() as well,
+                so accessing them also builds the block.
+        """
+        self._pending = (builder, jdata)
+        self._pending_children = children
+
+    def isMaterialized(self):
+        """
+        Return:
+            bool: Whether the types, star node and parameters of this block have been built
+        """
+        return self._pending is None
+
+    def _materialize(self):
+        pending = self._pending
+        self._pending = None
+        self._pending_children = False
+        if isinstance(pending, BlockInfo):
+            self._copyDetails(pending)
+        else:
+            builder, jdata = pending
+            builder.materializeBlock(self, jdata)
+
+    def _materializeChildren(self):
+        source = self._children_source
+        self._children_source = None
+        if source._pending_children:
+            source._materialize()
+        if not source._children_list:
+            return
+        self._children = {}
+        self._children_list = []
+        for key in source._children_list:
+            child = source._children[key].copy(self)
+            child._path = None
+            self._children_list.append(key)
+            self._children[key] = child
 
     def checkInactive(self):
         return not self.included and self.wantsToSave()
 
     def wantsToSave(self):
         return (
-            self.changed_by_user
-            or self.user_added
-            or self.included
-            or self.childrenWantToSave()
+            self._changed_by_user
+            or self._user_added
+            or self._included
+            or self._saving_children > 0
         )
 
     def childrenWantToSave(self):
-        for key in self.children_list:
-            if self.children[key].wantsToSave():
-                return True
-        return False
+        return self._saving_children > 0
+
+    def fingerprint(self):
+        """
+        Hash of the contents of this block: whether it is included, the values
+        of its parameters and of its type, and the fingerprints of its children.
+        It is cached and only computed again after something in the block or
+        its children changed. Blocks that are still copies of the executable
+        syntax are built to compute it, so that equal contents give the same
+        fingerprint however the blocks were made. Fingerprints are only
+        comparable within a process.
+        Return:
+            bytes: The fingerprint
+        """
+        if self._fingerprint is not None:
+            return self._fingerprint
+
+        h = hashlib.blake2b(digest_size=8)
+        h.update(b"1" if self._included else b"0")
+        parameters = self.parameters
+        for name in sorted(parameters):
+            h.update(name.encode("utf-8"))
+            h.update(_valueBytes(parameters[name].getValue()))
+        type_block = self.getTypeBlock()
+        if type_block is not None:
+            h.update(type_block.fingerprint())
+
+        h.update(b"/")
+        children = self.children
+        for name in self.children_list:
+            h.update(name.encode("utf-8"))
+            h.update(children[name].fingerprint())
+
+        self._fingerprint = h.digest()
+        return self._fingerprint
+
+    def _contentChanged(self):
+        """
+        Called when something the fingerprint depends on changed.
+        The fingerprints of the parents are out of date as well. When one is
+        already out of date, so are the ones above it.
+        """
+        block = self
+        while block is not None and block._fingerprint is not None:
+            block._fingerprint = None
+            block = block.parent
+        self._textChanged()
+
+    def _textChanged(self):
+        """
+        Called when the text written for this block might have changed.
+        The texts of the parents include it. When one is already out of date,
+        so are the ones above it: blocks that aren't written have no text, and
+        their parents are told when they start being written.
+        """
+        block = self
+        while block is not None and block.rendered is not None:
+            block.rendered = None
+            block = block.parent
 
     def getParamInfo(self, param):
         """
@@ -164,14 +541,17 @@ class BlockInfo(object):
         self.children[child_info.name] = child_info
         self.children_list.append(child_info.name)
         child_info.updatePaths()
+        if child_info.wantsToSave():
+            child_info._saveStateChanged(False)
+        if self._fingerprint is not None or self.rendered is not None:
+            self._contentChanged()
 
     def updatePaths(self):
         """
-        Make sure this node and all of its children have the correct paths
+        Make the path of this node follow its parent.
+        The paths of the children are computed from it, so they are up to date as well.
         """
-        self.path = os.path.join(self.parent.path, self.name)
-        for c in self.children.values():
-            c.updatePaths()
+        self._path = None
 
     def removeChildBlock(self, name):
         """
@@ -183,11 +563,24 @@ class BlockInfo(object):
         """
         child = self.children.get(name)
         if child:
+            if child.wantsToSave():
+                self._childStoppedSaving()
             del self.children[name]
             self.children_list.remove(name)
+            # keeps the path it had in the tree
+            child._path = child.path
             child.parent = None
+            self._contentChanged()
             return child
 
+    def _childStoppedSaving(self):
+        """
+        Called when one of the children no longer wants to be saved.
+        """
+        was_saving = self.wantsToSave()
+        self._saving_children -= 1
+        self._saveStateChanged(was_saving)
+
     def renameChildBlock(self, oldname, newname):
         """
         Rename one of the children
@@ -212,6 +605,8 @@ class BlockInfo(object):
             self.children_list.insert(idx, newname)
             child.name = newname
             child.updatePaths()
+            child.rendered = None
+            self._contentChanged()
 
     def addParameter(self, param):
         """
@@ -223,6 +618,8 @@ class BlockInfo(object):
         self.parameters[param.name] = param
         if param not in self.parameters_list:
             self.parameters_list.append(param.name)
+        if self._fingerprint is not None or self.rendered is not None:
+            self._contentChanged()
 
     def addUserParam(self, param, value):
         """
@@ -257,6 +654,7 @@ class BlockInfo(object):
             del self.parameters[pinfo.name]
             self.parameters_list.remove(name)
             pinfo.parent = None
+            self._contentChanged()
 
     def renameUserParam(self, oldname, newname):
         """
@@ -273,6 +671,7 @@ class BlockInfo(object):
             self.parameters_list.remove(oldname)
             pinfo.name = newname
             self.parameters[newname] = pinfo
+            self._contentChanged()
 
     def moveUserParam(self, param, new_index):
         """
@@ -285,6 +684,7 @@ class BlockInfo(object):
         if pinfo:
             self.parameters_list.remove(param)
             self.parameters_list.insert(new_index, param)
+            self._textChanged()
 
     def moveChildBlock(self, name, new_index):
         """
@@ -297,43 +697,94 @@ class BlockInfo(object):
         if cinfo:
             self.children_list.remove(name)
             self.children_list.insert(new_index, name)
+            self._contentChanged()
 
-    def copy(self, parent):
+    def copy(self, parent, keep_id=False):
         """
         Makes a copy of this node.
         Makes a recursive copy of all children, types, star node, etc.
+        For shared blocks this is done lazily, the children, types, star node and
+        parameters are only copied when first accessed.
         Input:
             parent[BlockInfo]: Parent of the copied block.
+            keep_id[bool]: The copy replaces this node, for example with another
+                type, so it keeps its id. The children get new ids.
         Return:
             BlockInfo: A copy of this block
         """
         new = copy.copy(self)
+        new.rendered = None
+        if keep_id:
+            new._id = self.id
         new.parent = parent
-        new.children = {}
-        new.children_list = []
-        new.children_write_first = []
-        for key in self.children_list:
-            c = self.children[key]
-            new.children_list.append(c.name)
-            new.children[key] = c.copy(new)
-
-        if self.star_node:
-            new.star_node = self.star_node.copy(new)
-
-        new.types = {}
-        for key, val in self.types.items():
-            new.types[key] = val.copy(new)
-
-        new.parameters = {}
-        new.parameters_list = []
-        new.parameters_write_first = []
-
-        for key in self.parameters_list:
-            p = self.parameters[key]
-            new.parameters_list.append(p.name)
-            new.parameters[p.name] = p.copy(new)
+        new.shared = False
+        new._children_write_first = None
+        new._parameters_write_first = None
+
+        # Always defer to the original shared block since it never gets modified
+        children_source = self._children_source
+        if children_source is None and self.shared:
+            children_source = self
+        new._children_source = children_source
+        if children_source is not None:
+            # Nothing was changed in the children of shared blocks
+            new._saving_children = 0
+        new._children = None
+        new._children_list = None
+        if children_source is None and self.children_list:
+            new._children = {}
+            new._children_list = []
+            for key in self.children_list:
+                c = self.children[key].copy(new)
+                c._path = None
+                new._children_list.append(c.name)
+                new._children[key] = c
+
+        pending = self._pending
+        if pending is not None and not isinstance(pending, BlockInfo):
+            pending = self
+        elif pending is None and self.shared:
+            pending = self
+        new._pending = pending
+        if pending is not None:
+            new._star_node = None
+            new._types = None
+            new._parameters = None
+            new._parameters_list = None
+        else:
+            new._copyDetails(self)
         return new
 
+    def _copyDetails(self, other):
+        """
+        Copies the star node, types and parameters of another block into this one.
+        Input:
+            other[BlockInfo]: Block to copy from
+        """
+        if other._pending is not None:
+            other._materialize()
+        self._star_node = None
+        if other._star_node:
+            self._star_node = other._star_node.copy(self)
+
+        self._types = None
+        if other._types:
+            self._types = {}
+            for key, val in other._types.items():
+                self._types[key] = val.copy(self)
+
+        self._parameters = None
+        self._parameters_list = None
+        if other._parameters_list:
+            self._parameters = {}
+            self._parameters_list = []
+            for key in other._parameters_list:
+                p = other._parameters[key]
+                self._parameters_list.append(p.name)
+                self._parameters[p.name] = p.copy(self)
+        # only known once other is built if it was fetched from the executable
+        self.description = other.description
+
     def addBlockType(self, type_info):
         """
         Adds a new type block.
@@ -342,6 +793,8 @@ class BlockInfo(object):
         """
         self.types[type_info.name] = type_info
         type_info.parent = self
+        if self._fingerprint is not None or self.rendered is not None:
+            self._contentChanged()
 
     def setStarInfo(self, star_info):
         """
@@ -476,3 +929,7 @@ class BlockInfo(object):
                 return False
 
         return True
+
+
+_getState = operator.attrgetter(*BlockInfo.__slots__[:-3])
+_node_ids = itertools.count(1)
@@ -8,16 +8,113 @@
 # * Licensed under LGPL 2.1, please see LICENSE for details
 # * https://www.gnu.org/licenses/lgpl-2.1.html
 
+import hashlib
+import marshal
 import os
+import pickle
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import mooseutils
 
 try:
     from cStringIO import StringIO
 except ImportError:
     from io import StringIO
-# from .FileCache import FileCache
+from ..common import ExeLauncher
+from . import SchemaBundle
 from .BlockInfo import BlockInfo
+from .FileCache import FileCache
 from .JsonData import JsonData
 from .ParameterInfo import ParameterInfo
+from .SchemaIndex import SchemaIndex
+
+
+class LazyJson(object):
+    """
+    The json data of a block kept in a compact serialized form until it is needed.
+    """
+
+    __slots__ = ("_data", "_keys")
+
+    def __init__(self, data, keys=()):
+        """
+        Input:
+            data[bytes]: Serialized json data of a top level block
+            keys[tuple]: Keys to follow from the top level block to get to this block
+        """
+        self._data = data
+        self._keys = keys
+
+    def child(self, *keys):
+        return LazyJson(self._data, self._keys + keys)
+
+    def load(self):
+        """
+        Return:
+            dict: The json data of this block
+        """
+        jdata = marshal.loads(self._data)
+        for key in self._keys:
+            jdata = jdata[key]
+        return jdata
+
+
+class RemoteBlock(object):
+    """
+    Stands for the json data of a top level block that hasn't been fetched
+    from the executable yet.
+    """
+
+    __slots__ = ("name", "future")
+
+    def __init__(self, name):
+        """
+        Input:
+            name[str]: Name of the top level block
+        """
+        self.name = name
+        # Set once the block is queued, see ExecutableInfo.fetchRemaining()
+        self.future = None
+
+
+def _indexRootBlock(name, data):
+    """
+    Indexes and fingerprints a top level block in a worker process.
+    Input:
+        name[str]: Name of the block
+        data[bytes]: Marshaled json data of the block
+    Return:
+        bytes: The pickled fingerprints and SchemaIndex of the block
+    """
+    info = ExecutableInfo()
+    info._startPathMap()
+    info._indexRootBlock(name, marshal.loads(data))
+    info.index.finish()
+    return pickle.dumps(
+        (info.fingerprints, info.index), protocol=pickle.HIGHEST_PROTOCOL
+    )
+
+
+class BlockBuilder(object):
+    """
+    Builds the pending blocks of an ExecutableInfo, see BlockInfo.setPending().
+    The blocks refer to it instead of the ExecutableInfo so that the ExecutableInfo
+    isn't pickled along with them. It is pickled empty, once for all the blocks,
+    and ExecutableInfo.fromPickle() points it to the ExecutableInfo that was read.
+    """
+
+    __slots__ = ("info",)
+
+    def __init__(self, info=None):
+        self.info = info
+
+    def __reduce__(self):
+        return (BlockBuilder, ())
+
+    def materializeBlock(self, block, jdata):
+        self.info.materializeBlock(block, jdata)
 
 
 class ExecutableInfo(object):
@@ -27,14 +124,50 @@ class ExecutableInfo(object):
 
     SETTINGS_KEY = "ExecutableInfo"
     SETTINGS_KEY_TEST_OBJS = "ExecutableWithTestObjectsInfo"
-    CACHE_VERSION = 4
-
-    def __init__(self, **kwds):
+    CACHE_VERSION = 17
+    # Keys of the json data of a block that hold other blocks
+    NESTED_KEYS = ("subblocks", "types", "star", "subblock_types")
+    # Markers around the output of "--syntax"
+    SYNTAX_START = "**START SYNTAX DATA**"
+    SYNTAX_END = "**END SYNTAX DATA**"
+    # Maximum number of executables running at once to fetch blocks
+    MAX_FETCHES = 4
+    # Rough memory in bytes of a block and a parameter, see benchmarks/node_memory.py
+    BLOCK_BYTES = 1400
+    PARAMETER_BYTES = 90
+
+    def __init__(self, lazy=False, workers=0, **kwds):
+        """
+        Input:
+            lazy[bool]: Only build the types, star node and parameters of a block
+                from the json data when they are first accessed. The json data
+                is kept in a compact form until then.
+            workers[int]: Number of processes building the top level blocks while
+                the json data is read. With 0 they are built in this process.
+        """
         super(ExecutableInfo, self).__init__(**kwds)
+        self.lazy = lazy
+        self.workers = workers
+        # Seconds spent on the last build, see _buildTree()
+        self.timings = {}
         self.json_data = None
         self.path = None
         self.path_map = {}
         self.type_to_block_map = {}
+        self.fingerprints = {}
+        self.index = SchemaIndex()
+        # Set when only part of the syntax was fetched, see setPathPartial()
+        self.partial = False
+        self._extra_args = []
+        # Placeholders of the blocks left out by setPathPartial()
+        self._remote_blocks = []
+        self._builder = BlockBuilder(self)
+        # Size in bytes of the syntax that was read, or of the compact json
+        # kept by a build, see memorySize()
+        self._loaded_size = 0
+        # Number of blocks and parameters built since then
+        self._built_blocks = 0
+        self._built_params = 0
 
     def setPath(self, new_path, use_test_objects=False):
         """
@@ -44,38 +177,233 @@ class ExecutableInfo(object):
         if not new_path:
             return
 
-        # setting_key = self.SETTINGS_KEY
+        setting_key = self.SETTINGS_KEY
         extra_args = []
         if use_test_objects:
-            # setting_key = self.SETTINGS_KEY_TEST_OBJS
+            setting_key = self.SETTINGS_KEY_TEST_OBJS
             extra_args = ["--allow-test-objects"]
 
-        # --- all file-cache operations disabled for now ---
-        # fc = FileCache(setting_key, new_path, self.CACHE_VERSION)
-        # if fc.path == self.path:
-        #     # If we are setting the path again, we need to make sure the executable itself hasn't changed
-        #     if not fc.dirty:
-        #         return
+        # the cache is mapped rather than read so that processes share it
+        fc = FileCache(setting_key, new_path, self.CACHE_VERSION, mapped=True)
+        if fc.path == self.path:
+            # If we are setting the path again, we need to make sure the executable itself hasn't changed
+            if not fc.dirty:
+                return
 
         self.json_data = None
         self.path = None
 
-        # use_cache = os.environ.get("PEACOCK_DISABLE_EXE_CACHE", "0") != "1"
-        # if use_cache:
-        #     obj = fc.read()
-        #     if obj:
-        #         self.fromPickle(obj)
-        #         self.path = fc.path
-        #         return
-
-        # json_data = JsonData(fc.path, extra_args)
-        json_data = JsonData(new_path, extra_args)
+        use_cache = os.environ.get("PEACOCK_DISABLE_EXE_CACHE", "0") != "1"
+        if use_cache:
+            obj = fc.read()
+            if obj:
+                self.fromPickle(obj, fc.size)
+                self.path = fc.path
+                return
+
+        # The tree is built while the executable is still writing out the json
+        json_data = self._buildTree(
+            lambda callback: JsonData(fc.path, extra_args, block_callback=callback)
+        )
         if json_data.app_path:
             self.json_data = json_data
-            # self.path = fc.path
-            self.path = new_path
-            self._createPathMap()
-            # fc.add(self.toPickle())
+            self.path = fc.path
+            if use_cache and fc.add(self.toPickle()) and self.lazy:
+                # switch to the mapped copy, shared with the other processes
+                obj = fc.read()
+                if obj:
+                    self.fromPickle(obj, fc.size)
+        else:
+            self.path_map = {}
+            self.type_to_block_map = {}
+            self.fingerprints = {}
+            self.index = SchemaIndex()
+
+    @classmethod
+    def hasCache(cls, path, use_test_objects=False):
+        """
+        Check if the syntax of an executable can be read from the cache.
+        Input:
+            path[str]: Path to the executable
+            use_test_objects[bool]: Whether the test objects are included
+        Return:
+            bool
+        """
+        if os.environ.get("PEACOCK_DISABLE_EXE_CACHE", "0") == "1":
+            return False
+        setting_key = cls.SETTINGS_KEY
+        if use_test_objects:
+            setting_key = cls.SETTINGS_KEY_TEST_OBJS
+        return not FileCache(setting_key, path, cls.CACHE_VERSION, mapped=True).dirty
+
+    def setPathPartial(self, new_path, blocks, use_test_objects=False):
+        """
+        Only fetch some of the top level blocks from the executable, using the search
+        filter of "--json", so that the syntax is available sooner than with setPath().
+        The names of the other top level blocks come from "--syntax". They are
+        placeholders fetched from the executable when first accessed.
+        Nothing is cached, the whole syntax is expected to be loaded with setPath() later.
+        Input:
+            new_path[str]: Path to the executable
+            blocks[list[str]]: Names of the top level blocks to fetch, ie the ones used by the input file
+            use_test_objects[bool]: Include the test objects
+        Return:
+            bool: Whether the partial syntax could be fetched
+        """
+        self.json_data = None
+        self.path = None
+        if not new_path:
+            return False
+
+        self._extra_args = []
+        if use_test_objects:
+            self._extra_args = ["--allow-test-objects"]
+        exe_path = os.path.abspath(new_path)
+        names = self._readSyntaxNames(exe_path)
+        if not names:
+            return False
+
+        wanted = []
+        for name in blocks:
+            if name in names and name not in wanted:
+                wanted.append(name)
+        # every run of the executable mostly waits on it, run them side by side
+        with ThreadPoolExecutor(max_workers=self.MAX_FETCHES) as pool:
+            fetched = dict(
+                zip(wanted, pool.map(lambda n: self._fetchBlock(exe_path, n), wanted))
+            )
+
+        self._startPathMap()
+        self._remote_blocks = []
+        for name, star in names.items():
+            block = fetched.get(name)
+            if block is not None:
+                self._addRootBlock(name, block)
+            else:
+                self._addRemoteBlock(name, star)
+
+        self.json_data = JsonData()
+        self.json_data.app_path = exe_path
+        self.json_data.json_data = {"blocks": {}}
+        self.path = exe_path
+        self.partial = True
+        return True
+
+    def _readSyntaxNames(self, exe_path):
+        """
+        Get the names of the top level blocks from the syntax paths
+        the executable writes out with "--syntax".
+        Input:
+            exe_path[str]: Path to the executable
+        Return:
+            dict: Name of each top level block -> whether it has a star node
+        """
+        output = ExeLauncher.runExe(
+            exe_path, ["-options_left", "0", "--syntax"] + self._extra_args
+        )
+        start = output.find(self.SYNTAX_START)
+        end = output.find(self.SYNTAX_END, start)
+        if start < 0 or end < 0:
+            return {}
+
+        names = {}
+        for line in output[start + len(self.SYNTAX_START) : end].splitlines():
+            parts = line.strip().strip("/").split("/")
+            if not parts[0]:
+                continue
+            names.setdefault(parts[0], False)
+            if len(parts) == 2 and parts[1] == "*":
+                names[parts[0]] = True
+        return names
+
+    def _fetchBlock(self, exe_path, name):
+        """
+        Fetch the json data of a top level block from the executable.
+        Input:
+            exe_path[str]: Path to the executable
+            name[str]: Name of the block
+        Return:
+            dict: The json data of the block, None if it couldn't be fetched
+        """
+        json_data = JsonData(exe_path, self._extra_args, search="%s*" % name)
+        if not json_data.app_path:
+            return None
+        # the search string might match other blocks as well
+        return json_data.json_data["blocks"].get(name)
+
+    def _addRemoteBlock(self, name, star):
+        """
+        Adds a placeholder for a top level block that is fetched when first used.
+        Input:
+            name[str]: Name of the block
+            star[bool]: Whether the block has a star node
+        """
+        info = BlockInfo(self.root_info, os.path.join(self.root_info.path, name), True)
+        info.shared = True
+        info.star = star
+        remote = RemoteBlock(name)
+        self._remote_blocks.append(remote)
+        info.setPending(self._builder, remote, children=True)
+        self.root_info.addChildBlock(info)
+        self.path_map[info.path] = info
+
+    def fetchRemaining(self):
+        """
+        Start fetching the top level blocks left out by setPathPartial() in
+        background threads, meant to be called once the input file is shown.
+        """
+        pending = [remote for remote in self._remote_blocks if remote.future is None]
+        if not pending:
+            return
+        pool = ThreadPoolExecutor(max_workers=self.MAX_FETCHES)
+        for remote in pending:
+            remote.future = pool.submit(self._fetchBlock, self.path, remote.name)
+        # the threads exit once the queue is done
+        pool.shutdown(wait=False)
+
+    def cancelFetches(self):
+        """
+        Drop the fetches of fetchRemaining() that haven't started,
+        ie when the whole syntax was loaded in the meantime.
+        """
+        for remote in self._remote_blocks:
+            if remote.future is not None:
+                remote.future.cancel()
+
+    def _materializeRemoteBlock(self, info, remote):
+        """
+        Build the children of a placeholder added by _addRemoteBlock().
+        The executable isn't run here, this waits on the fetch started by fetchRemaining().
+        Input:
+            info[BlockInfo]: The placeholder
+            remote[RemoteBlock]: The block to wait on
+        Return:
+            dict: The json data of the block
+        """
+        name = remote.name
+        if remote.future is None:
+            # used before the other blocks were queued
+            self.fetchRemaining()
+        try:
+            block = remote.future.result()
+        except Exception as e:
+            mooseutils.mooseWarning("Fetching %s failed: %s" % (name, e))
+            block = None
+        if block is None:
+            mooseutils.mooseWarning(
+                "Failed to fetch the syntax of %s from %s" % (name, self.path)
+            )
+            block = {}
+        block["name"] = name
+        self._indexRootBlock(name, block)
+        self.index.finish()
+        info.description = block.get("description", "")
+        for child_name, child in self.getDict(block, "subblocks").items():
+            child["name"] = child_name
+            child_info = self._processChild(info, child, True)
+            info.addChildBlock(child_info)
+            self.path_map[child_info.path] = child_info
+        return block
 
     def valid(self):
         """
@@ -86,10 +414,10 @@ class ExecutableInfo(object):
         """
         return self.path is not None and self.json_data is not None
 
-    # @staticmethod
-    # def clearCache():
-    #     FileCache.clearAll(ExecutableInfo.SETTINGS_KEY)
-    #     FileCache.clearAll(ExecutableInfo.SETTINGS_KEY_TEST_OBJS)
+    @staticmethod
+    def clearCache():
+        FileCache.clearAll(ExecutableInfo.SETTINGS_KEY)
+        FileCache.clearAll(ExecutableInfo.SETTINGS_KEY_TEST_OBJS)
 
     def toPickle(self):
         return {
@@ -97,18 +425,38 @@ class ExecutableInfo(object):
             "path_map": self.path_map,
             "path": self.path,
             "type_to_block_map": self.type_to_block_map,
+            "fingerprints": self.fingerprints,
+            "index": self.index,
+            "builder": self._builder,
         }
 
-    def fromPickle(self, data):
+    def fromPickle(self, data, size=0):
+        """
+        Input:
+            data[dict]: Data from toPickle()
+            size[int]: Size in bytes of the data that was read, see memorySize()
+        """
         self.json_data = JsonData()
         self.json_data.fromPickle(data["json_data"])
         self.path_map = data["path_map"]
+        self.root_info = self.path_map["/"]
         self.path = data["path"]
         self.type_to_block_map = data["type_to_block_map"]
+        self.fingerprints = data["fingerprints"]
+        self.index = data["index"]
+        self.partial = False
+        # the pending blocks that were read are built by this object
+        self._builder = data["builder"]
+        self._builder.info = self
+        self._loaded_size = size
+        self._built_blocks = 0
+        self._built_params = 0
 
     def _createBasicInfo(self, parent, jdata, is_hard):
         full_name = os.path.join(parent.path, jdata["name"])
         info = BlockInfo(parent, full_name, is_hard, jdata.get("description", ""))
+        info.shared = True
+        self._built_blocks += 1
         return info
 
     def getDict(self, jdata, key):
@@ -124,14 +472,36 @@ class ExecutableInfo(object):
             all_params.update(self.getDict(data, "parameters"))
         return all_params
 
-    def _processChild(self, parent, jdata, is_hard):
+    def _processChild(self, parent, jdata, is_hard, lazy_json=None):
         info = self._createBasicInfo(parent, jdata, is_hard)
         for name, child in self.getDict(jdata, "subblocks").items():
             child["name"] = name
-            child_info = self._processChild(info, child, True & is_hard)
+            child_json = None
+            if lazy_json:
+                child_json = lazy_json.child("subblocks", name)
+            child_info = self._processChild(info, child, True & is_hard, child_json)
             info.addChildBlock(child_info)
             self.path_map[child_info.path] = child_info
 
+        if self.lazy:
+            info.star = "star" in jdata
+            info.setPending(self._builder, lazy_json or jdata)
+        else:
+            self.materializeBlock(info, jdata)
+        return info
+
+    def materializeBlock(self, info, jdata):
+        """
+        Builds the types, star node and parameters of a block.
+        Input:
+            info[BlockInfo]: The block to fill in
+            jdata[dict or LazyJson]: Json data of the block
+        """
+        if isinstance(jdata, RemoteBlock):
+            jdata = self._materializeRemoteBlock(info, jdata)
+        elif isinstance(jdata, LazyJson):
+            jdata = jdata.load()
+
         for name, child in self.getDict(jdata, "types").items():
             child["name"] = name
             child_info = self._processChild(info, child, False)
@@ -158,29 +528,267 @@ class ExecutableInfo(object):
             param_info.setFromData(param)
             info.addParameter(param_info)
 
-        for t in jdata.get("associated_types", []):
-            self.type_to_block_map.setdefault(t, []).append(parent.path)
+        self._built_params += len(info.parameters)
 
-        return info
+    def memorySize(self):
+        """
+        Rough estimate of the memory used by the syntax. It is the size of the data
+        that was read, leaving out what is mapped since that is shared with other
+        processes, plus the blocks and parameters built since then, blocks built
+        lazily included. Nothing is measured, so it is cheap.
+        Return:
+            int: Size in bytes
+        """
+        return (
+            self._loaded_size
+            + self._built_blocks * self.BLOCK_BYTES
+            + self._built_params * self.PARAMETER_BYTES
+        )
+
+    @staticmethod
+    def fingerprintKey(parent_key, name, kind="subblocks"):
+        """
+        Key of a block in fingerprints.
+        Types are kept apart from subblocks since they can have the same names.
+        Input:
+            parent_key[str]: Key of the parent block, "" for the root
+            name[str]: Name of the block
+            kind[str]: Which entry of the json data the block is in, one of NESTED_KEYS
+        Return:
+            str
+        """
+        if kind == "subblocks" or kind == "star":
+            return "%s/%s" % (parent_key, name)
+        return "%s/:%s" % (parent_key, name)
+
+    def _fingerprintBlock(self, key, jdata):
+        """
+        Computes the fingerprints of a block and all of its descendants.
+        The fingerprint of a block combines its own data with the fingerprints of
+        its subblocks, types and star node, so each block is only hashed once
+        and blocks with the same fingerprint have the same syntax.
+        Input:
+            key[str]: Key of the block, see fingerprintKey()
+            jdata[dict]: Json data of the block
+        Return:
+            bytes: The fingerprint of the block
+        """
+        h = hashlib.blake2b(digest_size=8)
+        own = {
+            k: v for k, v in jdata.items() if k not in self.NESTED_KEYS and k != "name"
+        }
+        # version 2 doesn't depend on which strings are shared or interned,
+        # so the same data gives the same fingerprint in every process
+        h.update(marshal.dumps(own, 2))
+        for kind in self.NESTED_KEYS:
+            if kind == "star":
+                children = {"*": jdata["star"]} if jdata.get("star") else {}
+            else:
+                children = self.getDict(jdata, kind)
+            for name in sorted(children):
+                fp = self._fingerprintBlock(
+                    self.fingerprintKey(key, name, kind), children[name]
+                )
+                h.update(("%s/%s" % (kind, name)).encode("utf-8"))
+                h.update(fp)
+        digest = h.digest()
+        self.fingerprints[key] = digest
+        return digest
 
     def readFromFiles(self, json_file):
-        json_data = JsonData()
-        json_data.readFromFile(json_file)
+        def read(callback):
+            json_data = JsonData(block_callback=callback)
+            json_data.readFromFile(json_file)
+            return json_data
 
+        json_data = self._buildTree(read)
         self.path = "From Files"
         self.json_data = json_data
-        self._createPathMap()
 
-    def _createPathMap(self):
+    def readFromBundle(self, bundle_file):
+        """
+        Read the processed syntax from a bundle written by writeBundle().
+        Input:
+            bundle_file[str]: Path to the bundle
+        """
+        self.fromPickle(
+            *SchemaBundle.readBundle(bundle_file, self.CACHE_VERSION, with_size=True)
+        )
+
+    def writeBundle(self, bundle_file, mapped=False):
+        """
+        Write the processed syntax to a bundle so that it can be loaded
+        without running the executable.
+        Input:
+            bundle_file[str]: Path to the bundle
+            mapped[bool]: Write an uncompressed bundle that is memory mapped when read
+        """
+        SchemaBundle.writeBundle(
+            bundle_file, self.toPickle(), self.CACHE_VERSION, mapped
+        )
+
+    def readSchema(self, schema_file):
+        """
+        Read the syntax from either a bundle or a json dump.
+        Input:
+            schema_file[str]: Path to the bundle or json file
+        """
+        if SchemaBundle.isBundle(schema_file):
+            self.readFromBundle(schema_file)
+        else:
+            self.readFromFiles(schema_file)
+
+    def _startPathMap(self):
+        self.partial = False
         self.path_map = {}
+        self.fingerprints = {}
+        self.index = SchemaIndex()
+        # the associated types are indexed along with the rest
+        self.type_to_block_map = self.index.associated_blocks
         self.root_info = BlockInfo(None, "/", False, "root node")
-        for name, block in self.json_data.json_data["blocks"].items():
-            block["name"] = name
-            block_info = self._processChild(self.root_info, block, True)
-            self.root_info.addChildBlock(block_info)
-            self.path_map[block_info.path] = block_info
+        self.root_info.shared = True
         self.path_map["/"] = self.root_info
 
+    def _addRootBlock(self, name, block):
+        """
+        Adds a top level block from the json data.
+        Input:
+            name[str]: Name of the block
+            block[dict]: Json data of the block
+        """
+        block["name"] = name
+        self._indexRootBlock(name, block)
+        self._buildRootBlock(name, block)
+
+    def _indexRootBlock(self, name, block):
+        """
+        Adds a top level block to the indexes and fingerprints.
+        Input:
+            name[str]: Name of the block
+            block[dict]: Json data of the block
+        """
+        self.index.addBlock(
+            self.root_info.path, os.path.join(self.root_info.path, name), block
+        )
+        self._fingerprintBlock(self.fingerprintKey("", name), block)
+
+    def _buildRootBlock(self, name, block, data=None):
+        """
+        Builds the BlockInfo of a top level block.
+        Input:
+            name[str]: Name of the block
+            block[dict]: Json data of the block
+            data[bytes]: The block already marshaled
+        """
+        lazy_json = None
+        if self.lazy:
+            # Only keep the compact form of the json data around
+            if data is None:
+                data = marshal.dumps(block)
+            lazy_json = LazyJson(data)
+            self._loaded_size += len(data)
+        block_info = self._processChild(self.root_info, block, True, lazy_json)
+        self.root_info.addChildBlock(block_info)
+        self.path_map[block_info.path] = block_info
+
+    def _buildTree(self, read):
+        """
+        Builds the tree from the top level blocks of the json data.
+        With workers, the top level blocks are indexed and fingerprinted in a
+        process pool while this process builds their BlockInfo. What the workers
+        send back is merged in the order the blocks were read in, so the result
+        is the same either way.
+        The time taken is put in self.timings.
+        Input:
+            read[callable]: Reads the json data, calling the callback it is passed
+                with (name, data) for each top level block.
+        Return:
+            The return value of read
+        """
+        self._startPathMap()
+        self._loaded_size = 0
+        self._built_blocks = 0
+        self._built_params = 0
+        start = time.perf_counter()
+        self.timings = {"merge": 0.0}
+        if self.workers <= 0:
+            json_data = read(self._addRootBlock)
+        else:
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                pending = deque()
+
+                def submit(name, block):
+                    block["name"] = name
+                    # marshal is much faster than pickle, and lazy blocks are kept that way
+                    data = marshal.dumps(block)
+                    pending.append(pool.submit(_indexRootBlock, name, data))
+                    self._buildRootBlock(name, block, data)
+                    # merge what is done in the meantime
+                    while pending and pending[0].done():
+                        self._mergeIndex(pending.popleft())
+
+                json_data = read(submit)
+                while pending:
+                    self._mergeIndex(pending.popleft())
+            # only needed while reading, and it can't be pickled along with the blocks
+            json_data.block_callback = None
+        self.index.finish()
+        self.timings["total"] = time.perf_counter() - start
+        return json_data
+
+    def _mergeIndex(self, future):
+        """
+        Adds the fingerprints and indexes of a top level block from a worker.
+        Input:
+            future[Future]: Future of the _indexRootBlock() output
+        """
+        data = future.result()
+        start = time.perf_counter()
+        fingerprints, index = pickle.loads(data)
+        self.fingerprints.update(fingerprints)
+        self.index.merge(index)
+        self.timings["merge"] += time.perf_counter() - start
+
+    def _createPathMap(self):
+        self._startPathMap()
+        for name, block in self.json_data.json_data["blocks"].items():
+            self._addRootBlock(name, block)
+
+    def findBlock(self, path):
+        """
+        Find a block of the syntax from its path, types included.
+        Input:
+            path[str]: Path of the block, ie "/Kernels/*/Diffusion"
+        Return:
+            BlockInfo if found else None
+        """
+        info = self.path_map.get(path)
+        if info is not None or not path.startswith("/"):
+            return info
+
+        info = self.path_map.get("/")
+        for name in path.strip("/").split("/"):
+            if info is None:
+                break
+            child = info.children.get(name)
+            if child is None and name == "*":
+                child = info.star_node
+            if child is None:
+                child = info.types.get(name)
+            info = child
+        return info
+
+    def search(self, query, limit=50):
+        """
+        Full-text search of the names and descriptions of the blocks and parameters.
+        Input:
+            query[str]: Words to look for
+            limit[int]: Maximum number of results
+        Return:
+            list[tuple]: (block path, parameter name or "", score), best first
+        """
+        return self.index.search.search(query, limit)
+
     def _dumpNode(self, output, entry, level, prefix="  ", only_hard=False):
         if not only_hard or entry.hard:
             hard = "hard"
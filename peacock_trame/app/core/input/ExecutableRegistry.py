@@ -0,0 +1,245 @@
+# * This file is part of the MOOSE framework
+# * https://www.mooseframework.org
+# *
+# * All rights reserved, see COPYRIGHT for full restrictions
+# * https://github.com/idaholab/moose/blob/master/COPYRIGHT
+# *
+# * Licensed under LGPL 2.1, please see LICENSE for details
+# * https://www.gnu.org/licenses/lgpl-2.1.html
+
+import os
+import threading
+import weakref
+from collections import OrderedDict
+
+import mooseutils
+
+from .ExecutableInfo import ExecutableInfo
+
+
+def _fileStamp(path):
+    try:
+        st = os.stat(path)
+        return (st.st_size, st.st_mtime_ns)
+    except (OSError, TypeError):
+        return None
+
+
+class ExecutableRegistry(object):
+    """
+    Holds the ExecutableInfo of the executables in use so that they are shared
+    by all the sessions of the process.
+    When the estimated memory of the loaded executables goes over the budget, the
+    least recently used ones are dropped. They are loaded again, usually from the
+    on-disk cache, the next time they are needed.
+    """
+
+    DEFAULT_MEMORY_BUDGET = 1 << 30
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    @classmethod
+    def instance(cls):
+        """
+        The registry shared by the whole process.
+        Return:
+            ExecutableRegistry
+        """
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def __init__(self, memory_budget=None, workers=None):
+        """
+        Input:
+            memory_budget[int]: Budget in bytes. Defaults to PEACOCK_SCHEMA_MEMORY_MB
+                or DEFAULT_MEMORY_BUDGET.
+            workers[int]: Number of processes building the syntax of an executable,
+                see ExecutableInfo. Defaults to PEACOCK_SCHEMA_WORKERS or 0.
+        """
+        super(ExecutableRegistry, self).__init__()
+        if memory_budget is None:
+            memory_mb = os.environ.get("PEACOCK_SCHEMA_MEMORY_MB")
+            if memory_mb:
+                memory_budget = int(float(memory_mb) * (1 << 20))
+            else:
+                memory_budget = self.DEFAULT_MEMORY_BUDGET
+        self.memory_budget = memory_budget
+        if workers is None:
+            workers = int(os.environ.get("PEACOCK_SCHEMA_WORKERS") or 0)
+        self.workers = workers
+        self._lock = threading.Lock()
+        # key -> ExecutableInfo, least recently used first
+        self._entries = OrderedDict()
+        # Dropped entries that are still used somewhere, no need to load them again
+        self._released = weakref.WeakValueDictionary()
+        # key -> stamp of the file it was read from
+        self._info = {}
+        # key -> lock held while loading, so an executable is only loaded once at a time
+        self._loading = {}
+
+    @staticmethod
+    def key(exe_path, schema_file=None, use_test_objects=False):
+        """
+        Key of an executable in the registry.
+        """
+        if exe_path:
+            exe_path = os.path.abspath(exe_path)
+        if schema_file:
+            schema_file = os.path.abspath(schema_file)
+        return (exe_path, schema_file, bool(use_test_objects))
+
+    def get(self, exe_path, schema_file=None, use_test_objects=False):
+        """
+        Get the ExecutableInfo of an executable, loading it if needed.
+        If the executable (or schema file) changed on disk since it was loaded,
+        it is loaded again.
+        Input:
+            exe_path[str]: Path to the executable
+            schema_file[str]: Load the syntax from this bundle or json file instead of running the executable
+            use_test_objects[bool]: Include the test objects
+        Return:
+            ExecutableInfo: Not valid if it failed to load
+        """
+        key = self.key(exe_path, schema_file, use_test_objects)
+        with self._lock:
+            info = self._lookup(key)
+            if info is not None:
+                return info
+            key_lock = self._loading.setdefault(key, threading.Lock())
+
+        with key_lock:
+            with self._lock:
+                # it might have been loaded while waiting
+                info = self._lookup(key)
+                if info is not None:
+                    return info
+
+            stamp = _fileStamp(key[1] or key[0])
+            info = self._load(*key)
+
+            with self._lock:
+                self._loading.pop(key, None)
+                if info.valid():
+                    self._info[key] = stamp
+                    self._entries[key] = info
+                    self._evict()
+            return info
+
+    def getPartial(self, exe_path, blocks, use_test_objects=False):
+        """
+        Get the syntax of an executable to show an input file as soon as possible.
+        If the whole syntax is already loaded or cached, it is returned as with get().
+        Otherwise only the given top level blocks are fetched, see ExecutableInfo.setPathPartial().
+        The partial syntax isn't kept in the registry, get() is expected to be
+        called for the whole syntax next.
+        Input:
+            exe_path[str]: Path to the executable
+            blocks[list[str]]: Names of the top level blocks to fetch first
+            use_test_objects[bool]: Include the test objects
+        Return:
+            ExecutableInfo: Its partial attribute is set if only part of the syntax was fetched
+        """
+        key = self.key(exe_path, None, use_test_objects)
+        with self._lock:
+            info = self._lookup(key)
+        if info is not None or ExecutableInfo.hasCache(exe_path, use_test_objects):
+            return self.get(exe_path, None, use_test_objects)
+
+        info = ExecutableInfo(lazy=True)
+        try:
+            if info.setPathPartial(exe_path, blocks, use_test_objects):
+                return info
+        except Exception as e:
+            mooseutils.mooseWarning(
+                "Failed to fetch part of the syntax of %s: %s" % (exe_path, e)
+            )
+        # the executable doesn't support it, get everything at once
+        return self.get(exe_path, None, use_test_objects)
+
+    def _lookup(self, key):
+        """
+        Finds an up to date entry, marking it as most recently used.
+        Must be called with the lock held.
+        """
+        info = self._entries.get(key)
+        if info is None:
+            info = self._released.get(key)
+        if info is None:
+            return None
+
+        stamp = self._info[key]
+        if stamp != _fileStamp(key[1] or key[0]):
+            self._remove(key)
+            return None
+
+        self._entries[key] = info
+        self._entries.move_to_end(key)
+        self._released.pop(key, None)
+        self._evict()
+        return info
+
+    def _load(self, exe_path, schema_file, use_test_objects):
+        info = ExecutableInfo(lazy=True, workers=self.workers)
+        try:
+            if schema_file:
+                info.readSchema(schema_file)
+            else:
+                info.setPath(exe_path, use_test_objects)
+        except Exception as e:
+            mooseutils.mooseWarning(
+                "Failed to load the syntax of %s: %s" % (schema_file or exe_path, e)
+            )
+            info = ExecutableInfo(lazy=True)
+        return info
+
+    def _evict(self):
+        """
+        Drop least recently used entries until the budget is met.
+        The most recently used entry is always kept.
+        Must be called with the lock held.
+        """
+        while len(self._entries) > 1 and self.memoryUsage() > self.memory_budget:
+            key, info = self._entries.popitem(last=False)
+            self._released[key] = info
+
+    def _remove(self, key):
+        self._entries.pop(key, None)
+        self._released.pop(key, None)
+        self._info.pop(key, None)
+
+    def memoryUsage(self):
+        """
+        Return:
+            int: Estimated memory in bytes used by the entries held by the registry,
+                see ExecutableInfo.memorySize()
+        """
+        return sum(info.memorySize() for info in self._entries.values())
+
+    def setMemoryBudget(self, memory_budget):
+        """
+        Input:
+            memory_budget[int]: New budget in bytes
+        """
+        with self._lock:
+            self.memory_budget = memory_budget
+            self._evict()
+
+    def executables(self):
+        """
+        Return:
+            list[str]: Executables held by the registry, most recently used last
+        """
+        with self._lock:
+            return [key[0] for key in self._entries]
+
+    def clear(self):
+        """
+        Drop all the entries.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._released = weakref.WeakValueDictionary()
+            self._info.clear()
@@ -0,0 +1,230 @@
+# * This file is part of the MOOSE framework
+# * https://www.mooseframework.org
+# *
+# * All rights reserved, see COPYRIGHT for full restrictions
+# * https://github.com/idaholab/moose/blob/master/COPYRIGHT
+# *
+# * Licensed under LGPL 2.1, please see LICENSE for details
+# * https://www.gnu.org/licenses/lgpl-2.1.html
+
+import hashlib
+import os
+import pickle
+import shutil
+import tempfile
+
+import mooseutils
+
+from . import SchemaStore
+
+
+def cacheDir():
+    """
+    Directory where the cache files are stored.
+    Can be overridden with the PEACOCK_CACHE_DIR environment variable.
+    Return:
+        str: Path to the cache directory
+    """
+    cache_dir = os.environ.get("PEACOCK_CACHE_DIR")
+    if not cache_dir:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+            os.path.expanduser("~"), ".cache"
+        )
+        cache_dir = os.path.join(base, "peacock-trame")
+    return cache_dir
+
+
+# Content hashes by path and stat of the file, see FileCache.contentHash()
+_content_hashes = {}
+
+
+def fileHash(path, block_size=1 << 20):
+    """
+    Computes the sha256 of the contents of a file.
+    Input:
+        path[str]: File to hash
+    Return:
+        str: Hex digest of the file contents
+    """
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(block_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class FileCache(object):
+    """
+    Caches a picklable object on disk, keyed on a file.
+    The cache entry is only valid as long as the file keeps the same
+    path, size, modification time and contents, and the cache was
+    written with the same version.
+    """
+
+    def __init__(self, settings_key, path, version=1, mapped=False):
+        """
+        Input:
+            settings_key[str]: Namespace for this cache. Entries for different keys never collide.
+            path[str]: Path to the file the cached data is generated from.
+            version[int]: Version of the cached data. Changing it invalidates old entries.
+            mapped[bool]: Write the data as a SchemaStore so that its big buffers are
+                memory mapped, and shared between processes, instead of read.
+        """
+        super(FileCache, self).__init__()
+        self.settings_key = settings_key
+        self.version = version
+        self.mapped = mapped
+        self.path = None
+        self.stat = None
+        self.dirty = True
+        self.no_exist = True
+        self._hash = None
+        self._header = None
+        # Size in bytes of the data last read that isn't mapped, see read()
+        self.size = 0
+
+        if not path:
+            return
+
+        self.path = os.path.abspath(path)
+        try:
+            self.stat = os.stat(self.path)
+            self.no_exist = False
+        except OSError:
+            return
+
+        self._header = self._readHeader()
+        self.dirty = not self._headerMatches(self._header)
+
+    def cacheFile(self):
+        """
+        The file holding the cached data for self.path
+        Return:
+            str: Path to the cache file
+        """
+        digest = hashlib.sha1(self.path.encode("utf-8")).hexdigest()
+        return os.path.join(cacheDir(), self.settings_key, "%s.pickle" % digest)
+
+    def contentHash(self):
+        """
+        Hash of the contents of self.path, only computed once.
+        It is shared with the other caches of the same file, as long as the
+        file isn't written to, since executables can be hundreds of MB.
+        """
+        if self._hash is None:
+            st = self.stat
+            key = (self.path, st.st_ino, st.st_size, st.st_mtime_ns, st.st_ctime_ns)
+            self._hash = _content_hashes.get(key)
+            if self._hash is None:
+                self._hash = fileHash(self.path)
+                _content_hashes[key] = self._hash
+        return self._hash
+
+    def _fingerprint(self):
+        return {
+            "version": self.version,
+            "mapped": self.mapped,
+            "key": self.settings_key,
+            "path": self.path,
+            "size": self.stat.st_size,
+            "mtime": self.stat.st_mtime_ns,
+        }
+
+    def _headerMatches(self, header):
+        """
+        Checks if a stored header is still valid for the current file.
+        The content hash is only computed if everything else matches.
+        """
+        if not header:
+            return False
+        fingerprint = self._fingerprint()
+        for key, val in fingerprint.items():
+            if header.get(key) != val:
+                return False
+        return header.get("hash") == self.contentHash()
+
+    def _readHeader(self):
+        try:
+            with open(self.cacheFile(), "rb") as f:
+                return pickle.load(f)
+        except Exception:
+            return None
+
+    def read(self):
+        """
+        Read the cached data.
+        Return:
+            The cached object if the cache is valid, else None
+        """
+        if self.no_exist or self.dirty:
+            return None
+        try:
+            with open(self.cacheFile(), "rb") as f:
+                header = pickle.load(f)
+                if not self._headerMatches(header):
+                    return None
+                offset = f.tell()
+                if self.mapped:
+                    obj = SchemaStore.load(self.cacheFile(), offset)
+                    self.size = SchemaStore.dataSize(self.cacheFile(), offset)
+                    return obj
+                obj = pickle.load(f)
+                self.size = f.tell() - offset
+                return obj
+        except Exception as e:
+            mooseutils.mooseWarning(
+                "Failed to read cache file %s: %s" % (self.cacheFile(), e)
+            )
+            return None
+
+    def add(self, obj):
+        """
+        Store an object in the cache.
+        Input:
+            obj: Picklable object to store
+        Return:
+            bool: True if the object was written to disk
+        """
+        if self.no_exist:
+            return False
+
+        header = self._fingerprint()
+        header["hash"] = self.contentHash()
+        cache_file = self.cacheFile()
+        cache_dir = os.path.dirname(cache_file)
+        tmp_name = None
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            # Write to a temporary file first so that concurrent readers
+            # never see a partially written cache file.
+            fd, tmp_name = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(header, f, protocol=pickle.HIGHEST_PROTOCOL)
+                if self.mapped:
+                    SchemaStore.dump(f, obj)
+                else:
+                    pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+            # other users might share the cache directory
+            os.chmod(tmp_name, 0o644)
+            # Processes that mapped the old file keep using it
+            os.replace(tmp_name, cache_file)
+        except Exception as e:
+            mooseutils.mooseWarning(
+                "Failed to write cache file %s: %s" % (cache_file, e)
+            )
+            if tmp_name and os.path.exists(tmp_name):
+                os.remove(tmp_name)
+            return False
+
+        self._header = header
+        self.dirty = False
+        return True
+
+    @staticmethod
+    def clearAll(settings_key):
+        """
+        Remove all the cache entries for a key.
+        Input:
+            settings_key[str]: The namespace to clear
+        """
+        shutil.rmtree(os.path.join(cacheDir(), settings_key), ignore_errors=True)
@@ -0,0 +1,408 @@
+#!/usr/bin/env python3
+# * This file is part of the MOOSE framework
+# * https://www.mooseframework.org
+# *
+# * All rights reserved, see COPYRIGHT for full restrictions
+# * https://github.com/idaholab/moose/blob/master/COPYRIGHT
+# *
+# * Licensed under LGPL 2.1, please see LICENSE for details
+# * https://www.gnu.org/licenses/lgpl-2.1.html
+
+import contextlib
+import time
+from collections import deque
+
+
+class TreeEdit(object):
+    """
+    An edit of an InputTree that can be undone.
+    Edits only hold the blocks and values they changed, everything else
+    is shared with the tree.
+    """
+
+    __slots__ = ()
+
+    def undo(self):
+        raise NotImplementedError()
+
+    def redo(self):
+        raise NotImplementedError()
+
+    def structureChanges(self):
+        """
+        Return:
+            list[(BlockInfo, BlockInfo)]: Parent and block that were added, removed,
+                renamed, moved or included by the edit
+        """
+        return []
+
+    def valueChanges(self):
+        """
+        Return:
+            list[BlockInfo]: Blocks with parameters changed by the edit
+        """
+        return []
+
+    def mergeWith(self, edit):
+        """
+        Merge a following edit into this one.
+        Return:
+            bool: True if the edit was merged
+        """
+        return False
+
+
+class ParamEdit(TreeEdit):
+    """
+    A parameter value changed.
+    Changes of the type parameter change the structure, the parameters of
+    the block come from another type.
+    """
+
+    __slots__ = ("block", "name", "old", "new", "time")
+
+    def __init__(self, block, name, old, new):
+        self.block = block
+        self.name = name
+        self.old = old
+        self.new = new
+        self.time = time.monotonic()
+
+    def undo(self):
+        self.block.setParamValue(self.name, self.old)
+
+    def redo(self):
+        self.block.setParamValue(self.name, self.new)
+
+    def structureChanges(self):
+        if self.name == "type":
+            return [(self.block.parent, self.block)]
+        return []
+
+    def valueChanges(self):
+        return [self.block]
+
+    def mergeWith(self, edit):
+        if (
+            type(edit) is not ParamEdit
+            or edit.block is not self.block
+            or edit.name != self.name
+            or edit.time - self.time > InputHistory.MERGE_INTERVAL
+        ):
+            return False
+        self.new = edit.new
+        self.time = edit.time
+        return True
+
+
+class IncludeEdit(TreeEdit):
+    """
+    A block was included in or excluded from the input.
+    """
+
+    __slots__ = ("block", "included")
+
+    def __init__(self, block, included):
+        self.block = block
+        self.included = included
+
+    def undo(self):
+        self.block.included = not self.included
+
+    def redo(self):
+        self.block.included = self.included
+
+    def structureChanges(self):
+        return [(self.block.parent, self.block)]
+
+
+class ChildEdit(TreeEdit):
+    """
+    A block was added to or removed from its parent.
+    The removed block is kept as is, with its children.
+    """
+
+    __slots__ = ("parent", "block", "index", "added")
+
+    def __init__(self, parent, block, index, added):
+        self.parent = parent
+        self.block = block
+        self.index = index
+        self.added = added
+
+    def _attach(self):
+        self.parent.addChildBlock(self.block)
+        self.parent.moveChildBlock(self.block.name, self.index)
+
+    def _detach(self):
+        self.parent.removeChildBlock(self.block.name)
+
+    def undo(self):
+        if self.added:
+            self._detach()
+        else:
+            self._attach()
+
+    def redo(self):
+        if self.added:
+            self._attach()
+        else:
+            self._detach()
+
+    def structureChanges(self):
+        return [(self.parent, self.block)]
+
+
+class ReplaceEdit(TreeEdit):
+    """
+    A block was replaced by another one, at the same position.
+    """
+
+    __slots__ = ("parent", "old", "new", "index")
+
+    def __init__(self, parent, old, new, index):
+        self.parent = parent
+        self.old = old
+        self.new = new
+        self.index = index
+
+    def _swap(self, current, other):
+        self.parent.removeChildBlock(current.name)
+        self.parent.addChildBlock(other)
+        self.parent.moveChildBlock(other.name, self.index)
+
+    def undo(self):
+        self._swap(self.new, self.old)
+
+    def redo(self):
+        self._swap(self.old, self.new)
+
+    def structureChanges(self):
+        # the block that was taken out first, both can have the same id
+        if self.old.parent is self.parent:
+            return [(self.parent, self.new), (self.parent, self.old)]
+        return [(self.parent, self.old), (self.parent, self.new)]
+
+
+class RenameEdit(TreeEdit):
+    """
+    A block was renamed.
+    """
+
+    __slots__ = ("block", "old", "new")
+
+    def __init__(self, block, old, new):
+        self.block = block
+        self.old = old
+        self.new = new
+
+    def undo(self):
+        self.block.parent.renameChildBlock(self.new, self.old)
+
+    def redo(self):
+        self.block.parent.renameChildBlock(self.old, self.new)
+
+    def structureChanges(self):
+        return [(self.block.parent, self.block)]
+
+
+class MoveEdit(TreeEdit):
+    """
+    A block was moved to another position in its parent.
+    """
+
+    __slots__ = ("block", "old", "new")
+
+    def __init__(self, block, old, new):
+        self.block = block
+        self.old = old
+        self.new = new
+
+    def undo(self):
+        self.block.parent.moveChildBlock(self.block.name, self.old)
+
+    def redo(self):
+        self.block.parent.moveChildBlock(self.block.name, self.new)
+
+    def structureChanges(self):
+        return [(self.block.parent, self.block)]
+
+
+class WriteOrderEdit(TreeEdit):
+    """
+    The order in which the children of a block are written was changed.
+    """
+
+    __slots__ = ("block", "old", "new")
+
+    def __init__(self, block, old, new):
+        self.block = block
+        self.old = old
+        self.new = new
+
+    def undo(self):
+        self.block.children_write_first = list(self.old)
+
+    def redo(self):
+        self.block.children_write_first = list(self.new)
+
+
+class RootEdit(TreeEdit):
+    """
+    The whole tree was replaced, when the input file is read again.
+    """
+
+    __slots__ = ("tree", "old", "new")
+
+    def __init__(self, tree, old, new):
+        """
+        Input:
+            tree[InputTree]: The tree
+            old[tuple]: State of the tree before, from InputTree._rootState()
+            new[tuple]: State of the tree after
+        """
+        self.tree = tree
+        self.old = old
+        self.new = new
+
+    def undo(self):
+        self.tree._setRootState(self.old)
+
+    def redo(self):
+        self.tree._setRootState(self.new)
+
+
+class EditGroup(TreeEdit):
+    """
+    Edits that are undone and redone together.
+    """
+
+    __slots__ = ("edits",)
+
+    def __init__(self, edits):
+        self.edits = edits
+
+    def undo(self):
+        for edit in reversed(self.edits):
+            edit.undo()
+
+    def redo(self):
+        for edit in self.edits:
+            edit.redo()
+
+
+class InputHistory(object):
+    """
+    Undo and redo journal of the edits made to an InputTree.
+    Edits are recorded after they are made to the tree, undoing them
+    changes the blocks in place.
+    """
+
+    # changes of the same parameter closer than this, in seconds, are a single step
+    MERGE_INTERVAL = 1.0
+
+    def __init__(self, limit=500):
+        """
+        Input:
+            limit[int]: Number of steps that can be undone
+        """
+        super(InputHistory, self).__init__()
+        self._undo = deque(maxlen=limit)
+        self._redo = []
+        self._group = None
+        self._paused = 0
+        # changes each time the tree is changed through the history
+        self.revision = 0
+
+    def record(self, edit):
+        """
+        Add an edit that was made to the tree.
+        Input:
+            edit[TreeEdit]: The edit
+        """
+        if self._paused:
+            return
+        self.revision += 1
+        if self._group is not None:
+            self._group.append(edit)
+            return
+        self._redo.clear()
+        if not self._undo or not self._undo[-1].mergeWith(edit):
+            self._undo.append(edit)
+
+    @contextlib.contextmanager
+    def group(self):
+        """
+        Records the edits made in the context as a single step.
+        Yields the list of the edits, it is filled as they are made.
+        """
+        if self._group is not None:
+            yield self._group
+            return
+        self._group = []
+        try:
+            yield self._group
+        finally:
+            edits, self._group = self._group, None
+            if len(edits) == 1:
+                self.record(edits[0])
+            elif edits:
+                self.record(EditGroup(edits))
+
+    @contextlib.contextmanager
+    def paused(self):
+        """
+        The edits made in the context are not recorded.
+        """
+        self._paused += 1
+        try:
+            yield
+        finally:
+            self._paused -= 1
+
+    def canUndo(self):
+        return len(self._undo) > 0
+
+    def canRedo(self):
+        return len(self._redo) > 0
+
+    def undo(self):
+        """
+        Undo the last step.
+        Return:
+            list[TreeEdit]: The edits undone, in the order they were undone
+        """
+        if not self._undo:
+            return []
+        edit = self._undo.pop()
+        self.revision += 1
+        with self.paused():
+            edit.undo()
+        self._redo.append(edit)
+        return list(reversed(self._edits(edit)))
+
+    def redo(self):
+        """
+        Redo the last step undone.
+        Return:
+            list[TreeEdit]: The edits redone, in the order they were redone
+        """
+        if not self._redo:
+            return []
+        edit = self._redo.pop()
+        self.revision += 1
+        with self.paused():
+            edit.redo()
+        self._undo.append(edit)
+        return self._edits(edit)
+
+    def clear(self):
+        self.revision += 1
+        self._undo.clear()
+        self._redo = []
+
+    @staticmethod
+    def _edits(edit):
+        if type(edit) is EditGroup:
+            return list(edit.edits)
+        return [edit]
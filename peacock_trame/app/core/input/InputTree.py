@@ -9,12 +9,65 @@
 # * https://www.gnu.org/licenses/lgpl-2.1.html
 
 import os
+from collections.abc import Mapping
 
 import mooseutils
 from pyhit import hit
 
 from . import InputTreeWriter
 from .InputFile import InputFile
+from .InputHistory import (
+    ChildEdit,
+    IncludeEdit,
+    InputHistory,
+    MoveEdit,
+    ParamEdit,
+    RenameEdit,
+    ReplaceEdit,
+    RootEdit,
+    WriteOrderEdit,
+)
+from .SchemaDiff import SchemaDiff
+
+
+class BlockPathMap(Mapping):
+    """
+    Maps paths to the blocks of a tree.
+    Blocks are looked up from the root with their path each time, the paths
+    are computed from the tree so nothing needs updating when blocks are
+    renamed, moved or removed.
+    """
+
+    def __init__(self, root):
+        """
+        Input:
+            root[BlockInfo]: Root of the tree
+        """
+        super(BlockPathMap, self).__init__()
+        self.root = root
+
+    def __getitem__(self, path):
+        if not isinstance(path, str) or not path.startswith("/"):
+            raise KeyError(path)
+        node = self.root
+        for name in path.strip("/").split("/"):
+            if not name:
+                continue
+            node = node.children.get(name)
+            if node is None:
+                raise KeyError(path)
+        return node
+
+    def _walk(self, node):
+        yield node.path
+        for c in node.children.values():
+            yield from self._walk(c)
+
+    def __iter__(self):
+        return self._walk(self.root)
+
+    def __len__(self):
+        return sum(1 for _ in self)
 
 
 class InputTree(object):
@@ -32,10 +85,12 @@ class InputTree(object):
         self.app_info = app_info
         self.input_file = None
         self.input_filename = None
-        self._copyDefaultTree()
         self.root = None
         self.path_map = {}
         self.input_has_errors = False
+        self.history = InputHistory()
+        # revision of the history when input_file was read into the tree
+        self._input_revision = None
         if self.app_info.valid():
             self._copyDefaultTree()
 
@@ -47,27 +102,38 @@ class InputTree(object):
         if info:
             return info.getParamInfo(param)
 
-    def _addToPathMap(self, node):
-        if node.hard:
-            self.path_map[node.path] = node
-            for c in node.children.values():
-                self._addToPathMap(c)
-
     def _copyDefaultTree(self):
         if self.app_info.valid():
+            # This is cheap, blocks are only copied from the executable
+            # information when they are used.
             root = self.app_info.path_map["/"]
             self.root = root.copy(None)
-            self.path_map = {}
             self.root.hard = True
-            self._addToPathMap(self.root)
+            self.path_map = BlockPathMap(self.root)
 
     def resetInputFile(self):
         self.input_filename = None
         self.path_map = {}
         self.root = None
+        self.history.clear()
         if self.app_info.valid():
             self._copyDefaultTree()
 
+    def _rootState(self):
+        return (self.root, self.input_file, self.input_filename, self.input_has_errors)
+
+    def _setRootState(self, root_state):
+        """
+        Put back a tree saved with _rootState()
+        """
+        (
+            self.root,
+            self.input_file,
+            self.input_filename,
+            self.input_has_errors,
+        ) = root_state
+        self.path_map = BlockPathMap(self.root)
+
     def _getComments(self, node):
         """
         Get the comments for a node
@@ -114,12 +180,14 @@ class InputTree(object):
 
     def _setInputFile(self, input_file):
         """
-        Copies the nodes of an input file into the tree
+        Copies the nodes of an input file into the tree.
+        Reading an input file again can be undone, the first one can't.
         Input:
             input_file[InputFile]: Input file to copy
         Return:
             bool: True if successful
         """
+        old_state = self._rootState() if self.input_file else None
         self.input_has_errors = False
         if not input_file.root_node:
             return False
@@ -127,18 +195,262 @@ class InputTree(object):
         self.input_filename = input_file.filename
 
         if self.app_info.valid():
-            self._copyDefaultTree()
-            self.root.comments = self._getComments(self.input_file.root_node)
-            active = self._readParameters(self.input_file.root_node, "/")
-            for root_node in self.input_file.root_node.children(
-                node_type=hit.NodeType.Section
-            ):
-                self._addInputFileNode(root_node, root_node.path() in active)
-                if root_node.path() not in self.root.children_write_first:
-                    self.root.children_write_first.append(root_node.path())
+            with self.history.paused():
+                self._copyDefaultTree()
+                self.root.comments = self._getComments(self.input_file.root_node)
+                active = self._readParameters(self.input_file.root_node, "/")
+                for root_node in self.input_file.root_node.children(
+                    node_type=hit.NodeType.Section
+                ):
+                    self._addInputFileNode(root_node, root_node.path() in active)
+                    if root_node.path() not in self.root.children_write_first:
+                        self.root.children_write_first.append(root_node.path())
+            if old_state:
+                self.history.record(RootEdit(self, old_state, self._rootState()))
+            else:
+                self.history.clear()
+            self._input_revision = self.history.revision
             return True
         return False
 
+    @staticmethod
+    def parseInputData(input_str, filename="String"):
+        """
+        Parse an input file without changing any tree, it can be done in
+        another thread than the one using the tree.
+        Input:
+            input_str[str]: The input file data to parse
+            filename[str]: Name of the input file
+        Return:
+            InputFile: The parsed input file, None if it isn't valid
+        """
+        try:
+            input_file = InputFile()
+            if filename is None:
+                filename = ""
+            input_file.readInputData(input_str, filename)
+            return input_file
+        except Exception as e:
+            mooseutils.mooseWarning("parseInputData exception: %s" % e)
+            return None
+
+    def updateInputFileData(self, input_str, filename="String"):
+        """
+        Read an edited version of the input file, see updateInputFile().
+        Input:
+            input_str[str]: The input file data to parse
+            filename[str]: Name of the input file
+        Return:
+            list[TreeEdit]: The edits made to the tree, None if it isn't a valid input file.
+        """
+        new_input_file = self.parseInputData(input_str, filename)
+        if new_input_file is None:
+            return None
+        return self.updateInputFile(new_input_file)
+
+    def updateInputFile(self, new_input_file):
+        """
+        Read an edited version of the input file.
+        Only the sections that are different from the last input file read
+        are read again. Parameter values are set on the existing blocks, a
+        block is only read again when its parameters, type, comments or
+        children were added, removed or renamed. The whole input file is
+        read again if the tree was changed since the last one was read.
+        Input:
+            new_input_file[InputFile]: The parsed input file, see parseInputData()
+        Return:
+            list[TreeEdit]: The edits made to the tree, a RootEdit if the whole
+                input file was read again. None if it isn't a valid input file.
+        """
+        try:
+            if (
+                self.app_info.valid()
+                and self.input_file is not None
+                and self.input_file.root_node is not None
+                and self._input_revision == self.history.revision
+            ):
+                had_errors = self.input_has_errors
+                with self.history.group() as edits:
+                    updated = self._updateSection(
+                        self.root,
+                        self.input_file.root_node,
+                        new_input_file.root_node,
+                    )
+                if updated:
+                    if had_errors:
+                        # the sections that couldn't be read might be gone
+                        self.input_has_errors = not self._hasAllSections(
+                            new_input_file.root_node
+                        )
+                    self.input_file = new_input_file
+                    self.input_filename = new_input_file.filename
+                    self._input_revision = self.history.revision
+                    return edits
+
+            old_state = self._rootState()
+            if not self._setInputFile(new_input_file):
+                return None
+            return [RootEdit(self, old_state, self._rootState())]
+        except Exception as e:
+            mooseutils.mooseWarning("updateInputFile exception: %s" % e)
+            return None
+
+    def _sectionLayout(self, node, fields):
+        """
+        What in a section can't be changed without reading its block again.
+        Input:
+            node[hit.Node]: The section
+            fields[list[hit.Node]]: The fields of the section
+        Return:
+            tuple: The comments, the names and comments of the fields and the
+                fields changing the type or the active children
+        """
+        return (
+            self._getComments(node),
+            [(f.path(), self._getComments(f)) for f in fields],
+            [f.raw() for f in fields if f.path() in ("type", "active", "inactive")],
+        )
+
+    def _updateSection(self, block, old_node, new_node):
+        """
+        Changes a block that was read from a section of the input file to
+        match another version of the section.
+        Input:
+            block[BlockInfo]: The block
+            old_node[hit.Node]: The section the block was read from
+            new_node[hit.Node]: The new version of the section
+        Return:
+            bool: False if the block needs to be read again, it wasn't changed
+        """
+        if old_node.render() == new_node.render():
+            return True
+
+        old_fields = list(old_node.children(node_type=hit.NodeType.Field))
+        new_fields = list(new_node.children(node_type=hit.NodeType.Field))
+        if self._sectionLayout(old_node, old_fields) != self._sectionLayout(
+            new_node, new_fields
+        ):
+            return False
+
+        old_sections = list(old_node.children(node_type=hit.NodeType.Section))
+        new_sections = list(new_node.children(node_type=hit.NodeType.Section))
+        old_names = [n.path() for n in old_sections]
+        names = [n.path() for n in new_sections]
+        if len(set(old_names)) != len(old_names) or len(set(names)) != len(names):
+            # sections given more than once are merged into one block
+            return False
+        names_changed = names != old_names
+        missing = any(name not in block.children for name in names)
+        if (names_changed or missing) and any(
+            f.path() in ("active", "inactive") for f in new_fields
+        ):
+            # which children are included would have to be worked out again
+            return False
+        old_sections = dict(zip(old_names, old_sections))
+
+        for old_field, new_field in zip(old_fields, new_fields):
+            if old_field.raw() != new_field.raw():
+                self.setParamValue(block, new_field.path(), new_field.raw())
+
+        for name, old_child_node in old_sections.items():
+            child = block.children.get(name)
+            if name not in names and child is not None:
+                if child.user_added:
+                    self.removeBlock(child.path)
+                else:
+                    # back to the block of the syntax
+                    self._readBlock(child, None, False)
+
+        for child_node in new_sections:
+            name = child_node.path()
+            child = block.children.get(name)
+            old_child_node = old_sections.get(name)
+            if child is None:
+                # new, or it couldn't be read before
+                with self.history.paused():
+                    self._addInputFileNode(child_node, True)
+                if name in block.children:
+                    self._recordAdded(block.children[name])
+            elif old_child_node is None:
+                # a block of the syntax that wasn't in the input file
+                self._readBlock(child, child_node, True)
+            elif not self._updateSection(child, old_child_node, child_node):
+                self._readBlock(child, child_node, child.included)
+
+        if names_changed:
+            old_order = block.children_write_first
+            block.children_write_first = names
+            self.history.record(WriteOrderEdit(block, old_order, names))
+            # blocks of the syntax come first, then the ones in the input file
+            user_names = [
+                name
+                for name in names
+                if name in block.children and block.children[name].user_added
+            ]
+            index = len(block.children_list) - len(user_names)
+            for name in user_names:
+                if block.children_list[index] != name:
+                    self.moveBlock(block.children[name].path, index)
+                index += 1
+        return True
+
+    def _hasAllSections(self, input_node):
+        """
+        Checks that all the sections of the input file were read into the tree.
+        Input:
+            input_node[hit.Node]: Node of the input file to check
+        Return:
+            bool: True if there is a block for all the sections under input_node
+        """
+        for child_node in input_node.children(node_type=hit.NodeType.Section):
+            path = "/" + child_node.fullpath()
+            if path not in self.path_map or not self._hasAllSections(child_node):
+                return False
+        return True
+
+    def _readBlock(self, block, input_node, included):
+        """
+        Replaces a block with a new copy of the block it was made from, read
+        from a section of the input file.
+        Input:
+            block[BlockInfo]: The block
+            input_node[hit.Node]: The section to read, None to leave the copy as is
+            included[bool]: Whether the block is included
+        """
+        default = self._defaultBlock(block)
+        if default is None:
+            mooseutils.mooseWarning("Could not read %s again" % block.path)
+            self.input_has_errors = True
+            return
+
+        parent = block.parent
+        index = parent.children_list.index(block.name)
+        new_block = default.copy(parent)
+        new_block.name = block.name
+        new_block.user_added = block.user_added
+        with self.history.paused():
+            self.replaceBlock(block, new_block)
+            if input_node is not None:
+                self._addInputFileNode(input_node, included)
+        self.history.record(ReplaceEdit(parent, block, new_block, index))
+
+    def _defaultBlock(self, block):
+        """
+        Gets the block of the syntax, or the star node, a block was copied from.
+        Input:
+            block[BlockInfo]: A block of the tree
+        Return:
+            BlockInfo if found else None
+        """
+        parent = block.parent
+        if parent is None:
+            return self.app_info.path_map.get("/")
+        if block.user_added:
+            return parent.star_node
+        default_parent = self._defaultBlock(parent)
+        if default_parent is not None:
+            return default_parent.children.get(block.name)
+
     def _readParameters(self, input_node, path):
         """
         Read the parameters set on a block.
@@ -236,48 +548,41 @@ class InputTree(object):
             parent = "/"
         info = self.path_map.get(parent)
         if info and info.star_node:
-            block = self._copyNode(info.path, info, info.star_node, name)
+            block = self._copyNode(info, info.star_node, name)
             block.user_added = True
+            self._recordAdded(block)
             return block
 
-    def _addChildrenToPaths(self, parent):
-        for c in parent.children.values():
-            self.path_map[c.path] = c
-            self._addChildrenToPaths(c)
-
-    def _copyNode(self, parent_path, new_parent, node, name):
+    def _copyNode(self, new_parent, node, name):
         new_entry = node.copy(node)
         new_entry.name = name
-        new_entry.path = os.path.join(parent_path, name)
         new_parent.addChildBlock(new_entry)
-        self.path_map[new_entry.path] = new_entry
-        self._addChildrenToPaths(new_entry)
         return new_entry
 
+    def _recordAdded(self, block):
+        # new blocks are added last
+        parent = block.parent
+        index = len(parent.children_list) - 1
+        self.history.record(ChildEdit(parent, block, index, True))
+
     def cloneUserBlock(self, clone_from, new_name):
         info = self.path_map.get(clone_from)
         if info:
-            block = self._copyNode(info.parent.path, info.parent, info, new_name)
+            block = self._copyNode(info.parent, info, new_name)
+            self._recordAdded(block)
             return block
 
     def removeUserBlock(self, parent, name):
         full_path = os.path.join(parent, name)
         self.removeBlock(full_path)
 
-    def _removeChildPaths(self, parent):
-        for c in parent.children.values():
-            if c.path in self.path_map:
-                del self.path_map[c.path]
-
     def renameUserBlock(self, parent, oldname, newname):
         old_full_path = os.path.join(parent, oldname)
         info = self.path_map.get(old_full_path)
         if info:
-            del self.path_map[old_full_path]
-            self._removeChildPaths(info)
             info.parent.renameChildBlock(oldname, newname)
-            self.path_map[info.path] = info
-            self._addChildrenToPaths(info)
+            if info.name == newname:
+                self.history.record(RenameEdit(info, oldname, newname))
 
     def setBlockType(self, parent, new_type):
         """
@@ -285,11 +590,48 @@ class InputTree(object):
         """
         info = self.path_map.get(parent)
         if info:
+            old_type = info.blockType()
             info.setBlockType(new_type)
+            if info.blockType() != old_type:
+                self.history.record(ParamEdit(info, "type", old_type, info.blockType()))
 
     def setBlockSelected(self, path, included):
         info = self.path_map.get(path)
-        info.included = included
+        if info.included != included:
+            info.included = included
+            self.history.record(IncludeEdit(info, included))
+
+    def setParamValue(self, block, param, value):
+        """
+        Sets the value of a parameter of a block.
+        The block doesn't have to be in the tree.
+        Input:
+            block[BlockInfo]: The block
+            param[str]: Name of the parameter
+            value: New value of the parameter
+        """
+        param_info = block.getParamInfo(param)
+        if param_info:
+            old_value = param_info.getValue()
+            param_info.setValue(value)
+            if param_info.getValue() != old_value:
+                self.history.record(
+                    ParamEdit(block, param, old_value, param_info.getValue())
+                )
+
+    def replaceBlock(self, block, new_block):
+        """
+        Puts another block in place of a block, like a copy with another type.
+        Input:
+            block[BlockInfo]: Block in the tree
+            new_block[BlockInfo]: Block to put at its position
+        """
+        parent = block.parent
+        index = parent.children_list.index(block.name)
+        parent.removeChildBlock(block.name)
+        parent.addChildBlock(new_block)
+        parent.moveChildBlock(new_block.name, index)
+        self.history.record(ReplaceEdit(parent, block, new_block, index))
 
     def addUserParam(self, parent, param, value):
         parent_entry = self.path_map.get(parent)
@@ -299,9 +641,10 @@ class InputTree(object):
     def removeBlock(self, path):
         info = self.path_map.get(path)
         if info:
-            del self.path_map[path]
-            info.parent.removeChildBlock(info.name)
-            self._removeChildPaths(info)
+            parent = info.parent
+            index = parent.children_list.index(info.name)
+            parent.removeChildBlock(info.name)
+            self.history.record(ChildEdit(parent, info, index, False))
 
     def moveBlock(self, path, new_index):
         """
@@ -309,7 +652,9 @@ class InputTree(object):
         """
         pinfo = self.path_map.get(path)
         if pinfo:
+            old_index = pinfo.parent.children_list.index(pinfo.name)
             pinfo.parent.moveChildBlock(pinfo.name, new_index)
+            self.history.record(MoveEdit(pinfo, old_index, new_index))
 
     def incompatibleChanges(self, app_info):
         """
@@ -325,6 +670,8 @@ class InputTree(object):
             return False
         if self.app_info.json_data and not app_info.json_data:
             return True
+        if SchemaDiff(self.app_info, app_info).isEmpty():
+            return False
 
         try:
             old_input = self.getInputFileString()
@@ -335,6 +682,78 @@ class InputTree(object):
             mooseutils.mooseWarning("Caught exception: %s" % e)
             return True
 
+    def migrate(self, app_info):
+        """
+        Switch to the syntax of another executable, keeping the current input.
+        Input:
+            app_info[ExecutableInfo]: The new executable info
+        Return:
+            list[str]: What in the input doesn't work with the new syntax
+        """
+        old_root = self.root
+        old_input = self.getInputFileString()
+        filename = self.input_filename
+        self.app_info = app_info
+        self.resetInputFile()
+        read_data = self.setInputFileData(old_input, filename)
+        # the edits are on the blocks of the previous syntax
+        self.history.clear()
+        if not read_data:
+            return ["The input file could not be read with the new syntax"]
+
+        problems = []
+        if old_root:
+            for name in old_root.children_list:
+                self._findMigrationProblems(old_root.children[name], problems)
+        return problems
+
+    def _findMigrationProblems(self, old_block, problems):
+        """
+        Compares a block of the tree before a migration to the same block now.
+        Only the blocks and parameters that are written out are checked.
+        Input:
+            old_block[BlockInfo]: The block before the migration
+            problems[list]: Where to add the problems found
+        """
+        if not old_block.wantsToSave():
+            return
+
+        block = self.getBlockInfo(old_block.path)
+        if not block:
+            problems.append("Block %s no longer exists" % old_block.path)
+            return
+
+        block_type = old_block.blockType()
+        if block_type and block.types and block_type not in block.types:
+            problem = "Type %s of %s no longer exists" % (block_type, block.path)
+            moved_to = self.app_info.index.blocksForType(block_type)
+            if moved_to:
+                problem += ", it can now go in %s" % ", ".join(moved_to)
+            problems.append(problem)
+
+        old_params = list(old_block.parameters.values())
+        old_type_block = old_block.getTypeBlock()
+        if old_type_block:
+            old_params += old_type_block.parameters.values()
+        for old_param in old_params:
+            if old_param.user_added or not (
+                old_param.set_in_input_file or old_param.hasChanged()
+            ):
+                continue
+            param = block.getParamInfo(old_param.name)
+            path = "%s/%s" % (block.path, old_param.name)
+            if not param or param.user_added:
+                problems.append("Parameter %s no longer exists" % path)
+            elif param.options and not param.isVectorType():
+                if param.getValue() and param.getValue() not in param.options:
+                    problems.append(
+                        "Value %s of %s is not a valid option anymore"
+                        % (param.getValue(), path)
+                    )
+
+        for name in old_block.children_list:
+            self._findMigrationProblems(old_block.children[name], problems)
+
 
 if __name__ == "__main__":
     import sys
@@ -25,28 +25,137 @@ def addInactive(hit_parent, parent, children):
         )
 
 
+# Section that stands in for the children of a block while the block is rendered
+_CHILDREN = "peacock_children"
+_layout = None
+
+
+def _between(text, first, second):
+    start = text.find(first) + len(first)
+    return text[start : text.find(second, start)]
+
+
+def _childrenLayout():
+    """
+    Works out once how hit puts the text of sections together, from small renders.
+    Return:
+        tuple(str, str, str): What comes between two child sections, between two
+            top level sections separated by a blank, and after the last top level
+            section when a blank follows it
+    """
+    global _layout
+    if _layout is None:
+        parent = hit.NewSection("s")
+        parent.addChild(hit.NewSection("a"))
+        parent.addChild(hit.NewSection("b"))
+        between = _between(
+            parent.render(0),
+            hit.NewSection("a").render(1),
+            hit.NewSection("b").render(1),
+        )
+
+        first = hit.NewSection("a").render(0)
+        root = hit.NewSection("")
+        root.addChild(hit.NewSection("a"))
+        root.addChild(hit.NewBlank())
+        text = root.render()
+        tail = text[text.find(first) + len(first) :]
+        root.addChild(hit.NewSection("b"))
+        top_between = _between(root.render(), first, hit.NewSection("b").render(0))
+        _layout = (between, top_between, tail)
+    return _layout
+
+
+def _withChildren(hit_node, indent, child_indent, texts, between, tail=""):
+    """
+    Renders a section, with the already rendered text of its children after
+    the rest of its content.
+    Input:
+        hit_node[hit.Node]: The section without its children
+        indent[int]: Depth of the section
+        child_indent[int]: Depth of the children
+        texts[list[str]]: Text of each child
+        between[str]: What goes between two children
+        tail[str]: What goes after the last child
+    Return:
+        str: The text of the section
+    """
+    if not texts:
+        return hit_node.render(indent)
+    hit_node.addChild(hit.NewSection(_CHILDREN))
+    text = hit_node.render(indent)
+    placeholder = hit.NewSection(_CHILDREN).render(child_indent)
+    pos = text.rfind(placeholder)
+    return text[:pos] + between.join(texts) + tail + text[pos + len(placeholder) :]
+
+
 def inputTreeToString(root):
     """
     Main access point to write an InputTree to a string.
+    Only the blocks that changed since it was last written are rendered again.
     Input:
         root[BlockInfo]: Root item of the tree.
     Return:
         str: The input file
     """
+    if root.rendered is not None:
+        return root.rendered[1]
+
     children = root.getChildNames()
     hit_node = hit.NewSection("")
     if root.comments:
         commentNode(hit_node, root.comments, False)
     addInactive(hit_node, root, children)
-    last_child = children[-1]
+    texts = []
+    last_written = None
     for child in children:
         entry = root.children.get(child, None)
         if entry and entry.wantsToSave():
-            addNode(hit_node, entry)
-            if child != last_child:
-                hit_node.addChild(hit.NewBlank())
+            texts.append(blockText(entry, 0))
+            last_written = child
+    _, top_between, tail = _childrenLayout()
+    if last_written == children[-1]:
+        # a blank follows all the top level blocks but the last one
+        tail = ""
+    text = _withChildren(hit_node, 0, 0, texts, top_between, tail)
+    root.rendered = (0, text)
+    return text
+
+
+def blockText(entry, indent):
+    """
+    Renders a block and its children.
+    The text is kept on the block until it or one of its children changes.
+    Input:
+        entry[BlockInfo]: The block
+        indent[int]: Depth of the block, 0 for the top level blocks
+    Return:
+        str: The text of the block
+    """
+    rendered = entry.rendered
+    if rendered is not None and rendered[0] == indent:
+        return rendered[1]
+
+    hit_node = hit.NewSection(entry.name)
+    if entry.comments:
+        commentNode(hit_node, entry.comments, False)
+    nodeParamsString(hit_node, entry)
+    children = entry.getChildNames()
+    addInactive(hit_node, entry, children)
+    texts = []
+    for child in children:
+        child_entry = entry.children.get(child, None)
+        if child_entry and child_entry.wantsToSave():
+            texts.append(blockText(child_entry, indent + 1))
+    between = _childrenLayout()[0]
+    text = _withChildren(hit_node, indent, indent + 1, texts, between)
+    entry.rendered = (indent, text)
 
-    return hit_node.render()
+    type_block = entry.getTypeBlock()
+    if type_block is not None:
+        # its parameters are written here, changes to them go up to this block
+        type_block.rendered = (indent, "")
+    return text
 
 
 def addNode(parent_hit_node, entry):
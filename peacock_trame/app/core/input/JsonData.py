@@ -9,6 +9,7 @@
 # * https://www.gnu.org/licenses/lgpl-2.1.html
 
 import json
+import re
 
 import mooseutils
 
@@ -17,22 +18,208 @@ from ..common import ExeLauncher
 # from PyQt5.QtWidgets import QApplication
 
 
+START_MARKER = "**START JSON DATA**"
+
+
+class JsonStreamReader(object):
+    """
+    Incrementally reads the json dump of an executable from a sequence of text chunks.
+    Each entry of the top level "blocks" object is decoded on its own and handed out
+    as soon as it is complete, so only the largest block needs to be held in memory
+    instead of the whole document.
+    """
+
+    _NON_SPACE_RE = re.compile(r"\S")
+
+    def __init__(self, chunks):
+        """
+        Input:
+            chunks[iterable of str]: The output of the executable or contents of a file.
+        """
+        super(JsonStreamReader, self).__init__()
+        self._chunks = iter(chunks)
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+        self._decoder = json.JSONDecoder()
+
+    def _fill(self, size=1):
+        """
+        Read at least size more characters, dropping the part of the buffer already consumed.
+        The chunks are only joined once, so growing the buffer is linear in the data read.
+        Return:
+            bool: False if there is nothing left to read
+        """
+        pending = []
+        pending_size = 0
+        for chunk in self._chunks:
+            pending.append(chunk)
+            pending_size += len(chunk)
+            if pending_size >= size:
+                break
+        else:
+            self._eof = True
+        if pending_size:
+            self._buf = self._buf[self._pos :] + "".join(pending)
+            self._pos = 0
+        return pending_size > 0
+
+    def _peek(self):
+        """
+        Skips whitespace and returns the next character without consuming it.
+        """
+        while True:
+            m = self._NON_SPACE_RE.search(self._buf, self._pos)
+            if m:
+                self._pos = m.start()
+                return self._buf[self._pos]
+            self._pos = len(self._buf)
+            if not self._fill():
+                raise ValueError("Unexpected end of json data")
+
+    def _next(self):
+        """
+        Skips whitespace and consumes the next character.
+        """
+        c = self._peek()
+        self._pos += 1
+        return c
+
+    def _expect(self, expected):
+        c = self._next()
+        if c != expected:
+            raise ValueError("Expected '%s' in json data but got '%s'" % (expected, c))
+
+    def _findStart(self):
+        """
+        Skips over anything the executable printed before the json data.
+        A plain json document (without the start marker) is also accepted.
+        """
+        if self._peek() == "{":
+            return
+        while True:
+            idx = self._buf.find(START_MARKER, self._pos)
+            if idx >= 0:
+                self._pos = idx + len(START_MARKER)
+                return
+            self._pos = max(self._pos, len(self._buf) - len(START_MARKER) + 1)
+            if not self._fill():
+                raise ValueError("Could not find the start of the json data")
+
+    def _readValue(self):
+        """
+        Consumes and decodes the next json value.
+        If the value is not complete yet, more data is read until the amount of
+        buffered data doubles before trying again. This keeps the total decoding
+        work linear in the size of the value.
+        """
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+                # A value that ends exactly at the end of the buffer could be a truncated number
+                if end < len(self._buf) or self._eof:
+                    self._pos = end
+                    return value
+            except ValueError:
+                if self._eof:
+                    raise
+            self._fill(max(len(self._buf) - self._pos, 1))
+
+    def _readKey(self):
+        """
+        Consumes an object key and the following colon.
+        """
+        if self._peek() != '"':
+            raise ValueError("Expected a key in json data")
+        key = self._readValue()
+        self._expect(":")
+        return key
+
+    def _readMembers(self, callback):
+        """
+        Reads the members of an object, calling callback(key) for each
+        with the reader positioned on the value.
+        """
+        self._expect("{")
+        if self._peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            callback(self._readKey())
+            c = self._next()
+            if c == "}":
+                return
+            if c != ",":
+                raise ValueError("Expected ',' or '}' in json data but got '%s'" % c)
+
+    def read(self, block_callback=None):
+        """
+        Reads the json document.
+        Input:
+            block_callback[callable]: Called with (name, data) for each top level block.
+                If None, the blocks are kept in the returned data.
+        Return:
+            dict: The json data. If block_callback was given, "blocks" will be empty.
+        """
+        data = {}
+        blocks = {}
+
+        def readBlock(name):
+            block = self._readValue()
+            if block_callback:
+                block_callback(name, block)
+            else:
+                blocks[name] = block
+
+        def readMember(key):
+            if key == "blocks":
+                data["blocks"] = blocks
+                self._readMembers(readBlock)
+            else:
+                data[key] = self._readValue()
+
+        self._findStart()
+        self._readMembers(readMember)
+        data.setdefault("blocks", blocks)
+        return data
+
+    def finish(self):
+        """
+        Consumes the rest of the chunks, for example the end marker.
+        """
+        for _ in self._chunks:
+            pass
+        self._buf = ""
+        self._pos = 0
+        self._eof = True
+
+
 class JsonData(object):
     """
     Class that holds the json produced by an executable.
     """
 
-    def __init__(self, app_path="", extra_args=[], **kwds):
+    def __init__(
+        self, app_path="", extra_args=[], block_callback=None, search="", **kwds
+    ):
         """
         Constructor.
         Input:
             app_path: Path to the executable.
+            block_callback: Optional callable called with (name, data) for each
+                top level block as soon as it is read. The blocks are then not
+                kept in json_data.
+            search: Optional search string passed to "--json" so that the
+                executable only dumps the matching part of the syntax.
         """
         super(JsonData, self).__init__(**kwds)
 
         self.json_data = None
         self.app_path = None
         self.extra_args = extra_args
+        self.block_callback = block_callback
+        self.search = search
         if app_path:
             self.appChanged(app_path)
 
@@ -52,30 +239,42 @@ class JsonData(object):
             app_path: New executable path
         """
         try:
-            # self._processEvents()
-            raw_data = self._getRawDump(app_path)
-            # self._processEvents()
-            self.json_data = json.loads(raw_data)
-            # self._processEvents()
+            self.json_data = self._readStream(self._getRawDump(app_path))
             self.app_path = app_path
         except Exception as e:
             mooseutils.mooseWarning("Failed to load json from '%s': %s" % (app_path, e))
 
+    def readFromFile(self, json_file):
+        """
+        Read the json data from a file instead of running the executable.
+        The file can either be plain json or the raw output of "--json".
+        Input:
+            json_file: Path to the file
+        """
+        with open(json_file, "r") as f:
+            self.json_data = self._readStream(iter(lambda: f.read(1 << 16), ""))
+        self.app_path = json_file
+
+    def _readStream(self, chunks):
+        reader = JsonStreamReader(chunks)
+        data = reader.read(self.block_callback)
+        reader.finish()
+        return data
+
     def _getRawDump(self, app_path):
         """
         Generate the raw data from the executable.
         Return:
-            the data
+            generator of str: chunks of the output of the executable
         """
         #  "-options_left 0" is used to stop the debug version of PETSc from printing
         # out WARNING messages that sometime confuse the json parser
         print("running executable")
-        data = ExeLauncher.runExe(
-            app_path, ["-options_left", "0", "--json"] + self.extra_args
-        )
-        data = data.split("**START JSON DATA**\n")[1]
-        data = data.split("**END JSON DATA**")[0]
-        return data
+        args = ["-options_left", "0", "--json"]
+        if self.search:
+            # the search string has to come right after "--json"
+            args.append(self.search)
+        return ExeLauncher.streamExe(app_path, args + self.extra_args)
 
     def toPickle(self):
         """
@@ -1,60 +1,105 @@
-# * This file is part of the MOOSE framework
-# * https://www.mooseframework.org
-# *
-# * All rights reserved, see COPYRIGHT for full restrictions
-# * https://github.com/idaholab/moose/blob/master/COPYRIGHT
-# *
-# * Licensed under LGPL 2.1, please see LICENSE for details
-# * https://www.gnu.org/licenses/lgpl-2.1.html
-
 import copy
+import operator
+import weakref
 
+from .ValueCodec import NumericArray, getCodec
 
-class ParameterInfo(object):
+
+def parseValue(basic_type, value):
     """
-    Holds the information for a parameter
+    Converts a value to the python type matching a parameter type.
+    Input:
+        basic_type[str]: Basic type of the parameter as given in the json data
+        value: The value to parse
+    Return:
+        The parsed value
     """
+    if value is None or (type(value) is str and value == ""):
+        return ""
+    return getCodec(basic_type).parse(value)
 
-    def __init__(self, parent, name):
-        self._value = ""
-        self.user_added = False
-        self.name = name
-        self.required = False
-        self.cpp_type = "string"
-        self.basic_type = "String"
-        self.group_name = "Main"
-        self.description = ""
-        self.default = ""
-        self.parent = parent
-        self.comments = ""
-        self.options = []
-        self.set_in_input_file = False
 
-    def setFromData(self, data):
+class ParameterSchema(object):
+    """
+    The description of a parameter as given by the executable.
+    These are immutable and interned, so all the parameters with the same
+    description share a single instance.
+    """
+
+    __slots__ = (
+        "cpp_type",
+        "basic_type",
+        "group_name",
+        "description",
+        "required",
+        "options",
+        "default",
+        "_raw_default",
+        "__weakref__",
+    )
+
+    _interned = weakref.WeakValueDictionary()
+
+    @classmethod
+    def get(
+        cls,
+        cpp_type="string",
+        basic_type="String",
+        group_name="Main",
+        description="",
+        required=False,
+        options=(),
+        default="",
+    ):
         """
-        Sets this attributes from a Json dict.
+        Get the shared schema with the given attributes.
         Input:
-            data[dict]: This is the dict description of the parameter as read from the JSON dump.
+            default[str]: The unparsed default value
+        Return:
+            ParameterSchema
         """
+        key = (
+            cpp_type,
+            basic_type,
+            group_name,
+            description,
+            required,
+            options,
+            default,
+        )
+        schema = cls._interned.get(key)
+        if schema is None:
+            schema = object.__new__(cls)
+            for name, val in zip(cls.__slots__, key):
+                object.__setattr__(schema, name, val)
+            object.__setattr__(schema, "default", parseValue(basic_type, default))
+            object.__setattr__(schema, "_raw_default", default)
+            cls._interned[key] = schema
+        return schema
 
-        self.cpp_type = data["cpp_type"]
-        self.basic_type = data["basic_type"]
-        self.description = data["description"]
-        self.group_name = data["group_name"]
-        if not self.group_name:
-            self.group_name = "Main"
-        self.required = data["required"]
-        self.name = data["name"]
-        self.options = data.get("options", "")
-        if self.options:
-            self.options = self.options.strip().split()
+    @classmethod
+    def fromData(cls, data):
+        """
+        Get the shared schema for a parameter from a Json dict.
+        Input:
+            data[dict]: This is the dict description of the parameter as read from the JSON dump.
+        Return:
+            ParameterSchema
+        """
+        group_name = data["group_name"]
+        if not group_name:
+            group_name = "Main"
+        options = data.get("options", "")
+        if options:
+            options = tuple(options.strip().split())
         else:
-            self.options = []
+            options = ()
 
+        cpp_type = data["cpp_type"]
         default = data.get("default", "")
         if default is None:
             default = ""
-        if self.cpp_type == "bool":
+        if cpp_type == "bool":
             if default == "0":
                 default = "false"
             elif default == "1":
@@ -62,8 +107,111 @@ class ParameterInfo(object):
             elif not default:
                 default = "false"
 
-        self.default = self._parse(default)
-        self._value = self.default
+        return cls.get(
+            cpp_type,
+            data["basic_type"],
+            group_name,
+            data["description"],
+            data["required"],
+            options,
+            default,
+        )
+
+    def __setattr__(self, name, value):
+        raise AttributeError("ParameterSchema is immutable")
+
+    def __reduce__(self):
+        return (
+            ParameterSchema.get,
+            (
+                self.cpp_type,
+                self.basic_type,
+                self.group_name,
+                self.description,
+                self.required,
+                self.options,
+                self._raw_default,
+            ),
+        )
+
+
+class ParameterInfo(object):
+    """
+    Holds the information for a parameter.
+    The description of the parameter is held by a shared ParameterSchema,
+    this only holds what is specific to this instance.
+    """
+
+    __slots__ = (
+        "_value",
+        "user_added",
+        "name",
+        "schema",
+        "parent",
+        "comments",
+        "set_in_input_file",
+    )
+
+    def __getstate__(self):
+        return _getState(self)
+
+    def __setstate__(self, state):
+        (
+            self._value,
+            self.user_added,
+            self.name,
+            self.schema,
+            self.parent,
+            self.comments,
+            self.set_in_input_file,
+        ) = state
+
+    def __init__(self, parent, name):
+        self._value = ""
+        self.user_added = False
+        self.name = name
+        self.schema = ParameterSchema.get()
+        self.parent = parent
+        self.comments = ""
+        self.set_in_input_file = False
+
+    @property
+    def cpp_type(self):
+        return self.schema.cpp_type
+
+    @property
+    def basic_type(self):
+        return self.schema.basic_type
+
+    @property
+    def group_name(self):
+        return self.schema.group_name
+
+    @property
+    def description(self):
+        return self.schema.description
+
+    @property
+    def required(self):
+        return self.schema.required
+
+    @property
+    def options(self):
+        return self.schema.options
+
+    @property
+    def default(self):
+        return self.schema.default
+
+    def setFromData(self, data):
+        """
+        Sets this attributes from a Json dict.
+        Input:
+            data[dict]: This is the dict description of the parameter as read from the JSON dump.
+        """
+        self.name = data["name"]
+        self.schema = ParameterSchema.fromData(data)
+        self._value = self.schema.default
 
     def copy(self, parent):
         """
@@ -116,7 +264,9 @@ class ParameterInfo(object):
         """
         value = self._value
 
-        if type(value) is list:
+        if type(value) is NumericArray:
+            file_value = value.fileValue()
+        elif type(value) is list:
             file_value = " ".join([self._fileValue(val) for val in value])
         else:
             file_value = self._fileValue(value)
@@ -146,36 +296,21 @@ class ParameterInfo(object):
         return self.description + ". Default: %s" % self.default
 
     def setValue(self, value):
+        old = self._value
         self._value = self._parse(value)
+        parent = self.parent
+        if (
+            parent is not None
+            and (parent._fingerprint is not None or parent.rendered is not None)
+            and old != self._value
+        ):
+            parent._contentChanged()
 
     def getValue(self):
         return self._value
 
     def _parse(self, value):
-        if value == "" or value is None:
-            return ""
-
-        basic_type = self.basic_type
-        basic_type_parse_map = {
-            "Integer": int,
-            "Real": float,
-            "Boolean": lambda x: (type(x) is bool and x) or x == "true",
-            "String": lambda x: x,
-        }
-
-        if basic_type.startswith("Array:"):
-            basic_type = basic_type.split("Array:")[-1]
-            parse_func = basic_type_parse_map[basic_type]
-
-            if type(value) is str:
-                return [parse_func(val) for val in value.split()]
-            elif type(value) is list:
-                return [parse_func(val) for val in value]
-            else:
-                return parse_func(value)
-        else:
-            parse_func = basic_type_parse_map[basic_type]
-            return parse_func(value)
+        return parseValue(self.basic_type, value)
 
     def hasChanged(self):
         return self._value != self.default or self.comments
@@ -190,3 +325,6 @@ class ParameterInfo(object):
         o.write("%sGroup: %s\n" % (indent * sep, self.group_name))
         o.write("%sDescription: %s\n" % (indent * sep, self.description))
         o.write("%sComments: %s\n" % (indent * sep, self.comments))
+
+
+_getState = operator.attrgetter(*ParameterInfo.__slots__)
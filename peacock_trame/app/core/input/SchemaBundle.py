@@ -0,0 +1,105 @@
+# * This file is part of the MOOSE framework
+# * https://www.mooseframework.org
+# *
+# * All rights reserved, see COPYRIGHT for full restrictions
+# * https://github.com/idaholab/moose/blob/master/COPYRIGHT
+# *
+# * Licensed under LGPL 2.1, please see LICENSE for details
+# * https://www.gnu.org/licenses/lgpl-2.1.html
+
+import os
+import pickle
+import struct
+import tempfile
+import zlib
+
+from ..common.PeacockException import BadSchemaException
+from . import SchemaStore
+
+MAGIC = b"PEACOCK-SCHEMA\n"
+# version, whether the data is a SchemaStore instead of compressed
+_HEADER = struct.Struct("<IB")
+
+
+def isBundle(path):
+    """
+    Checks whether a file is a schema bundle.
+    Input:
+        path[str]: File to check
+    Return:
+        bool
+    """
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def writeBundle(path, data, version, mapped=False):
+    """
+    Writes the processed syntax of an executable to a bundle.
+    The file is a magic string, the version and the compressed pickled data.
+    Input:
+        path[str]: File to write
+        data[dict]: Data from ExecutableInfo.toPickle()
+        version[int]: Version of the data. Bundles are only read with the same version.
+        mapped[bool]: Write the data uncompressed as a SchemaStore, so that processes
+            reading the bundle map it and share its memory.
+    """
+    payload = None
+    if not mapped:
+        payload = zlib.compress(SchemaStore.dumps(data), 6)
+    out_dir = os.path.dirname(os.path.abspath(path))
+    os.makedirs(out_dir, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=out_dir, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(MAGIC)
+            f.write(_HEADER.pack(version, mapped))
+            if mapped:
+                SchemaStore.dump(f, data)
+            else:
+                f.write(payload)
+        # mkstemp only makes the file readable by the owner
+        os.chmod(tmp_name, 0o644)
+        os.replace(tmp_name, path)
+    except Exception:
+        if os.path.exists(tmp_name):
+            os.remove(tmp_name)
+        raise
+
+
+def readBundle(path, version, with_size=False):
+    """
+    Reads a bundle written by writeBundle.
+    Input:
+        path[str]: File to read
+        version[int]: Expected version of the data
+        with_size[bool]: Also return the size of the data that isn't mapped
+    Return:
+        dict: The data passed to writeBundle, with its size in bytes if with_size is set
+    """
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise BadSchemaException("%s is not a schema bundle" % path)
+        file_version, mapped = _HEADER.unpack(f.read(_HEADER.size))
+        if file_version != version:
+            raise BadSchemaException(
+                "Schema bundle %s has version %s but version %s is required. Rebuild it with 'peacock-trame build-schema'."
+                % (path, file_version, version)
+            )
+        try:
+            if mapped:
+                offset = f.tell()
+                data = SchemaStore.load(path, offset)
+                size = SchemaStore.dataSize(path, offset)
+            else:
+                payload = zlib.decompress(f.read())
+                data = pickle.loads(payload)
+                size = len(payload)
+        except Exception as e:
+            raise BadSchemaException("Failed to read schema bundle %s: %s" % (path, e))
+    if with_size:
+        return data, size
+    return data
@@ -0,0 +1,194 @@
+# * This file is part of the MOOSE framework
+# * https://www.mooseframework.org
+# *
+# * All rights reserved, see COPYRIGHT for full restrictions
+# * https://github.com/idaholab/moose/blob/master/COPYRIGHT
+# *
+# * Licensed under LGPL 2.1, please see LICENSE for details
+# * https://www.gnu.org/licenses/lgpl-2.1.html
+
+
+class SchemaChange(object):
+    """
+    A single difference between the syntax of two executables.
+    """
+
+    BLOCK_ADDED = "block added"
+    BLOCK_REMOVED = "block removed"
+    TYPE_ADDED = "type added"
+    TYPE_REMOVED = "type removed"
+    STAR_ADDED = "star node added"
+    STAR_REMOVED = "star node removed"
+    PARAM_ADDED = "parameter added"
+    PARAM_REMOVED = "parameter removed"
+    PARAM_RETYPED = "parameter retyped"
+    DEFAULT_CHANGED = "default changed"
+    OPTIONS_CHANGED = "options changed"
+
+    def __init__(self, kind, path, old=None, new=None):
+        """
+        Input:
+            kind[str]: One of the constants above
+            path[str]: Path of the block or parameter
+            old: Old value, for changes
+            new: New value, for changes
+        """
+        super(SchemaChange, self).__init__()
+        self.kind = kind
+        self.path = path
+        self.old = old
+        self.new = new
+
+    def __str__(self):
+        if self.old is None and self.new is None:
+            return "%s: %s" % (self.kind, self.path)
+        return "%s: %s (%s -> %s)" % (self.kind, self.path, self.old, self.new)
+
+    def __repr__(self):
+        return "SchemaChange(%r, %r, %r, %r)" % (
+            self.kind,
+            self.path,
+            self.old,
+            self.new,
+        )
+
+
+class SchemaDiff(object):
+    """
+    The structural differences between the syntax of two executables.
+    Blocks with the same fingerprint are skipped without being looked at,
+    so the cost depends on the size of the changes instead of the size
+    of the syntax.
+    """
+
+    def __init__(self, old_info, new_info):
+        """
+        Input:
+            old_info[ExecutableInfo]: The syntax before
+            new_info[ExecutableInfo]: The syntax after
+        """
+        super(SchemaDiff, self).__init__()
+        self.changes = []
+        self._old_fingerprints = old_info.fingerprints
+        self._new_fingerprints = new_info.fingerprints
+        self._key = old_info.fingerprintKey
+        old_root = old_info.path_map.get("/")
+        new_root = new_info.path_map.get("/")
+        if old_root and new_root:
+            self._diffBlock("", old_root, new_root)
+
+    def isEmpty(self):
+        """
+        Return:
+            bool: True if the syntax is the same
+        """
+        return not self.changes
+
+    def summary(self, limit=None):
+        """
+        Human readable list of the changes.
+        Input:
+            limit[int]: Maximum number of lines
+        Return:
+            list[str]
+        """
+        lines = [str(c) for c in self.changes[:limit]]
+        if limit is not None and len(self.changes) > limit:
+            lines.append("... and %s more" % (len(self.changes) - limit))
+        return lines
+
+    def _same(self, key):
+        old_fp = self._old_fingerprints.get(key)
+        return old_fp is not None and old_fp == self._new_fingerprints.get(key)
+
+    def _diffBlock(self, key, old, new):
+        if key and self._same(key):
+            return
+
+        self._diffNamed(
+            key,
+            "subblocks",
+            old.children,
+            new.children,
+            new.children_list,
+            SchemaChange.BLOCK_ADDED,
+            SchemaChange.BLOCK_REMOVED,
+        )
+        self._diffNamed(
+            key,
+            "types",
+            old.types,
+            new.types,
+            list(new.types),
+            SchemaChange.TYPE_ADDED,
+            SchemaChange.TYPE_REMOVED,
+        )
+
+        star_key = self._key(key, "*", "star")
+        if old.star_node and new.star_node:
+            self._diffBlock(star_key, old.star_node, new.star_node)
+        elif old.star_node:
+            self.changes.append(SchemaChange(SchemaChange.STAR_REMOVED, old.path))
+        elif new.star_node:
+            self.changes.append(SchemaChange(SchemaChange.STAR_ADDED, new.path))
+
+        self._diffParameters(old, new)
+
+    def _diffNamed(self, key, kind, old_blocks, new_blocks, new_order, added, removed):
+        for name, old_block in old_blocks.items():
+            new_block = new_blocks.get(name)
+            if new_block is None:
+                self.changes.append(SchemaChange(removed, old_block.path))
+            else:
+                self._diffBlock(self._key(key, name, kind), old_block, new_block)
+        for name in new_order:
+            if name not in old_blocks:
+                self.changes.append(SchemaChange(added, new_blocks[name].path))
+
+    def _diffParameters(self, old, new):
+        old_params = old.parameters
+        new_params = new.parameters
+        for name, old_param in old_params.items():
+            path = "%s/%s" % (old.path.rstrip("/"), name)
+            new_param = new_params.get(name)
+            if new_param is None:
+                self.changes.append(SchemaChange(SchemaChange.PARAM_REMOVED, path))
+                continue
+            old_schema = old_param.schema
+            new_schema = new_param.schema
+            if old_schema is new_schema:
+                continue
+            if (old_schema.cpp_type, old_schema.basic_type) != (
+                new_schema.cpp_type,
+                new_schema.basic_type,
+            ):
+                self.changes.append(
+                    SchemaChange(
+                        SchemaChange.PARAM_RETYPED,
+                        path,
+                        old_schema.cpp_type,
+                        new_schema.cpp_type,
+                    )
+                )
+            if old_schema.default != new_schema.default:
+                self.changes.append(
+                    SchemaChange(
+                        SchemaChange.DEFAULT_CHANGED,
+                        path,
+                        old_schema.default,
+                        new_schema.default,
+                    )
+                )
+            if old_schema.options != new_schema.options:
+                self.changes.append(
+                    SchemaChange(
+                        SchemaChange.OPTIONS_CHANGED,
+                        path,
+                        " ".join(old_schema.options),
+                        " ".join(new_schema.options),
+                    )
+                )
+        for name in new.parameters_list:
+            if name not in old_params:
+                path = "%s/%s" % (new.path.rstrip("/"), name)
+                self.changes.append(SchemaChange(SchemaChange.PARAM_ADDED, path))
@@ -0,0 +1,151 @@
+# * This file is part of the MOOSE framework
+# * https://www.mooseframework.org
+# *
+# * All rights reserved, see COPYRIGHT for full restrictions
+# * https://github.com/idaholab/moose/blob/master/COPYRIGHT
+# *
+# * Licensed under LGPL 2.1, please see LICENSE for details
+# * https://www.gnu.org/licenses/lgpl-2.1.html
+
+import os
+import sys
+
+from .SearchIndex import SearchIndex
+
+
+def _getDict(jdata, key):
+    d = jdata.get(key, {})
+    if not d:
+        d = {}
+    return d
+
+
+class SchemaIndex(object):
+    """
+    Inverted indexes over the syntax of an executable.
+    They are built from the json data while it is loaded, so they don't need
+    the blocks to be built, and are saved along with the rest of the syntax.
+    Paths are the paths of the blocks in ExecutableInfo.path_map, types included,
+    ie "/Executioner/Steady" or "/Kernels/*/Diffusion".
+    """
+
+    def __init__(self):
+        super(SchemaIndex, self).__init__()
+        # type name -> paths of the blocks that take it as their type
+        self.type_blocks = {}
+        # parameter name -> paths of the blocks that have it
+        self.parameter_owners = {}
+        # cpp type -> (block path, parameter name) of the parameters of that type
+        self.cpp_type_parameters = {}
+        # cpp type -> paths of the blocks creating objects that can be used as that type
+        self.associated_blocks = {}
+        # names and descriptions of the blocks and parameters
+        self.search = SearchIndex()
+
+    def addBlock(self, parent_path, path, jdata, type_name=None):
+        """
+        Adds a block and all of its descendants.
+        Input:
+            parent_path[str]: Path of the parent of the block
+            path[str]: Path of the block
+            jdata[dict]: Json data of the block
+            type_name[str]: Name of the type if the block is a type of its parent
+        """
+        path = sys.intern(path)
+        if type_name is not None:
+            self.type_blocks.setdefault(type_name, []).append(parent_path)
+        self.search.addDocument(
+            path, "", os.path.basename(path), jdata.get("description", "")
+        )
+
+        for name, child in _getDict(jdata, "subblocks").items():
+            self.addBlock(path, os.path.join(path, name), child)
+
+        for name, child in _getDict(jdata, "types").items():
+            self.addBlock(path, os.path.join(path, name), child, name)
+
+        if "star" in jdata:
+            self.addBlock(path, os.path.join(path, "*"), jdata["star"])
+
+        for name, child in _getDict(jdata, "subblock_types").items():
+            self.addBlock(path, os.path.join(path, name), child, name)
+
+        for t in jdata.get("associated_types", []):
+            self.associated_blocks.setdefault(t, []).append(parent_path)
+
+        for action in _getDict(jdata, "actions").values():
+            self._addParameters(path, _getDict(action, "parameters"))
+        self._addParameters(path, _getDict(jdata, "parameters"))
+
+    def finish(self):
+        """
+        Called once all the blocks are added.
+        """
+        self.search.finish()
+
+    def merge(self, other):
+        """
+        Adds everything in another index, as if its blocks were added to this one.
+        Input:
+            other[SchemaIndex]: Index to add
+        """
+        for mine, theirs in (
+            (self.type_blocks, other.type_blocks),
+            (self.parameter_owners, other.parameter_owners),
+            (self.cpp_type_parameters, other.cpp_type_parameters),
+            (self.associated_blocks, other.associated_blocks),
+        ):
+            for key, val in theirs.items():
+                mine.setdefault(key, []).extend(val)
+        self.search.merge(other.search)
+
+    def _addParameters(self, path, params):
+        for name, param in params.items():
+            name = sys.intern(name)
+            owners = self.parameter_owners.setdefault(name, [])
+            # common parameters of the actions can also be regular parameters
+            if owners and owners[-1] is path:
+                continue
+            owners.append(path)
+            self.search.addDocument(path, name, name, param.get("description", ""))
+            cpp_type = param.get("cpp_type", "")
+            self.cpp_type_parameters.setdefault(cpp_type, []).append((path, name))
+
+    def blocksForType(self, type_name):
+        """
+        Where an object can go, ie "ADMatDiffusion" -> ["/Kernels/*"]
+        Input:
+            type_name[str]: Name of the type
+        Return:
+            list[str]: Paths of the blocks that take it as their type
+        """
+        return self.type_blocks.get(type_name, ())
+
+    def parameterOwners(self, param_name):
+        """
+        Input:
+            param_name[str]: Name of the parameter
+        Return:
+            list[str]: Paths of the blocks that have a parameter with that name
+        """
+        return self.parameter_owners.get(param_name, ())
+
+    def parametersOfCppType(self, cpp_type):
+        """
+        Input:
+            cpp_type[str]: C++ type, ie "UserObjectName" or "std::vector<BoundaryName>"
+        Return:
+            list[tuple]: (block path, parameter name) of the parameters with that type
+        """
+        return self.cpp_type_parameters.get(cpp_type, ())
+
+    def associatedBlocks(self, cpp_type):
+        """
+        Which blocks create the objects a parameter of that type refers to,
+        ie "UserObjectName" -> ["/UserObjects"]
+        Input:
+            cpp_type[str]: C++ type
+        Return:
+            list[str]: Paths of the blocks
+        """
+        return self.associated_blocks.get(cpp_type, ())
@@ -0,0 +1,202 @@
+# * This file is part of the MOOSE framework
+# * https://www.mooseframework.org
+# *
+# * All rights reserved, see COPYRIGHT for full restrictions
+# * https://github.com/idaholab/moose/blob/master/COPYRIGHT
+# *
+# * Licensed under LGPL 2.1, please see LICENSE for details
+# * https://www.gnu.org/licenses/lgpl-2.1.html
+
+"""
+Read-only store for the processed syntax that is memory mapped instead of read.
+
+The big buffers of the data (the compact json of the blocks, the postings of the
+search index) are written as is and come back as read-only memoryviews into the
+mapped file. They are paged in when used and shared by all the processes mapping
+the same file, only the rest of the data is unpickled in each process.
+"""
+
+import copyreg
+import io
+import mmap
+import pickle
+import struct
+from array import array
+
+from ..common.PeacockException import BadSchemaException
+
+MAGIC = b"PEACOCK-STORE\n"
+# offset of the pickled data from the start of the store, size of the pickled data
+_HEADER = struct.Struct("<QQ")
+# smaller buffers are kept in the pickled data
+MIN_MAPPED_SIZE = 4096
+_ALIGN = 8
+
+
+def _align(offset):
+    return (offset + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+def _reduceMemoryview(view):
+    # mapped buffers are copied when pickled the regular way
+    if view.format == "B":
+        return bytes, (view.tobytes(),)
+    return array, (view.format, view.tobytes())
+
+
+_dispatch_table = copyreg.dispatch_table.copy()
+_dispatch_table[memoryview] = _reduceMemoryview
+
+
+def _pickler(f):
+    pickler = pickle.Pickler(f, protocol=pickle.HIGHEST_PROTOCOL)
+    pickler.dispatch_table = _dispatch_table
+    return pickler
+
+
+def dumps(obj):
+    """
+    Regular pickle of data that might come from a store.
+    Input:
+        obj: Object to pickle
+    Return:
+        bytes
+    """
+    f = io.BytesIO()
+    _pickler(f).dump(obj)
+    return f.getvalue()
+
+
+class _StorePickler(pickle.Pickler):
+    def __init__(self, f):
+        super(_StorePickler, self).__init__(f, protocol=pickle.HIGHEST_PROTOCOL)
+        self.buffers = []
+        self.size = 0
+        self._ids = {}
+
+    def persistent_id(self, obj):
+        obj_type = type(obj)
+        if obj_type is bytes:
+            fmt, nbytes = "B", len(obj)
+        elif obj_type is array:
+            fmt, nbytes = obj.typecode, obj.itemsize * len(obj)
+        elif obj_type is memoryview:
+            fmt, nbytes = obj.format, obj.nbytes
+        else:
+            return None
+        if nbytes < MIN_MAPPED_SIZE and obj_type is not memoryview:
+            return None
+
+        pid = self._ids.get(id(obj))
+        if pid is None:
+            pid = (self.size, nbytes, fmt)
+            self._ids[id(obj)] = pid
+            # also keeps obj alive so that its id isn't reused
+            self.buffers.append(obj)
+            self.size = _align(self.size + nbytes)
+        return pid
+
+
+class _StoreUnpickler(pickle.Unpickler):
+    def __init__(self, f, view):
+        super(_StoreUnpickler, self).__init__(f)
+        self._view = view
+        self._loaded = {}
+
+    def persistent_load(self, pid):
+        buf = self._loaded.get(pid)
+        if buf is None:
+            offset, nbytes, fmt = pid
+            buf = self._view[offset : offset + nbytes]
+            if fmt != "B":
+                buf = buf.cast(fmt)
+            self._loaded[pid] = buf
+        return buf
+
+
+def dump(f, obj):
+    """
+    Writes a store at the current position of a file.
+    Input:
+        f[file]: File opened for writing in binary mode
+        obj: Object to store
+    """
+    start = f.tell()
+    data = io.BytesIO()
+    pickler = _StorePickler(data)
+    pickler.dump(obj)
+
+    buffers_start = _align(start + len(MAGIC) + _HEADER.size)
+    data_offset = buffers_start - start + pickler.size
+    f.write(MAGIC)
+    f.write(_HEADER.pack(data_offset, len(data.getbuffer())))
+    f.write(b"\0" * (buffers_start - f.tell()))
+    for buf in pickler.buffers:
+        f.write(buf)
+        f.write(b"\0" * (_align(f.tell()) - f.tell()))
+    f.write(data.getbuffer())
+
+
+def dataSize(path, offset=0):
+    """
+    Size of the part of a store that is unpickled in each process, the mapped
+    buffers are left out since they are shared.
+    Input:
+        path[str]: File holding the store
+        offset[int]: Position of the store in the file
+    Return:
+        int: Size in bytes
+    """
+    with open(path, "rb") as f:
+        f.seek(offset + len(MAGIC))
+        return _HEADER.unpack(f.read(_HEADER.size))[1]
+
+
+def load(path, offset=0):
+    """
+    Maps a store written by dump().
+    Input:
+        path[str]: File holding the store
+        offset[int]: Position of the store in the file
+    Return:
+        The stored object
+    """
+    with open(path, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    view = memoryview(mapped)
+    if view[offset : offset + len(MAGIC)] != MAGIC:
+        raise BadSchemaException("%s is not a schema store" % path)
+    data_offset, data_size = _HEADER.unpack_from(view, offset + len(MAGIC))
+    buffers_start = _align(offset + len(MAGIC) + _HEADER.size)
+    data = view[offset + data_offset : offset + data_offset + data_size]
+    unpickler = _StoreUnpickler(io.BytesIO(data), view[buffers_start:])
+    return unpickler.load()
+
+
+class _PrivateSizePickler(pickle.Pickler):
+    def persistent_id(self, obj):
+        if type(obj) is memoryview:
+            return 0
+        return None
+
+
+class _Counter(object):
+    def __init__(self):
+        self.size = 0
+
+    def write(self, data):
+        self.size += len(data)
+
+
+def privateSize(obj):
+    """
+    Size of the pickled object, leaving out what is mapped from a store since
+    that memory is shared with the other processes.
+    Input:
+        obj: Object to measure
+    Return:
+        int: Size in bytes
+    """
+    counter = _Counter()
+    _PrivateSizePickler(counter, protocol=pickle.HIGHEST_PROTOCOL).dump(obj)
+    return counter.size
@@ -0,0 +1,252 @@
+# * This file is part of the MOOSE framework
+# * https://www.mooseframework.org
+# *
+# * All rights reserved, see COPYRIGHT for full restrictions
+# * https://github.com/idaholab/moose/blob/master/COPYRIGHT
+# *
+# * Licensed under LGPL 2.1, please see LICENSE for details
+# * https://www.gnu.org/licenses/lgpl-2.1.html
+
+import bisect
+import math
+import re
+from array import array
+
+import numpy as np
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+# splits names like ADMatDiffusion or solve_type into words
+_NAME_RE = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|[0-9]+")
+_STOP_WORDS = frozenset(
+    (
+        "a an and are as at be by for from if in is it of on or that the this "
+        "to which will with"
+    ).split()
+)
+
+
+def tokenize(text):
+    """
+    Split some text into the words that get indexed.
+    Input:
+        text[str]: Text to split
+    Return:
+        list[str]: Lower case words
+    """
+    return [w for w in _WORD_RE.findall(text.lower()) if w not in _STOP_WORDS]
+
+
+def tokenizeName(name):
+    """
+    Split the name of a block or parameter into the words that get indexed.
+    The whole name is kept as well, so "admatdiffusion" finds ADMatDiffusion.
+    Input:
+        name[str]: Name to split
+    Return:
+        list[str]: Lower case words
+    """
+    words = [w.lower() for w in _NAME_RE.findall(name)]
+    whole = name.lower()
+    if _WORD_RE.fullmatch(whole) and whole not in words:
+        words.append(whole)
+    return words
+
+
+class SearchIndex(object):
+    """
+    Ranked full-text index over the names and descriptions of the blocks and
+    parameters of an executable.
+    Each block or parameter is a document. Documents are ranked with tf-idf,
+    words in the name counting more than words in the description.
+    """
+
+    NAME_WEIGHT = 3.0
+    # the last word of a query also matches the words starting with it,
+    # this is the maximum number of words it gets expanded to
+    MAX_PREFIX_EXPANSION = 64
+
+    def __init__(self):
+        super(SearchIndex, self).__init__()
+        # block path of each document
+        self.paths = []
+        # parameter name of each document, "" for blocks
+        self.parameters = []
+        # number of indexed words of each document
+        self.lengths = array("H")
+        # word -> ids of the documents with the word in their description
+        self.postings = {}
+        # word -> ids of the documents with the word in their name
+        self.name_postings = {}
+        self._vocabulary = None
+        self._norm = None
+        # while building, name or description -> the postings its words go in.
+        # The same ones come up over and over, this saves splitting them again.
+        self._name_cache = {}
+        self._description_cache = {}
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_vocabulary"] = None
+        state["_norm"] = None
+        state["_name_cache"] = {}
+        state["_description_cache"] = {}
+        return state
+
+    def finish(self):
+        """
+        Called once all the documents are added, frees what is only needed while building.
+        """
+        self._name_cache = {}
+        self._description_cache = {}
+
+    @staticmethod
+    def _postingsFor(words, postings, cache, text):
+        entry = tuple(postings.setdefault(w, array("I")) for w in set(words))
+        cache[text] = entry
+        return entry
+
+    def addDocument(self, path, parameter, name, description):
+        """
+        Input:
+            path[str]: Path of the block
+            parameter[str]: Name of the parameter, "" for the block itself
+            name[str]: Name of the block or parameter
+            description[str]: Its description
+        """
+        description = description or ""
+        name_entry = self._name_cache.get(name)
+        if name_entry is None:
+            name_entry = self._postingsFor(
+                tokenizeName(name), self.name_postings, self._name_cache, name
+            )
+        entry = self._description_cache.get(description)
+        if entry is None:
+            entry = self._postingsFor(
+                tokenize(description),
+                self.postings,
+                self._description_cache,
+                description,
+            )
+        if not name_entry and not entry:
+            return
+
+        doc = len(self.paths)
+        self.paths.append(path)
+        self.parameters.append(parameter)
+        for docs in name_entry:
+            docs.append(doc)
+        for docs in entry:
+            docs.append(doc)
+        self.lengths.append(min(len(name_entry) + len(entry), 0xFFFF))
+        self._vocabulary = None
+        self._norm = None
+
+    def merge(self, other):
+        """
+        Adds the documents of another index after the ones of this index.
+        Input:
+            other[SearchIndex]: Index to add
+        """
+        offset = len(self.paths)
+        self.paths.extend(other.paths)
+        self.parameters.extend(other.parameters)
+        self.lengths.extend(other.lengths)
+        for postings, other_postings in (
+            (self.postings, other.postings),
+            (self.name_postings, other.name_postings),
+        ):
+            if not other_postings:
+                continue
+            # shift all the document ids at once, then split them up by word
+            words = list(other_postings)
+            docs = np.concatenate(
+                [np.frombuffer(other_postings[w], dtype=np.uint32) for w in words]
+            )
+            docs = memoryview(docs + np.uint32(offset)).cast("B")
+            begin = 0
+            for word in words:
+                end = begin + len(other_postings[word]) * 4
+                postings.setdefault(word, array("I")).frombytes(docs[begin:end])
+                begin = end
+        self._vocabulary = None
+        self._norm = None
+
+    def __len__(self):
+        return len(self.paths)
+
+    def _expand(self, word, prefix):
+        if not prefix:
+            return [word]
+        if self._vocabulary is None:
+            self._vocabulary = sorted(set(self.postings) | set(self.name_postings))
+        start = bisect.bisect_left(self._vocabulary, word)
+        words = []
+        for w in self._vocabulary[start:]:
+            if not w.startswith(word) or len(words) >= self.MAX_PREFIX_EXPANSION:
+                break
+            words.append(w)
+        return words
+
+    def _idf(self, word):
+        df = len(self.postings.get(word, ())) + len(self.name_postings.get(word, ()))
+        return math.log(1.0 + len(self.paths) / (1.0 + df))
+
+    def _norms(self):
+        # long descriptions match more words, don't let them win because of it
+        if self._norm is None:
+            lengths = np.frombuffer(self.lengths, dtype=np.uint16)
+            self._norm = 1.0 / np.sqrt(np.maximum(lengths, 1))
+        return self._norm
+
+    def _scoreWord(self, word, prefix):
+        # score of each document for its best match of the query word, 0 if none
+        scores = np.zeros(len(self.paths))
+        for w in self._expand(word, prefix):
+            idf = self._idf(w)
+            for docs, score in (
+                (self.postings.get(w), idf),
+                (self.name_postings.get(w), idf * (1.0 + self.NAME_WEIGHT)),
+            ):
+                if docs:
+                    docs = np.frombuffer(docs, dtype=np.uint32)
+                    scores[docs] = np.maximum(scores[docs], score)
+        return scores
+
+    def search(self, query, limit=50):
+        """
+        Find the blocks and parameters matching all the words of a query.
+        Input:
+            query[str]: Words to look for. Unless the query ends with a space,
+                the last word also matches the words that start with it.
+            limit[int]: Maximum number of results
+        Return:
+            list[tuple]: (block path, parameter name or "", score), best first
+        """
+        words = tokenize(query)
+        if not words or not self.paths:
+            return []
+        prefix = not query[-1].isspace()
+
+        total = None
+        for i, w in enumerate(words):
+            scores = self._scoreWord(w, prefix and i == len(words) - 1)
+            if total is None:
+                total = scores
+                matched = scores > 0
+            else:
+                total += scores
+                matched &= scores > 0
+
+        docs = np.flatnonzero(matched)
+        if not len(docs):
+            return []
+        scores = total[docs] * self._norms()[docs]
+        if len(docs) > limit:
+            best = np.argpartition(-scores, limit - 1)[:limit]
+            docs = docs[best]
+            scores = scores[best]
+        order = np.lexsort((docs, -scores))
+        return [
+            (self.paths[doc], self.parameters[doc], float(score))
+            for doc, score in zip(docs[order].tolist(), scores[order].tolist())
+        ]
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+# * This file is part of the MOOSE framework
+# * https://www.mooseframework.org
+# *
+# * All rights reserved, see COPYRIGHT for full restrictions
+# * https://github.com/idaholab/moose/blob/master/COPYRIGHT
+# *
+# * Licensed under LGPL 2.1, please see LICENSE for details
+# * https://www.gnu.org/licenses/lgpl-2.1.html
+
+import numpy as np
+
+
+def _parseBool(value):
+    return (type(value) is bool and value) or value == "true"
+
+
+def _parseString(value):
+    return value
+
+
+class NumericArray(object):
+    """
+    Value of an Array:Real or Array:Integer parameter.
+    The numbers are held in a read only numpy array instead of a list of
+    python objects, and are only formatted for the input file once.
+    Compares equal to a list with the same numbers.
+    """
+
+    __slots__ = ("array", "_file_value")
+
+    def __init__(self, array):
+        """
+        Input:
+            array[numpy.ndarray]: The numbers, the array isn't copied
+        """
+        array.flags.writeable = False
+        self.array = array
+        self._file_value = None
+
+    def __getstate__(self):
+        return self.array
+
+    def __setstate__(self, array):
+        self.__init__(array)
+
+    def tolist(self):
+        return self.array.tolist()
+
+    def fileValue(self):
+        """
+        Return:
+            str: The numbers separated by spaces, the same as str() of each of them
+        """
+        if self._file_value is None:
+            self._file_value = " ".join(map(str, self.array.tolist()))
+        return self._file_value
+
+    def __len__(self):
+        return len(self.array)
+
+    def __iter__(self):
+        return iter(self.array.tolist())
+
+    def __getitem__(self, idx):
+        return self.array[idx].tolist()
+
+    def __eq__(self, other):
+        if other is self:
+            return True
+        if isinstance(other, NumericArray):
+            return np.array_equal(self.array, other.array)
+        if type(other) is list:
+            return self.array.tolist() == other
+        return False
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(self.array.tolist())
+
+
+class ValueCodec(object):
+    """
+    Converts the values of a basic type of parameter read from an input file,
+    the json data or the UI to python values.
+    """
+
+    def __init__(self, parse_item):
+        """
+        Input:
+            parse_item[callable]: Converts a single value
+        """
+        super(ValueCodec, self).__init__()
+        self.parse_item = parse_item
+
+    def parse(self, value):
+        return self.parse_item(value)
+
+
+class ArrayCodec(ValueCodec):
+    """
+    Arrays given as a space separated string or a list are converted to a list.
+    """
+
+    def parse(self, value):
+        parse_item = self.parse_item
+        if type(value) is str:
+            return [parse_item(val) for val in value.split()]
+        elif type(value) is list:
+            return [parse_item(val) for val in value]
+        elif type(value) is NumericArray:
+            return [parse_item(val) for val in value.tolist()]
+        else:
+            return parse_item(value)
+
+
+class NumericArrayCodec(ArrayCodec):
+    """
+    Arrays of numbers are converted to a NumericArray.
+    numpy parses the strings the same way as float() and int(), when it
+    can't (out of range integers for example) this falls back to a list.
+    """
+
+    def __init__(self, parse_item, dtype):
+        """
+        Input:
+            parse_item[callable]: Converts a single value
+            dtype[numpy.dtype]: Type of the numpy array
+        """
+        super(NumericArrayCodec, self).__init__(parse_item)
+        self.dtype = dtype
+
+    def parse(self, value):
+        if type(value) is NumericArray and value.array.dtype == self.dtype:
+            return value
+        try:
+            if type(value) is str:
+                return NumericArray(np.array(value.split(), dtype=self.dtype))
+            parsed = super(NumericArrayCodec, self).parse(value)
+            if type(parsed) is not list:
+                return parsed
+            # only python numbers are left, so the conversion is exact
+            return NumericArray(np.array(parsed, dtype=self.dtype))
+        except (ValueError, OverflowError):
+            return super(NumericArrayCodec, self).parse(value)
+
+
+_PARSERS = {
+    "Integer": int,
+    "Real": float,
+    "Boolean": _parseBool,
+    "String": _parseString,
+}
+
+_CODECS = {name: ValueCodec(parse) for name, parse in _PARSERS.items()}
+_CODECS.update(
+    {"Array:%s" % name: ArrayCodec(parse) for name, parse in _PARSERS.items()}
+)
+_CODECS["Array:Integer"] = NumericArrayCodec(int, np.int64)
+_CODECS["Array:Real"] = NumericArrayCodec(float, np.float64)
+
+
+def getCodec(basic_type):
+    """
+    Get the codec for a basic type of parameter.
+    Input:
+        basic_type[str]: Basic type as given in the json data
+    Return:
+        ValueCodec
+    """
+    codec = _CODECS.get(basic_type)
+    if codec is None and basic_type.startswith("Array:"):
+        # Nested arrays, like Array:Array:Real, are read as flat arrays
+        codec = ArrayCodec(_PARSERS[basic_type.split("Array:")[-1]])
+        _CODECS[basic_type] = codec
+    elif codec is None:
+        raise KeyError(basic_type)
+    return codec
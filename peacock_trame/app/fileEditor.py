@@ -1,10 +1,13 @@
+import asyncio
 import difflib
 import os
+import re
 import sys
 from pathlib import Path
 
 import vtkmodules.vtkRenderingOpenGL2  # noqa
 from pyaml import yaml
+from trame.app import asynchronous
 from trame.widgets import html, paraview, simput, vtk, vuetify
 from trame_simput.core.mapping import ObjectFactory, ProxyObjectAdapter
 from vtkmodules.vtkFiltersExtraction import vtkExtractBlock
@@ -23,7 +26,8 @@ from vtkmodules.vtkRenderingCore import (
 from peacock_trame.widgets import peacock
 
 from .core.common.PeacockException import BadExecutableException
-from .core.common.utils import debounced_run
+from .core.common.TextBuffer import TextBuffer
+from .core.common.utils import debounced_run, text_edits
 
 # add moose/python to sys path
 conda_prefix = os.environ.get("CONDA_PREFIX", None)
@@ -33,8 +37,11 @@ if conda_prefix:
         sys.path.append(str(lib_path))
 
 from .core.common import ExeLauncher  # noqa
-from .core.input.ExecutableInfo import ExecutableInfo  # noqa
+from .core.input.ExecutableRegistry import ExecutableRegistry  # noqa
+from .core.input.InputHistory import RootEdit  # noqa
 from .core.input.InputTree import InputTree  # noqa
+from .core.input.SchemaDiff import SchemaDiff  # noqa
+from .core.input.ValueCodec import NumericArray  # noqa
 
 try:
     from paraview import simple
@@ -46,7 +53,17 @@ except ModuleNotFoundError:
 print("USE_PARAVIEW: ", USE_PARAVIEW)
 
 
+def to_state_value(value):
+    # numeric arrays are sent to the client as lists
+    if type(value) is NumericArray:
+        return value.tolist()
+    return value
+
+
 class InputFileEditor:
+    # how often to check if the executable was rebuilt, in seconds
+    SCHEMA_WATCH_INTERVAL = 2
+
     def __init__(self, server, simput_manager):
         self._server = server
         state = server.state
@@ -67,7 +84,7 @@ class InputFileEditor:
         }
 
         state.add_block_open = False
-        state.active_id = "/Mesh_type_/Mesh/FileMesh"
+        state.active_id = None
         state.active_name = "Mesh"
         state.name_editable = False
         state.show_mesh = False
@@ -75,24 +92,304 @@ class InputFileEditor:
         state.block_to_add = None
         state.block_to_remove = None
         state.bc_boundaries = {}
+        state.schema_loading = True
+        state.schema_error = None
+        state.schema_report = None
+        state.executable_choice = state.executable
+        state.recent_executables = [state.executable]
+        state.syntax_query = ""
+        state.syntax_results = []
+        state.can_undo = False
+        state.can_redo = False
+        # replacements sent to the editor instead of the whole text
+        state.file_edits = None
 
         state.change("active_id")(self.on_active_id)
         state.change("block_to_add")(self.on_block_to_add)
         state.change("block_to_remove")(self.on_block_to_remove)
+        state.change("syntax_query")(self.on_syntax_query)
+        server.controller.search_syntax = self.search_syntax
 
-        exe_info = ExecutableInfo()
-        exe_info.setPath(state.executable)
-        self.tree = InputTree(exe_info)
+        # The tree is created once the executable syntax is loaded in the background.
+        # Until then the editor shows the input file as is.
+        self.tree = None
+        self.edited_file_str = None
         self.simput_types = []
+        # block tree entries by id of the block
+        self.block_entries = {}
+        # path of the active block before the tree was last rebuilt
+        self.active_path = "/Mesh"
+        # fingerprint of the mesh block that was last rendered
+        self.mesh_fingerprint = None
         self.simput_manager = simput_manager
         self.pxm = simput_manager.proxymanager
         self.updating_from_editor = False
         self.vtkRenderWindow = None
         self.vtkRenderer = None
-        self.set_input_file(file_name=state.input_file)
-        self.update_editor()
+        try:
+            with open(state.input_file) as f:
+                state.file_str = f.read()
+        except OSError:
+            state.file_str = ""
+        # the text in the editor, patched with the changes made in it
+        self.editor_text = TextBuffer(state.file_str)
+        # number of the last edits sent to the editor
+        self.editor_version = 0
+        # version of the document in the editor that editor_text matches,
+        # None while the editor hasn't applied the last edits sent to it
+        self.editor_document_version = None
 
         self.pxm.on(self.on_proxy_change)
+        server.controller.on_server_ready.add_task(self.load_schema)
+
+    @staticmethod
+    def read_executable_info(exe_path, schema_file=None):
+        # runs in a worker thread, must not touch the server state
+        # the syntax is shared with the other sessions of the process
+        return ExecutableRegistry.instance().get(exe_path, schema_file)
+
+    @staticmethod
+    def read_partial_executable_info(exe_path, blocks):
+        # runs in a worker thread, only fetches the given top level blocks
+        # unless the whole syntax is already available
+        return ExecutableRegistry.instance().getPartial(exe_path, blocks)
+
+    @staticmethod
+    def used_blocks(file_str):
+        # names of the top level blocks of an input file,
+        # it is not parsed since it might have errors
+        blocks = []
+        depth = 0
+        for match in re.finditer(r"^\s*\[([^\]]*)\]", file_str or "", re.M):
+            name = match.group(1).strip()
+            if name in ("", "../"):
+                # end of a block
+                depth = max(depth - 1, 0)
+                continue
+            if depth == 0:
+                blocks.append(name.lstrip("./").split("/")[0])
+            depth += 1
+        return blocks
+
+    @staticmethod
+    def file_stamp(path):
+        try:
+            st = os.stat(path)
+            return (st.st_size, st.st_mtime_ns)
+        except (OSError, TypeError):
+            return None
+
+    async def load_schema(self, **kwargs):
+        # load the syntax of the executable without blocking the server
+        state = self._server.state
+        stamp = self.file_stamp(state.schema_file or state.executable)
+        loop = asyncio.get_event_loop()
+        if state.schema_file:
+            exe_info = await loop.run_in_executor(
+                None, self.read_executable_info, state.executable, state.schema_file
+            )
+        else:
+            # only what the input file uses (and the mesh view) is needed to show it
+            blocks = self.used_blocks(state.file_str) + ["Mesh"]
+            exe_info = await loop.run_in_executor(
+                None, self.read_partial_executable_info, state.executable, blocks
+            )
+        with state:
+            self.on_schema_loaded(exe_info)
+        if self.tree is None:
+            return
+
+        if exe_info.partial:
+            # the input file is shown, get the other blocks and the rest
+            # of the syntax in the background
+            exe_info.fetchRemaining()
+            full_info = await loop.run_in_executor(
+                None, self.read_executable_info, state.executable, None
+            )
+            with state:
+                self.on_schema_completed(full_info)
+        asynchronous.create_task(self.watch_schema(stamp))
+
+    async def watch_schema(self, stamp):
+        # reload the syntax when the executable (or schema file) changes on disk
+        state = self._server.state
+        path = state.schema_file or state.executable
+        candidate = None
+        while True:
+            await asyncio.sleep(self.SCHEMA_WATCH_INTERVAL)
+            if path != (state.schema_file or state.executable):
+                # switched to another executable
+                path = state.schema_file or state.executable
+                stamp = self.file_stamp(path)
+                candidate = None
+                continue
+            current = self.file_stamp(path)
+            if current is None or current == stamp:
+                candidate = None
+                continue
+            if current != candidate:
+                # wait for the file to stop changing, the build might still be writing it
+                candidate = current
+                continue
+            stamp = current
+            candidate = None
+            loop = asyncio.get_event_loop()
+            exe_info = await loop.run_in_executor(
+                None, self.read_executable_info, state.executable, state.schema_file
+            )
+            with state:
+                self.on_schema_changed(
+                    exe_info, "The executable changed, its syntax was reloaded."
+                )
+
+    def on_executable_choice(self, exe_path):
+        state = self._server.state
+        if not exe_path or state.schema_loading:
+            return
+        exe_path = str(Path(exe_path).expanduser().absolute())
+        if exe_path == state.executable and not state.schema_file:
+            return
+        asynchronous.create_task(self.switch_executable(exe_path))
+
+    async def switch_executable(self, exe_path):
+        # load the syntax of another executable and move the input over to it
+        state = self._server.state
+        with state:
+            state.schema_loading = True
+        loop = asyncio.get_event_loop()
+        exe_info = await loop.run_in_executor(
+            None, self.read_executable_info, exe_path, None
+        )
+        with state:
+            state.schema_loading = False
+            if not exe_info.valid():
+                state.schema_error = f"Failed to load the syntax of {exe_path}"
+                state.executable_choice = state.executable
+                return
+
+            state.schema_error = None
+            state.executable = exe_path
+            state.executable_choice = exe_path
+            state.schema_file = None
+            if exe_path not in state.recent_executables:
+                state.recent_executables = state.recent_executables + [exe_path]
+
+            if self.tree is None:
+                self.on_schema_loaded(exe_info)
+                if self.tree is not None:
+                    asynchronous.create_task(
+                        self.watch_schema(self.file_stamp(exe_path))
+                    )
+            else:
+                title = f"Switched to {Path(exe_path).name}."
+                if not self.on_schema_changed(exe_info, title):
+                    state.schema_report = {
+                        "title": title + " The syntax is the same.",
+                        "changes": [],
+                        "problems": [],
+                    }
+
+    def on_schema_changed(self, exe_info, title):
+        # swap in the new syntax and move the current input over to it,
+        # returns False if there was nothing to do
+        if not exe_info.valid():
+            # keep the current syntax, the build probably failed
+            return False
+
+        diff = SchemaDiff(self.tree.app_info, exe_info)
+        if diff.isEmpty():
+            return False
+
+        problems = self.tree.migrate(exe_info)
+        self.simput_types = []  # definitions might have changed
+        self.populate_block_tree()
+        self.update_editor()
+        self.update_active_block()
+        self._server.controller.simput_reload_data()
+        self.update_history_state()
+        self._server.state.schema_report = {
+            "title": title,
+            "changes": diff.summary(50),
+            "problems": problems,
+        }
+        return True
+
+    def on_schema_completed(self, exe_info):
+        # swap the partial syntax the tree was created with for the whole syntax
+        app_info = self.tree.app_info
+        if not app_info.partial or exe_info.path != app_info.path:
+            # switched to another executable in the meantime
+            return
+        if not exe_info.valid():
+            # keep going with the partial syntax, the rest is fetched when used
+            return
+
+        app_info.cancelFetches()
+        self.tree.migrate(exe_info)
+        self.simput_types = []
+        self.populate_block_tree()
+        self.update_active_block()
+        self._server.controller.simput_reload_data()
+        self.update_history_state()
+
+    def on_schema_loaded(self, exe_info):
+        state = self._server.state
+        state.schema_loading = False
+        if not exe_info.valid():
+            source = state.schema_file or state.executable
+            state.schema_error = f"Failed to load the syntax of {source}"
+            return
+
+        self.tree = InputTree(exe_info)
+        if self.edited_file_str is not None:
+            # keep what was typed in the editor while loading,
+            # falling back to the file if it doesn't parse
+            if not self.set_input_file(file_str=self.edited_file_str):
+                self.set_input_file(file_name=state.input_file)
+            self.edited_file_str = None
+        else:
+            self.set_input_file(file_name=state.input_file)
+            self.update_editor()
+            # the mesh was rendered from the same file
+            self.mesh_fingerprint = self.get_mesh_fingerprint()
+
+        self.update_active_block()
+        self.on_active_id(state.active_id)
+        self._server.controller.simput_reload_data()
+        self.update_history_state()
+
+    def search_syntax(self, query, limit=20):
+        # search the names and descriptions of the blocks and parameters of the executable
+        if self.tree is None or not query:
+            return []
+        app_info = self.tree.app_info
+        results = []
+        for path, param_name, score in app_info.search(query, limit):
+            block = app_info.findBlock(path)
+            description = ""
+            if block is not None:
+                description = block.description
+                if param_name and param_name in block.parameters:
+                    description = block.parameters[param_name].description
+            results.append(
+                {
+                    "title": param_name or os.path.basename(path),
+                    "path": path,
+                    "parameter": param_name,
+                    "description": description,
+                }
+            )
+        return results
+
+    def on_syntax_query(self, syntax_query, **kwargs):
+        self._server.state.syntax_results = self.search_syntax(syntax_query)
+
+    def get_input_file_string(self):
+        if self.tree is None:
+            if self.edited_file_str is not None:
+                return self.edited_file_str
+            return self._server.state.file_str
+        return self.tree.getInputFileString()
 
     def toggle_editor(self):
         # open monaco file editor if it is closed and visa versa
@@ -100,8 +397,31 @@ class InputFileEditor:
         state.show_file_editor = not state.show_file_editor
 
     def update_editor(self):
+        if self.tree is None:
+            return
+        self.send_editor_edits(self.tree.getInputFileString())
+
+    def send_editor_edits(self, file_str):
+        # only the changed parts of the text go to the editor, which keeps
+        # its undo stack and cursor
+        edits = text_edits(self.editor_text.text(), file_str)
+        if not edits:
+            return
+        self.set_editor_edits(edits)
+        self.editor_text.setText(file_str)
+
+    def set_editor_edits(self, edits):
+        # no edits asks the editor for its whole text
         state = self._server.state
-        state.file_str = self.tree.getInputFileString()
+        self.editor_version += 1
+        state.file_edits = {
+            "version": self.editor_version,
+            # version of the document the edits were computed against,
+            # None when it is the one the previous edits left
+            "base": self.editor_document_version,
+            "edits": edits,
+        }
+        self.editor_document_version = None
         state.flush()
 
     def on_proxy_change(self, topic, ids=None, **kwargs):
@@ -111,32 +431,41 @@ class InputFileEditor:
         if not self.updating_from_editor:
             # debounce to prevent running on each user input, bogs down the server
             debounced_run(self.update_editor, delay=0.5)
+            self.update_history_state()
+
+            if (
+                self.mesh_changed()
+            ):  # update render window if mesh or its generators updated from simput
+                # debounce to prevent running on each user input, bogs down the server
+                debounced_run(self.update_render_window, delay=0.5)
+            elif state.bc_selected:  # check if new boundaries added to BC
+                active_block = self.get_block(state.active_id)
+
+                boundaries = active_block.paramValue("boundary")
+                for boundary_id in boundaries:
+                    if (
+                        boundary_id not in state.bc_boundaries
+                        and boundary_id in state.boundaries
+                    ):
+                        info = state.boundaries[boundary_id].copy()
+                        info["visible"] = True
+                        self.vtkMappers["boundaries"].SetBlockVisibility(
+                            info["index"], True
+                        )
+                        state.bc_boundaries[boundary_id] = info
+                        state.dirty("bc_boundaries")
+                        self.vtkRenderWindow.Render()
+                        self._server.controller.update_input_mesh_view()
 
-            for proxy_id in ids:
-                if (
-                    "/Mesh_type" in proxy_id
-                ):  # update render window if mesh updated from simput
-                    # debounce to prevent running on each user input, bogs down the server
-                    debounced_run(self.update_render_window, delay=0.5)
-                elif state.bc_selected:  # check if new boundaries added to BC
-                    block_path = state.active_id.split("_type_")[0]
-                    active_block = self.tree.getBlockInfo(block_path)
-
-                    boundaries = active_block.paramValue("boundary")
-                    for boundary_id in boundaries:
-                        if (
-                            boundary_id not in state.bc_boundaries
-                            and boundary_id in state.boundaries
-                        ):
-                            info = state.boundaries[boundary_id].copy()
-                            info["visible"] = True
-                            self.vtkMappers["boundaries"].SetBlockVisibility(
-                                info["index"], True
-                            )
-                            state.bc_boundaries[boundary_id] = info
-                            state.dirty("bc_boundaries")
-                            self.vtkRenderWindow.Render()
-                            self._server.controller.update_input_mesh_view()
+    def get_mesh_fingerprint(self):
+        mesh = self.tree.getBlockInfo("/Mesh") if self.tree is not None else None
+        if mesh is not None:
+            return mesh.fingerprint()
+
+    def mesh_changed(self):
+        # whether the mesh block or any of its children changed since the mesh
+        # was rendered, the fingerprints are cached so this is cheap
+        return self.get_mesh_fingerprint() != self.mesh_fingerprint
 
     def set_input_file(self, file_name=None, file_str=None):
         # sets the input file of the InputTree object and populates simput/ui
@@ -149,7 +478,28 @@ class InputFileEditor:
         if not valid:
             return False
 
+        self.populate_block_tree()
+        return True
+
+    def get_block(self, proxy_id):
+        # block of a simput proxy, the ids of the block tree entries are proxy ids
+        proxy = self.pxm.get(proxy_id) if proxy_id else None
+        if proxy is not None:
+            return proxy.object
+
+    def populate_block_tree(self):
+        # fills the block tree and simput from the InputTree
         state = self._server.state
+        active_block = self.get_block(state.active_id)
+        if active_block is not None:
+            self.active_path = active_block.path
+
+        # the proxies of the previous tree
+        for block_entry in self.block_entries.values():
+            if self.pxm.get(block_entry["id"]):
+                self.pxm.delete(block_entry["id"], trigger_modified=False)
+        self.block_entries = {}
+
         state.block_tree = []  # list of tree entries as used by vuetify's vtreeview
         state.unused_blocks = []  # unused parent block names
 
@@ -168,15 +518,13 @@ class InputFileEditor:
                     },
                 )
 
-        return True
-
     def write_file(self):
         # write input file tree to disk
 
         path = self._server.state.input_file
         print(f"Writing to {path}...")
         with open(path, "w") as f:
-            f.write(self.tree.getInputFileString())
+            f.write(self.get_input_file_string())
 
     def add_to_simput_model(self, type_info):
         simput_type = type_info.path
@@ -227,17 +575,18 @@ class InputFileEditor:
         if simput_type not in self.simput_types:
             self.add_to_simput_model(type_info)
 
-        proxy_id = block_info.path + "_type_" + simput_type
+        # the id of the block stays the same when it is renamed or moved
+        proxy_id = "%d_type_%s" % (block_info.id, simput_type)
         self.pxm.create(simput_type, existing_obj=block_info, proxy_id=proxy_id)
 
         # --- add to vuetify tree ---
         block_entry = {
             "id": proxy_id,
             "name": block_info.name,
-            "path": block_info.path,
             "children": [],
             "hidden_children": [],
         }
+        self.block_entries[block_info.id] = block_entry
 
         if block_info.star:  # block can have new children
             star_node = block_info.star_node
@@ -250,75 +599,73 @@ class InputFileEditor:
 
         # check if block is a child
         parent = block_info.parent
-        if parent.path == "/":  # no parent
+        if parent.parent is None:  # no parent
             # add block to tree sorted by name
             self._insort_by_name(state.block_tree, block_entry)
         else:
-            parent_entry = self.get_block_tree_entry(parent.path)
+            parent_entry = self.block_entries[parent.id]
             if block_info.included:
                 parent_entry["children"].append(block_entry)
             else:
                 parent_entry["hidden_children"].append(block_entry)
 
-        # add children
-        for child in block_info.children.values():
-            self.add_block(child)
+        # add children, in the order they are written out
+        children = block_info.children
+        for name in block_info.children_list:
+            self.add_block(children[name])
 
         state.dirty("block_tree")
 
-    def get_block_tree_entry(self, path):
-        # path is in form /ancestor_a/ancestor_b/.../parent/block
-        # splitting by '/' gives ['', ancestor_a, ancestor_b, ... ,parent, block]
-        ancestors = path.split("/")[1:]
-        block_list = self._server.state.block_tree
-        # find block in tree
-        for ancestor in ancestors:
-            for b in block_list:
-                if b["name"] == ancestor:
-                    block_list = b["children"]
-                    parent_entry = b
-
-        return parent_entry
-
-    def remove_block(self, path):
-        block_info = self.tree.getBlockInfo(path)
+    def remove_block(self, block_id):
+        block_info = self.get_block(block_id)
         parent_info = block_info.parent
-        parent_info.removeChildBlock(block_info.name)
-
-        state = self._server.state
-        if parent_info.path == "/":
-            for block_entry in state.block_tree:
-                if block_entry["path"] == path:
-                    break
-            state.block_tree.remove(block_entry)
-        else:
-            parent_entry = self.get_block_tree_entry(parent_info.path)
-            for block_entry in parent_entry["children"]:
-                if block_entry["path"] == path:
-                    break
-            parent_entry["children"].remove(block_entry)
+        self.tree.removeBlock(block_info.path)
 
-        # delete proxy
-        proxy_id = path + "_type_" + self.get_type_info(block_info).path
-        self.pxm.delete(proxy_id)
+        block_entry = self.block_entries[block_info.id]
+        self.detach_block_entry(parent_info, block_entry)
+        # delete the proxies of the block and its children
+        self.remove_block_entry(block_entry)
 
-        state.dirty("block_tree")
+        self._server.state.dirty("block_tree")
+        self.update_history_state()
 
-    def add_child_block(self, parent_path, child_type):
-        parent_info = self.tree.getBlockInfo(parent_path)
+    def detach_block_entry(self, parent_info, block_entry):
+        # takes the entry of a block out of the entry of its parent
+        state = self._server.state
+        if parent_info.parent is None:
+            if block_entry in state.block_tree:
+                state.block_tree.remove(block_entry)
+            return
+        parent_entry = self.block_entries.get(parent_info.id)
+        if parent_entry is not None:
+            for entries in [parent_entry["children"], parent_entry["hidden_children"]]:
+                if block_entry in entries:
+                    entries.remove(block_entry)
+
+    def remove_block_entry(self, block_entry):
+        block_info = self.get_block(block_entry["id"])
+        for child_entry in block_entry["children"] + block_entry["hidden_children"]:
+            self.remove_block_entry(child_entry)
+        self.block_entries.pop(block_info.id, None)
+        self.pxm.delete(block_entry["id"])
+
+    def add_child_block(self, parent_id, child_type):
+        parent_info = self.get_block(parent_id)
         new_name = parent_info.findFreeChildName()
-        new_block = self.tree.addUserBlock(parent_path, new_name)
-        new_block.included = True
-        if child_type != parent_info.name:  # only set type if valid type was passed
-            new_block.setBlockType(child_type)
+        with self.tree.history.group():
+            new_block = self.tree.addUserBlock(parent_info.path, new_name)
+            self.tree.setBlockSelected(new_block.path, True)
+            if child_type != parent_info.name:  # only set type if valid type was passed
+                self.tree.setBlockType(new_block.path, child_type)
         self.add_block(new_block)
+        self.update_history_state()
 
-    def include_child(self, parent_path, child_name):
-        parent_info = self.tree.getBlockInfo(parent_path)
+    def include_child(self, parent_id, child_name):
+        parent_info = self.get_block(parent_id)
         child_info = parent_info.children[child_name]
-        child_info.included = True
+        self.tree.setBlockSelected(child_info.path, True)
 
-        parent_entry = self.get_block_tree_entry(parent_path)
+        parent_entry = self.block_entries[parent_info.id]
         for child_entry in parent_entry["hidden_children"]:
             if child_entry["name"] == child_name:
                 break
@@ -327,6 +674,7 @@ class InputFileEditor:
 
         self._server.state.dirty("block_tree")
         self.update_editor()
+        self.update_history_state()
 
     def format_simput_param(self, param):
         # formats a simput property from a ParameterInfo object for use in the simput model
@@ -349,7 +697,7 @@ class InputFileEditor:
             "_help": param.toolTip(),
             "_tags": [param.group_name],
             "type": simput_type,
-            "initial": param.getValue(),
+            "initial": to_state_value(param.getValue()),
             "required": param.required,
         }
 
@@ -381,14 +729,18 @@ class InputFileEditor:
 
         state = self._server.state
 
+        if self.tree is None:
+            return
+
         if active_id is None:
             state.active_name = None
             state.active_type = None
             state.active_types = []
             return
 
-        block_path = active_id.split("_type_")[0]
-        active_block = self.tree.getBlockInfo(block_path)
+        active_block = self.get_block(active_id)
+        if active_block is None:
+            return
 
         state.show_mesh = (
             active_block.name == "Mesh"
@@ -457,11 +809,15 @@ class InputFileEditor:
         state.active_type = active_block.blockType()
 
     def on_active_type(self, active_type, old_type, **kwargs):
+        if self.tree is None:
+            return
         state = self._server.state
         pxm = self.pxm
 
-        block_path = state.active_id.split("_type_")[0]
-        block_info = self.tree.getBlockInfo(block_path)
+        old_proxy = pxm.get(state.active_id)
+        if old_proxy is None:
+            return
+        block_info = old_proxy.object
 
         type_info = block_info.types[active_type]
         simput_type = type_info.path
@@ -469,68 +825,54 @@ class InputFileEditor:
         if simput_type not in self.simput_types:
             self.add_to_simput_model(type_info)
 
-        proxy_id = block_path + "_type_" + simput_type
+        proxy_id = "%d_type_%s" % (block_info.id, simput_type)
         proxy = pxm.get(proxy_id)
 
         if proxy:
             # get existing proxy block info
             new_block_info = proxy._object
         else:
-            # create block info of new type
-            new_block_info = block_info.copy(block_info.parent)
+            # create block info of new type, it stays the same block for the tree
+            new_block_info = block_info.copy(block_info.parent, keep_id=True)
             new_block_info.setBlockType(active_type)
             proxy = pxm.create(
                 simput_type, existing_obj=new_block_info, proxy_id=proxy_id
             )
 
-        # copy common parameters
-        old_proxy_id = block_path + "_type_" + block_info.types[old_type].path
-        old_proxy = pxm.get(old_proxy_id)
-        new_props = proxy.list_property_names()
-        for prop_name in old_proxy.list_property_names():
-            if prop_name in new_props:
-                old_val = old_proxy.get_property(prop_name)
-                proxy.set_property(prop_name, old_val)
-        self._server.controller.simput_reload_data()
+        with self.tree.history.group():
+            # copy common parameters
+            new_props = proxy.list_property_names()
+            for prop_name in old_proxy.list_property_names():
+                if prop_name in new_props:
+                    old_val = old_proxy.get_property(prop_name)
+                    proxy.set_property(prop_name, old_val)
 
-        # insert new block into input file tree
-        parent_info = block_info.parent
-        parent_info.removeChildBlock(block_info.name)
-        parent_info.addChildBlock(new_block_info)
-        self.tree.path_map[block_path] = new_block_info
+            # insert new block into input file tree
+            self.tree.replaceBlock(block_info, new_block_info)
+        self._server.controller.simput_reload_data()
 
+        block_entry = self.block_entries.get(block_info.id)
+        if block_entry is not None:
+            block_entry["id"] = proxy_id
+            state.dirty("block_tree")
         state.active_id = proxy_id
+        state.active_ids = [proxy_id]
+        self.update_history_state()
 
     def on_active_name(self, active_name, **kwargs):
+        if self.tree is None:
+            return
         state = self._server.state
-        active_id = state.active_id
-
-        path, simput_type = active_id.split("_type_")
-        block_info = self.tree.getBlockInfo(path)
+        block_info = self.get_block(state.active_id)
+        if block_info is None or block_info.name == active_name:
+            return
         parent_info = block_info.parent
         self.tree.renameUserBlock(parent_info.path, block_info.name, active_name)
 
-        def update_paths_and_ids(block_entry, parent_info):
-            old_path, simput_type = block_entry["id"].split("_type_")
-            block_info = parent_info.children[block_entry["name"]]
-            new_proxy_id = block_info.path + "_type_" + simput_type
-            self.pxm.create(simput_type, existing_obj=block_info, proxy_id=new_proxy_id)
-            self.pxm.delete(block_entry["id"])
-            block_entry["path"] = block_info.path
-            block_entry["id"] = new_proxy_id
-
-            for child in block_entry["children"]:
-                update_paths_and_ids(child, block_info)
-            for child in block_entry["hidden_children"]:
-                update_paths_and_ids(child, block_info)
-
-            return new_proxy_id
-
-        block_entry = self.get_block_tree_entry(path)
-        block_entry["name"] = block_info.name
-        state.active_id = update_paths_and_ids(block_entry, parent_info)
-        state.active_ids = [state.active_id]
+        # the paths of the children follow, and the proxies are keyed by id
+        self.block_entries[block_info.id]["name"] = block_info.name
         state.dirty("block_tree")
+        self.update_history_state()
 
     def toggle_mesh_viz(self, viz_type, viz_id):
         state = self._server.state
@@ -566,7 +908,7 @@ class InputFileEditor:
     def on_block_to_add(self, block_to_add, **kwargs):
         # this function triggers when a new block is added to the tree in the ui
 
-        if block_to_add is None:
+        if block_to_add is None or self.tree is None:
             return
 
         state = self._server.state
@@ -577,54 +919,223 @@ class InputFileEditor:
                 state.unused_blocks.pop(block_idx)
 
         # add to block tree
-        block = self.tree.getBlockInfo(block_to_add)
-        block.included = True
-        self.add_block(block)
+        self.tree.setBlockSelected(block_to_add, True)
+        self.add_block(self.tree.getBlockInfo(block_to_add))
         state.block_to_add = None
         state.dirty("block_tree")
+        self.update_history_state()
 
     def on_block_to_remove(self, block_to_remove, **kwargs):
-        if block_to_remove is None:
+        if block_to_remove is None or self.tree is None:
             return
 
         self.remove_block(block_to_remove)
         self._server.state.block_to_remove = None
 
-    def populate_from_editor(self, file_str):
-        # repopulate entire tree
-        # this is not optimal but it will work for now
+    def populate_from_editor(self):
+        file_str = self.editor_text.text()
+        if self.tree is None:
+            # the tree is built from these edits once the syntax is loaded
+            self.edited_file_str = file_str
+            return
+
+        if file_str == self.tree.getInputFileString():
+            # the text of the tree coming back, nothing to undo
+            return
+
+        asynchronous.create_task(
+            self.parse_editor_text(self.tree, self.editor_text.revision, file_str)
+        )
+
+    async def parse_editor_text(self, tree, revision, file_str):
+        # parse in a worker so the server keeps responding on large inputs,
+        # the result is dropped if the text or the tree changed in the meantime
+        loop = asyncio.get_event_loop()
+        input_file = await loop.run_in_executor(None, tree.parseInputData, file_str)
+        if (
+            input_file is None
+            or tree is not self.tree
+            or revision != self.editor_text.revision
+        ):
+            return
+        with self._server.state:
+            self.apply_editor_input(input_file)
+
+    def apply_editor_input(self, input_file):
+        # only the sections that changed in the text are read again
         self.updating_from_editor = True
-        old_mesh = self.tree.getBlockInfo("/Mesh")
-        if self.set_input_file(file_str=file_str):
-            state = self._server.state
-            path, active_type_path = state.active_id.split("_type_")
-            active_block = self.tree.getBlockInfo(path)
-            if not active_block:
-                # active block is not in new file tree
-                # find most similar block and switch to it
-                new_path = difflib.get_close_matches(path, self.tree.path_map.keys())[0]
-                state.active_id = new_path + "_type_" + active_type_path
-                state.active_ids = [state.active_id]
-            else:
-                # check if active type changed
-                new_type_block = active_block.getTypeBlock()
-                if (
-                    new_type_block is not None
-                    and new_type_block.name != state.active_type
-                ):
-                    state.active_type = new_type_block.name
-                    state.active_id = path + "_type_" + new_type_block.path
-                    state.active_ids = [state.active_id]
+        edits = self.tree.updateInputFile(input_file)
+        if edits is not None:
+            self.update_changed_blocks(edits)
 
             # update vtk window if mesh changed
-            new_mesh = self.tree.getBlockInfo("/Mesh")
-            if old_mesh != new_mesh:
+            if self.mesh_changed():
                 self.update_render_window()
             self._server.controller.simput_reload_data()
+            self.update_history_state()
         self.updating_from_editor = False
 
-    def on_file_str(self, file_str):
-        debounced_run(self.populate_from_editor, [file_str], delay=0.5)
+    def update_active_block(self):
+        # select the block at the same path after the tree was rebuilt
+        state = self._server.state
+        if self.get_block(state.active_id) is not None:
+            return
+
+        path = self.active_path
+        active_block = self.tree.getBlockInfo(path)
+        if active_block is None or active_block.id not in self.block_entries:
+            # active block is not in new file tree
+            # find most similar block and switch to it
+            paths = [
+                self.get_block(block_entry["id"]).path
+                for block_entry in self.block_entries.values()
+            ]
+            matches = difflib.get_close_matches(path, paths, cutoff=0)
+            if not matches:
+                state.active_id = None
+                state.active_ids = []
+                return
+            active_block = self.tree.getBlockInfo(matches[0])
+
+        state.active_id = self.block_entries[active_block.id]["id"]
+        state.active_ids = [state.active_id]
+
+    def update_history_state(self):
+        state = self._server.state
+        history = self.tree.history if self.tree is not None else None
+        state.can_undo = history is not None and history.canUndo()
+        state.can_redo = history is not None and history.canRedo()
+
+    def undo(self):
+        if self.tree is not None:
+            self.apply_history_edits(self.tree.history.undo())
+
+    def redo(self):
+        if self.tree is not None:
+            self.apply_history_edits(self.tree.history.redo())
+
+    def apply_history_edits(self, edits):
+        # updates simput, the block tree and the text after an undo or redo
+        if not edits:
+            return
+        self.update_changed_blocks(edits)
+        self.update_editor()
+        if self.mesh_changed():
+            self.update_render_window()
+        self._server.controller.simput_reload_data()
+        self.update_history_state()
+
+    def update_changed_blocks(self, edits):
+        # updates simput and the block tree after edits of the InputTree,
+        # only the blocks changed by the edits are updated
+        if not edits:
+            return
+        state = self._server.state
+        active_block = self.get_block(state.active_id)
+        if active_block is not None:
+            self.active_path = active_block.path
+
+        with self.tree.history.paused():
+            if any(type(edit) is RootEdit for edit in edits):
+                self.populate_block_tree()
+            else:
+                # each block is rebuilt once, where it was changed last
+                structure = {}
+                for edit in edits:
+                    for parent_info, block_info in edit.structureChanges():
+                        structure.pop(id(block_info), None)
+                        structure[id(block_info)] = (parent_info, block_info)
+                for parent_info, block_info in structure.values():
+                    if parent_info is not None:  # not in the tree
+                        self.refresh_block(parent_info, block_info)
+                for edit in edits:
+                    for block_info in edit.valueChanges():
+                        block_entry = self.block_entries.get(block_info.id)
+                        proxy = block_entry and self.pxm.get(block_entry["id"])
+                        if proxy is not None and proxy.object is block_info:
+                            proxy.fetch()
+
+        active_id = state.active_id
+        self.update_active_block()
+        if state.active_id == active_id:
+            # the name or type of the block might have changed
+            self.on_active_id(active_id)
+
+    def refresh_block(self, parent_info, block_info):
+        # rebuilds the entries and proxies of a block that was added, removed,
+        # renamed, moved or included by an undo or redo
+        state = self._server.state
+        top_level = parent_info.parent is None
+        block_entry = self.block_entries.get(block_info.id)
+        if block_entry is not None:
+            self.detach_block_entry(parent_info, block_entry)
+            self.remove_block_entry(block_entry)
+        if top_level:
+            state.unused_blocks = [
+                block
+                for block in state.unused_blocks
+                if block["path"] != block_info.path
+            ]
+
+        if block_info.parent is not parent_info:
+            pass  # taken out of the tree
+        elif top_level and not block_info.included:
+            self._insort_by_name(
+                state.unused_blocks, {"name": block_info.name, "path": block_info.path}
+            )
+        elif top_level or parent_info.id in self.block_entries:
+            self.add_block(block_info)
+            if not top_level:
+                # same order as the children of the block
+                order = {name: i for i, name in enumerate(parent_info.children_list)}
+                parent_entry = self.block_entries[parent_info.id]
+                for entries in [
+                    parent_entry["children"],
+                    parent_entry["hidden_children"],
+                ]:
+                    entries.sort(key=lambda entry: order.get(entry["name"], -1))
+        state.dirty("block_tree")
+        state.dirty("unused_blocks")
+
+    def on_editor_change(self, change):
+        # the ranges that changed in the editor, the text is read once typing stops
+        if isinstance(change, str):
+            # whole text from an editor that doesn't send its changes yet
+            self.editor_text.setText(change)
+            debounced_run(self.populate_from_editor, delay=0.5)
+            return
+        if "edits" in change:
+            # the editor applied edits sent to it
+            if change["edits"] == self.editor_version:
+                self.editor_document_version = change["version"]
+            return
+        if change["base"] != self.editor_document_version:
+            # made to a text this side doesn't have, when edits are on their way
+            # the editor sends its whole text as it can't apply them
+            if self.editor_document_version is not None:
+                self.set_editor_edits([])
+            return
+        self.editor_document_version = change["version"]
+        lines = self.editor_text.applyChanges(change["changes"], change["length"])
+        if lines is None:
+            self.set_editor_edits([])
+            return
+        debounced_run(self.populate_from_editor, delay=0.5)
+
+    def on_editor_resync(self, document):
+        # the whole text of the editor
+        self.editor_document_version = document["version"]
+        if document.get("mounted"):
+            # a new editor starts from the text the file had when the server
+            # started, it gets what changed since
+            edits = text_edits(document["text"], self.editor_text.text())
+            if edits:
+                self.set_editor_edits(edits)
+            return
+        # when the edits didn't apply, what is in the editor wins over the
+        # edits it didn't get
+        self.editor_text.setText(document["text"])
+        debounced_run(self.populate_from_editor, delay=0.5)
 
     def toggle_mesh(self):
         state = self._server.state
@@ -640,6 +1151,76 @@ class InputFileEditor:
             style="position: relative;",
         ) as input_ui:
             with html.Div(classes="fill-height d-flex flex-column"):
+                vuetify.VCombobox(
+                    v_model=("executable_choice",),
+                    items=("recent_executables",),
+                    label="Executable",
+                    disabled=("schema_loading",),
+                    change=(self.on_executable_choice, "[$event]"),
+                    dense=True,
+                    hide_details=True,
+                    classes="ma-2",
+                    style="width: 284px; flex: 0 0 auto;",
+                )
+                with html.Div(v_if=("schema_loading",), style="width: 300px;"):
+                    vuetify.VProgressLinear(indeterminate=True)
+                    html.P("Loading executable syntax...", classes="ma-2")
+                html.P(
+                    "{{ schema_error }}",
+                    v_if=("schema_error",),
+                    classes="ma-2 red--text",
+                    style="width: 300px;",
+                )
+                with vuetify.VAlert(
+                    v_if=("schema_report",),
+                    type=("schema_report.problems.length ? 'warning' : 'info'",),
+                    dense=True,
+                    text=True,
+                    dismissible=True,
+                    input="schema_report = null",
+                    classes="ma-2",
+                    style="width: 284px; max-height: 30vh; overflow: auto;",
+                ):
+                    html.Div("{{ schema_report.title }}")
+                    html.Div(
+                        "{{ problem }}",
+                        v_for="problem in schema_report.problems",
+                        classes="text-caption",
+                    )
+                    html.Div(
+                        "{{ change }}",
+                        v_for="change in schema_report.changes",
+                        classes="text-caption grey--text",
+                    )
+                vuetify.VTextField(
+                    v_model=("syntax_query",),
+                    label="Search syntax",
+                    prepend_inner_icon="mdi-magnify",
+                    disabled=("schema_loading || schema_error",),
+                    clearable=True,
+                    dense=True,
+                    hide_details=True,
+                    classes="ma-2",
+                    style="width: 284px; flex: 0 0 auto;",
+                )
+                with vuetify.VList(
+                    v_if=("syntax_query && syntax_results.length",),
+                    dense=True,
+                    style="width: 300px; max-height: 30vh; overflow: auto; flex: 0 0 auto;",
+                ):
+                    with vuetify.VListItem(
+                        v_for="result in syntax_results",
+                        key="result.path + '/' + result.parameter",
+                        title=("result.description",),
+                    ):
+                        with vuetify.VListItemContent():
+                            vuetify.VListItemTitle("{{ result.title }}")
+                            vuetify.VListItemSubtitle("{{ result.path }}")
+                html.P(
+                    "No match",
+                    v_if=("syntax_query && !syntax_results.length",),
+                    classes="ma-2 text-caption grey--text",
+                )
                 with vuetify.VTreeview(
                     v_if=("block_tree.length > 0",),
                     items=("block_tree",),
@@ -648,7 +1229,7 @@ class InputFileEditor:
                     rounded=True,
                     dense=True,
                     activatable=True,
-                    active=("active_ids", ["/Mesh_type_/Mesh/FileMesh"]),
+                    active=("active_ids", []),
                     update_active="(active_ids) => {active_id = active_ids[0]}",
                 ):
                     with vuetify.Template(v_slot_label="{ item }"):
@@ -685,7 +1266,7 @@ class InputFileEditor:
                                         style="background: lightblue;",
                                         click=(
                                             self.include_child,
-                                            "[item.path, child.name]",
+                                            "[item.id, child.name]",
                                         ),
                                     )
                                     vuetify.VListItem(
@@ -693,19 +1274,20 @@ class InputFileEditor:
                                         v_for="child_type in item.child_types",
                                         click=(
                                             self.add_child_block,
-                                            "[item.path, child_type]",
+                                            "[item.id, child_type]",
                                         ),
                                     )
 
                             with vuetify.VBtn(
                                 icon=True,
-                                click="(event) => {event.stopPropagation(); event.preventDefault(); block_to_remove = item.path}",
+                                click="(event) => {event.stopPropagation(); event.preventDefault(); block_to_remove = item.id}",
                             ):
                                 vuetify.VIcon("mdi-delete")
 
                 with html.Div(style="width: 100%; padding: 10px;"):
                     with vuetify.VBtn(
                         v_if=("!add_block_open",),
+                        disabled=("schema_loading || schema_error",),
                         click="add_block_open=true",
                         style="width: 100%;",
                     ):
@@ -1036,8 +1618,10 @@ class InputFileEditor:
 
                     peacock.Editor(
                         contents=("file_str", ""),
+                        edits=("file_edits", None),
                         filepath=("input_file", ""),
-                        change=(self.on_file_str, "[$event]"),
+                        change=(self.on_editor_change, "[$event]"),
+                        resync=(self.on_editor_resync, "[$event]"),
                     )
 
         return input_ui
@@ -1047,11 +1631,12 @@ class InputFileEditor:
         state, ctrl = server.state, server.controller
         input_file = state.input_file
         exe_path = state.executable
+        self.mesh_fingerprint = self.get_mesh_fingerprint()
 
         # save temp input file to run executable with
         tmp_input_file = f"{os.path.splitext(input_file)[0]}_tmp.i"
         with open(tmp_input_file, "w+") as f:
-            f.write(self.tree.getInputFileString())
+            f.write(self.get_input_file_string())
 
         # run executable to get mesh
         tmp_mesh_file = f"{os.path.splitext(input_file)[0]}_tmp_mesh.e"
@@ -1233,16 +1818,26 @@ class BlockFactory(ObjectFactory):
 
 
 class BlockAdapter(ProxyObjectAdapter):
+    def __init__(self):
+        # editor of the tree the blocks belong to, set once it is created
+        self.editor = None
+
+    def set_param_value(self, block, name, value):
+        # goes through the tree when there is one so that the change can be undone
+        tree = self.editor.tree if self.editor is not None else None
+        if tree is not None:
+            tree.setParamValue(block, name, value)
+        else:
+            block.setParamValue(name, value)
+
     @staticmethod
     def commit(proxy):
         pass
 
-    @staticmethod
-    def reset(proxy, props_to_reset=[]):
+    def reset(self, proxy, props_to_reset=[]):
         block = proxy.object
         for name in props_to_reset:
-            value = proxy[name]
-            block.setParamValue(name, value)
+            self.set_param_value(block, name, proxy[name])
 
     @staticmethod
     def fetch(proxy):
@@ -1250,16 +1845,14 @@ class BlockAdapter(ProxyObjectAdapter):
         change_set = {}
         for name in proxy.list_property_names():
             value = block.paramValue(name)
-            change_set[name] = value
+            change_set[name] = to_state_value(value)
 
         proxy.state = {"properties": change_set}
 
-    @staticmethod
-    def update(proxy, *property_names):
+    def update(self, proxy, *property_names):
         block = proxy.object
         for name in property_names:
-            value = proxy[name]
-            block.setParamValue(name, value)
+            self.set_param_value(block, name, proxy[name])
 
     @staticmethod
     def before_delete(proxy):
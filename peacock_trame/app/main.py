@@ -1,4 +1,6 @@
+import argparse
 import os
+import sys
 from pathlib import Path
 
 from trame.app import get_server
@@ -9,6 +11,7 @@ from trame_simput import get_simput_manager
 
 from peacock_trame import module
 
+from .core.input.ExecutableRegistry import ExecutableRegistry
 from .core.input.LanguageServer import LanguageServerManager
 from .executor import Executor
 from .exodusViewer import ExodusViewer
@@ -21,14 +24,16 @@ class Peacock:
         server.enable_module(module)
 
         # Simput
+        self.block_adapter = BlockAdapter()
         self.simput_manager = get_simput_manager(
             object_factory=BlockFactory(),
-            object_adapter=BlockAdapter(),
+            object_adapter=self.block_adapter,
         )
         self.simput_widget = simput.Simput(self.simput_manager, trame_server=server)
 
         # Components
         self.file_editor = InputFileEditor(server, self.simput_manager)
+        self.block_adapter.editor = self.file_editor
         self.executor = Executor(server)
         self.exodus_viewer = ExodusViewer(server)
         if self.state.lang_server_path:
@@ -95,6 +100,20 @@ class Peacock:
                         v_if=("tab_idx == 0",),
                         style="height: 100%; width: 100%; display: flex; align-items: center; justify-content: flex-end;",
                     ):
+                        with vuetify.VBtn(
+                            click=self.file_editor.undo,
+                            disabled=("!can_undo",),
+                            icon=True,
+                            style="z-index: 1;",
+                        ):
+                            vuetify.VIcon("mdi-undo")
+                        with vuetify.VBtn(
+                            click=self.file_editor.redo,
+                            disabled=("!can_redo",),
+                            icon=True,
+                            style="z-index: 1;",
+                        ):
+                            vuetify.VIcon("mdi-redo")
                         with vuetify.VBtn(
                             click=self.file_editor.write_file,
                             icon=True,
@@ -145,7 +164,53 @@ class Peacock:
                 self.exodus_viewer.get_ui()
 
 
+def build_schema(argv):
+    # peacock-trame build-schema: write the processed syntax of an executable
+    # to a bundle that can be given to --schema
+    parser = argparse.ArgumentParser(
+        prog="peacock-trame build-schema",
+        description="Write the syntax of a MOOSE executable to a bundle for --schema",
+    )
+    parser.add_argument("exe", help="Executable")
+    parser.add_argument(
+        "-o", "--output", help="Bundle to write (default: <executable name>.schema)"
+    )
+    parser.add_argument(
+        "--allow-test-objects",
+        action="store_true",
+        help="Include the test objects of the executable",
+    )
+    parser.add_argument(
+        "--mapped",
+        action="store_true",
+        help="Write an uncompressed bundle that is memory mapped, and shared by all the processes using it",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=0,
+        help="Number of processes building the syntax (default: 0, build it in this process)",
+    )
+    args = parser.parse_args(argv)
+
+    from .core.input.ExecutableInfo import ExecutableInfo
+
+    exe_info = ExecutableInfo(lazy=True, workers=args.workers)
+    exe_info.setPath(str(Path(args.exe).absolute()), args.allow_test_objects)
+    if not exe_info.valid():
+        print(f"Failed to read the syntax of {args.exe}")
+        return 1
+
+    output = args.output or Path(args.exe).name + ".schema"
+    exe_info.writeBundle(output, args.mapped)
+    print(f"Wrote {output}")
+    return 0
+
+
 def main(server=None, **kwargs):
+    if len(sys.argv) > 1 and sys.argv[1] == "build-schema":
+        return build_schema(sys.argv[2:])
+
     # Pop LD_LIBRARY_PATH env variable
     # This caused errors when running the Moose executable on Linux
     # This variable points to paraview/lib which might override our venv/lib
@@ -170,6 +235,20 @@ def main(server=None, **kwargs):
     parser.add_argument(
         "-L", "--lang_server", help="Path to language server executable"
     )
+    parser.add_argument(
+        "--schema",
+        help="Syntax of the executable from 'peacock-trame build-schema' or its json dump, instead of running it",
+    )
+    parser.add_argument(
+        "--schema-memory",
+        type=float,
+        help="Memory in MB for the syntax of the executables kept loaded (default: 1024)",
+    )
+    parser.add_argument(
+        "--schema-workers",
+        type=int,
+        help="Number of processes building the syntax of an executable (default: 0, build it in the server process)",
+    )
     (args, _unknown) = parser.parse_known_args()
     state = server.state
     if args.input is None:
@@ -182,6 +261,18 @@ def main(server=None, **kwargs):
         exec_name = str(Path(args.input).stem) + "-opt"
         state.executable = str(Path(args.input).absolute().parent / exec_name)
 
+    state.schema_file = None
+    if args.schema:
+        state.schema_file = str(Path(args.schema).absolute())
+
+    if args.schema_memory:
+        ExecutableRegistry.instance().setMemoryBudget(
+            int(args.schema_memory * (1 << 20))
+        )
+
+    if args.schema_workers is not None:
+        ExecutableRegistry.instance().workers = args.schema_workers
+
     if args.lang_server:
         state.lang_server_path = str(Path(args.lang_server).absolute())
 
@@ -20,8 +20,10 @@ class Editor(HtmlElement):
         )
         self._attr_names += [
             "contents",
+            "edits",
             "filepath",
         ]
         self._event_names += [
             "change",
+            "resync",
         ]
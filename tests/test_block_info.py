@@ -0,0 +1,85 @@
+from peacock_trame.app.core.input.BlockInfo import BlockInfo
+from peacock_trame.app.core.input.ParameterInfo import ParameterInfo
+
+
+def tree():
+    root = BlockInfo(None, "/")
+    kernels = BlockInfo(root, "/Kernels")
+    root.addChildBlock(kernels)
+    diff = BlockInfo(kernels, "/Kernels/diff")
+    kernels.addChildBlock(diff)
+    return root, kernels, diff
+
+
+def test_save_state_propagates():
+    root, kernels, diff = tree()
+    assert not root.wantsToSave()
+
+    diff.included = True
+    assert kernels.wantsToSave() and root.childrenWantToSave()
+    assert kernels.checkInactive() and not diff.checkInactive()
+
+    diff.changed_by_user = True
+    diff.included = False
+    assert root.wantsToSave() and diff.checkInactive()
+    diff.changed_by_user = False
+    assert not root.wantsToSave()
+
+    other = BlockInfo(None, "other")
+    other.user_added = True
+    kernels.addChildBlock(other)
+    assert root.wantsToSave()
+    kernels.removeChildBlock("other")
+    assert not root.wantsToSave()
+
+
+def test_save_state_types_and_copies():
+    root, kernels, diff = tree()
+    type_block = BlockInfo(kernels, "/Kernels/Diffusion")
+    kernels.addBlockType(type_block)
+    type_block.changed_by_user = True
+    assert not kernels.wantsToSave()
+
+    diff.included = True
+    copied = kernels.copy(root)
+    assert copied.wantsToSave()
+    copied.children["diff"].included = False
+    assert not copied.wantsToSave() and kernels.wantsToSave()
+
+
+def test_ids_and_paths():
+    root, kernels, diff = tree()
+    ids = (kernels.id, diff.id)
+    assert len(set(ids + (root.id,))) == 3
+
+    kernels.parent.renameChildBlock("Kernels", "Physics")
+    assert (kernels.id, diff.id) == ids
+    assert diff.path == "/Physics/diff"
+
+    kernels.removeChildBlock("diff")
+    assert diff.path == "/Physics/diff" and diff.parent is None
+    assert kernels.copy(root, keep_id=True).id == kernels.id
+    assert kernels.copy(root).id != kernels.id
+
+
+def test_fingerprint():
+    root, kernels, diff = tree()
+    param = ParameterInfo(diff, "coef")
+    diff.addParameter(param)
+    param.setValue("1")
+    before = root.fingerprint()
+    assert kernels.copy(root).fingerprint() == kernels.fingerprint()
+
+    # changes deep in the tree are seen from the top
+    param.setValue("2")
+    assert root.fingerprint() != before
+    param.setValue("1")
+    assert root.fingerprint() == before
+
+    diff.included = True
+    assert root.fingerprint() != before
+    diff.included = False
+    kernels.removeChildBlock("diff")
+    assert root.fingerprint() != before
+    kernels.addChildBlock(diff)
+    assert root.fingerprint() == before
@@ -0,0 +1,102 @@
+import gc
+import json
+import os
+
+from peacock_trame.app.core.input.ExecutableInfo import ExecutableInfo
+from peacock_trame.app.core.input.ExecutableRegistry import ExecutableRegistry
+
+
+def write_schema(path, block_names):
+    data = {"blocks": {name: {"parameters": {}} for name in block_names}}
+    path.write_text(json.dumps(data))
+    return str(path)
+
+
+def test_shared_and_reloaded_on_change(tmp_path):
+    registry = ExecutableRegistry()
+    schema = write_schema(tmp_path / "app.json", ["Mesh"])
+    info = registry.get(None, schema)
+    assert info.valid()
+    assert registry.get(None, schema) is info
+
+    write_schema(tmp_path / "app.json", ["Mesh", "Kernels"])
+    st = os.stat(schema)
+    os.utime(schema, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    new_info = registry.get(None, schema)
+    assert new_info is not info
+    assert "/Kernels" in new_info.path_map
+
+
+def test_eviction(tmp_path):
+    registry = ExecutableRegistry(memory_budget=1)
+    first = write_schema(tmp_path / "first.json", ["Mesh"])
+    second = write_schema(tmp_path / "second.json", ["Kernels"])
+
+    info = registry.get(None, first)
+    registry.get(None, second)
+    # only the most recently used one is kept over the budget
+    assert len(registry._entries) == 1
+    # still in use, so it is handed back instead of being loaded again
+    assert registry.get(None, first) is info
+
+    # once unused it is gone and gets loaded again
+    del info
+    registry.get(None, second)
+    gc.collect()
+    assert registry.key(None, first) not in registry._released
+    assert registry.get(None, first).valid()
+
+
+def test_failed_load_not_kept(tmp_path):
+    registry = ExecutableRegistry()
+    info = registry.get(str(tmp_path / "missing-opt"))
+    assert not info.valid()
+    assert registry.executables() == []
+
+
+def write_app_schema(tmp_path):
+    params = {
+        name: {
+            "name": name,
+            "cpp_type": "int",
+            "basic_type": "Integer",
+            "default": "",
+            "description": "",
+            "group_name": "",
+            "required": False,
+        }
+        for name in ("a", "b", "c")
+    }
+    data = {"blocks": {"Mesh": {"parameters": params}}}
+    (tmp_path / "app.json").write_text(json.dumps(data))
+    return str(tmp_path / "app.json")
+
+
+def test_materialized_blocks_counted(tmp_path):
+    registry = ExecutableRegistry()
+    info = registry.get(None, write_app_schema(tmp_path))
+    loaded = registry.memoryUsage()
+    assert loaded > 0
+
+    # building the lazy blocks is counted as it happens
+    assert len(info.path_map["/Mesh"].parameters) == 3
+    assert registry.memoryUsage() == loaded + 3 * info.PARAMETER_BYTES
+
+
+def test_materialized_blocks_counted_from_bundle(tmp_path):
+    built = ExecutableInfo(lazy=True)
+    built.readFromFiles(write_app_schema(tmp_path))
+    for mapped in (False, True):
+        bundle = str(tmp_path / ("app-%s.bundle" % mapped))
+        built.writeBundle(bundle, mapped)
+
+        registry = ExecutableRegistry()
+        info = registry.get(None, bundle)
+        loaded = registry.memoryUsage()
+        assert loaded > 0
+
+        # the blocks that were read are built by the info of the registry
+        mesh = info.path_map["/Mesh"]
+        assert mesh._pending[0].info is info
+        assert len(mesh.parameters) == 3
+        assert registry.memoryUsage() == loaded + 3 * info.PARAMETER_BYTES
@@ -0,0 +1,25 @@
+from peacock_trame.app.core.input import FileCache as file_cache
+
+
+def test_hash_once(tmp_path, monkeypatch):
+    monkeypatch.setenv("PEACOCK_CACHE_DIR", str(tmp_path / "cache"))
+    hashed = []
+    file_hash = file_cache.fileHash
+    monkeypatch.setattr(
+        file_cache, "fileHash", lambda path: hashed.append(path) or file_hash(path)
+    )
+    exe = tmp_path / "app-opt"
+    exe.write_bytes(b"app")
+
+    fc = file_cache.FileCache("test", str(exe))
+    assert fc.dirty and fc.add({"blocks": 1})
+    # checking and then reading the cache only hashes the file once
+    assert not file_cache.FileCache("test", str(exe)).dirty
+    assert file_cache.FileCache("test", str(exe)).read() == {"blocks": 1}
+    assert len(hashed) == 1
+
+    # a changed file is hashed again
+    exe.write_bytes(b"new")
+    fc = file_cache.FileCache("test", str(exe))
+    assert fc.dirty and fc.add({"blocks": 2})
+    assert len(hashed) == 2
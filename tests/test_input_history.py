@@ -0,0 +1,161 @@
+import json
+
+from peacock_trame.app.core.input.ExecutableInfo import ExecutableInfo
+from peacock_trame.app.core.input.InputTree import InputTree
+
+
+def param(name, basic_type="String", default=""):
+    return {
+        "name": name,
+        "cpp_type": "std::string",
+        "basic_type": basic_type,
+        "default": default,
+        "description": "",
+        "group_name": "",
+        "required": False,
+    }
+
+
+SCHEMA = {
+    "blocks": {
+        "Kernels": {
+            "star": {
+                "subblock_types": {
+                    "Diffusion": {
+                        "parameters": {"type": param("type"), "coef": param("coef")}
+                    },
+                    "Reaction": {
+                        "parameters": {"type": param("type"), "rate": param("rate")}
+                    },
+                }
+            }
+        },
+        "Outputs": {"parameters": {"csv": param("csv", "Boolean", "false")}},
+    }
+}
+
+INPUT = "[Kernels]\n[diff]\ntype = Diffusion\ncoef = 1\n[]\n[]\n"
+
+
+def makeTree(tmp_path):
+    path = tmp_path / "schema.json"
+    path.write_text(json.dumps(SCHEMA))
+    info = ExecutableInfo()
+    info.readFromFiles(str(path))
+    tree = InputTree(info)
+    assert tree.setInputFileData(INPUT)
+    return tree
+
+
+def undoAll(tree):
+    while tree.history.canUndo():
+        tree.history.undo()
+
+
+def test_undo_redo(tmp_path):
+    tree = makeTree(tmp_path)
+    history = tree.history
+    original = tree.getInputFileString()
+    assert not history.canUndo()
+
+    diff = tree.getBlockInfo("/Kernels/diff")
+    tree.setParamValue(diff, "coef", "2")
+    tree.setParamValue(diff, "coef", "3")
+    with history.group():
+        new = tree.addUserBlock("/Kernels", "new")
+        tree.setBlockSelected(new.path, True)
+        tree.setBlockType(new.path, "Reaction")
+    tree.renameUserBlock("/Kernels", "diff", "renamed")
+    tree.removeBlock("/Kernels/new")
+    tree.setBlockSelected("/Outputs", True)
+    edited = tree.getInputFileString()
+    assert "renamed" in edited and "coef = 3" in edited and "new" not in edited
+
+    undoAll(tree)
+    assert tree.getInputFileString() == original
+    # the blocks are the same objects
+    assert tree.getBlockInfo("/Kernels/diff") is diff
+    while history.canRedo():
+        history.redo()
+    assert tree.getInputFileString() == edited
+
+    history.undo()
+    history.undo()
+    assert "[new]" in tree.getInputFileString()
+    tree.setParamValue(diff, "coef", "4")
+    assert not history.canRedo()
+
+
+def test_undo_read_input(tmp_path):
+    tree = makeTree(tmp_path)
+    diff = tree.getBlockInfo("/Kernels/diff")
+    assert tree.setInputFileData(INPUT.replace("coef = 1", "coef = 5"))
+    assert tree.getBlockInfo("/Kernels/diff").paramValue("coef") == "5"
+
+    tree.history.undo()
+    assert tree.getBlockInfo("/Kernels/diff") is diff
+    assert diff.paramValue("coef") == "1"
+    tree.history.redo()
+    assert tree.getBlockInfo("/Kernels/diff").paramValue("coef") == "5"
+
+
+def test_update_input_file(tmp_path):
+    tree = makeTree(tmp_path)
+    diff = tree.getBlockInfo("/Kernels/diff")
+    text = INPUT.replace("coef = 1", "coef = 2")
+    edits = tree.updateInputFileData(text)
+    # the value is set on the block that was there
+    assert [type(edit).__name__ for edit in edits] == ["ParamEdit"]
+    assert tree.getBlockInfo("/Kernels/diff") is diff
+    assert diff.paramValue("coef") == "2"
+
+    text = text.replace("[]\n[]", "[]\n[new]\ntype = Reaction\n[]\n[]")
+    tree.updateInputFileData(text)
+    assert tree.getBlockInfo("/Kernels/diff") is diff
+    assert tree.getBlockInfo("/Kernels/new").blockType() == "Reaction"
+
+    full = makeTree(tmp_path)
+    assert full.setInputFileData(text)
+    assert tree.getInputFileString() == full.getInputFileString()
+
+    tree.history.undo()
+    assert tree.getBlockInfo("/Kernels/new") is None
+    # changed since it was read, so it is read again entirely
+    edits = tree.updateInputFileData(text)
+    assert [type(edit).__name__ for edit in edits] == ["RootEdit"]
+    assert tree.getInputFileString() == full.getInputFileString()
+
+
+def test_cached_text(tmp_path):
+    tree = makeTree(tmp_path)
+    tree.addUserBlock("/Kernels", "other")
+    tree.getInputFileString()
+    diff = tree.getBlockInfo("/Kernels/diff")
+    other = tree.getBlockInfo("/Kernels/other")
+    assert diff.rendered is not None and other.rendered is not None
+
+    # only the path to the change is written again
+    tree.setParamValue(diff, "coef", "2")
+    assert diff.rendered is None and tree.root.rendered is None
+    assert other.rendered is not None
+    text = tree.getInputFileString()
+    full = makeTree(tmp_path)
+    assert full.setInputFileData(text)
+    assert text == full.getInputFileString()
+
+    tree.setBlockSelected("/Outputs", True)
+    assert "[Outputs]" in tree.getInputFileString()
+
+
+def test_parse_then_update(tmp_path):
+    tree = makeTree(tmp_path)
+    diff = tree.getBlockInfo("/Kernels/diff")
+    assert tree.parseInputData("[Kernels]\n[diff\n") is None
+
+    # parsing doesn't change the tree, the result is read afterwards
+    input_file = tree.parseInputData(INPUT.replace("coef = 1", "coef = 3"))
+    assert diff.paramValue("coef") == "1"
+    assert [type(edit).__name__ for edit in tree.updateInputFile(input_file)] == [
+        "ParamEdit"
+    ]
+    assert diff.paramValue("coef") == "3"
@@ -0,0 +1,46 @@
+import json
+
+from peacock_trame.app.core.input.JsonData import JsonStreamReader
+
+DOC = {
+    "blocks": {
+        "Kernels": {
+            "description": 'Kernels with "quotes", \\ backslashes and {braces}',
+            "star": {"parameters": {"coef": {"default": "1.5e-3", "options": None}}},
+        },
+        "Mesh": {"types": {"FileMesh": {"parameters": {}}}, "values": [1, 2.5, []]},
+        "Empty": {},
+    },
+    "global": {"number": 12345},
+}
+
+
+def chunked(text, size):
+    return [text[i : i + size] for i in range(0, len(text), size)]
+
+
+def read_blocks(text, size):
+    blocks = []
+    reader = JsonStreamReader(chunked(text, size))
+    data = reader.read(lambda name, block: blocks.append((name, block)))
+    reader.finish()
+    return data, blocks
+
+
+def test_stream_with_markers():
+    text = (
+        "Some banner output\n**START JSON DATA**\n"
+        + json.dumps(DOC, indent=2)
+        + "\n**END JSON DATA**\ntrailing output\n"
+    )
+    for size in [1, 2, 3, 7, 64, len(text)]:
+        data, blocks = read_blocks(text, size)
+        assert blocks == list(DOC["blocks"].items())
+        assert data == {"blocks": {}, "global": DOC["global"]}
+
+
+def test_plain_json_keeps_blocks():
+    text = json.dumps(DOC)
+    for size in [1, 5, len(text)]:
+        reader = JsonStreamReader(chunked(text, size))
+        assert reader.read() == DOC
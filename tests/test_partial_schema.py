@@ -0,0 +1,97 @@
+import json
+import os
+import stat
+import sys
+
+from peacock_trame.app.core.input.ExecutableRegistry import ExecutableRegistry
+from peacock_trame.app.core.input.InputTree import InputTree
+
+APP = """#!%s
+import fnmatch, json, sys
+args = sys.argv[1:]
+with open(%r, "a") as f:
+    f.write(" ".join(args) + "\\n")
+data = json.loads(%r)
+if "--syntax" in args:
+    print("**START SYNTAX DATA**")
+    for name, block in data["blocks"].items():
+        print(name)
+        if "star" in block:
+            print(name + "/*")
+    print("**END SYNTAX DATA**")
+elif "--json" in args:
+    search = (args[args.index("--json") + 1 :] + [""])[0]
+    if search and not search.startswith("-"):
+        data["blocks"] = {
+            n: b for n, b in data["blocks"].items() if fnmatch.fnmatch(n, search)
+        }
+    print("**START JSON DATA**")
+    print(json.dumps(data))
+    print("**END JSON DATA**")
+"""
+
+
+def param(name, default=""):
+    return {
+        "name": name,
+        "cpp_type": "std::string",
+        "basic_type": "String",
+        "default": default,
+        "description": "The %s" % name,
+        "group_name": "",
+        "required": False,
+    }
+
+
+def system(name):
+    return {
+        "description": "The %s system" % name,
+        "star": {
+            "subblock_types": {
+                name[:-1]: {
+                    "parameters": {"type": param("type"), "value": param("value")}
+                }
+            }
+        },
+    }
+
+
+def write_app(tmp_path):
+    data = {"blocks": {name: system(name) for name in ("Kernels", "BCs", "Variables")}}
+    log = tmp_path / "app.log"
+    app = tmp_path / "app-opt"
+    app.write_text(APP % (sys.executable, str(log), json.dumps(data)))
+    app.chmod(app.stat().st_mode | stat.S_IEXEC)
+    return str(app), log
+
+
+def test_partial(tmp_path, monkeypatch):
+    monkeypatch.setenv("PEACOCK_CACHE_DIR", str(tmp_path / "cache"))
+    app, log = write_app(tmp_path)
+    registry = ExecutableRegistry()
+    info = registry.getPartial(app, ["Kernels"])
+    assert info.partial
+    assert registry.executables() == []
+    assert log.read_text().splitlines() == [
+        "-options_left 0 --syntax",
+        "-options_left 0 --json Kernels*",
+    ]
+    assert info.path_map["/"].children_list == ["Kernels", "BCs", "Variables"]
+
+    tree = InputTree(info)
+    assert tree.setInputFileData("[Kernels]\n[k]\ntype = Kernel\nvalue = 1\n[]\n[]\n")
+    assert "--json BCs*" not in log.read_text()
+
+    # the other blocks are fetched in the background, using one waits for it
+    info.fetchRemaining()
+    bcs = tree.getBlockInfo("/BCs")
+    assert list(bcs.star_node.types) == ["BC"]
+    assert bcs.description == "The BCs system"
+    assert "-options_left 0 --json BCs*" in log.read_text().splitlines()
+    assert not os.path.exists(tmp_path / "cache")
+
+    full = registry.get(app)
+    assert not full.partial
+    assert tree.migrate(full) == []
+    # the whole syntax is cached, no need to fetch part of it anymore
+    assert registry.getPartial(app, ["Kernels"]) is full
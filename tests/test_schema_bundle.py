@@ -0,0 +1,28 @@
+import pytest
+
+from peacock_trame.app.core.common.PeacockException import BadSchemaException
+from peacock_trame.app.core.input import SchemaBundle
+
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / "app.schema")
+    data = {"path": "/some/app-opt", "path_map": {"/": [1, 2, 3]}}
+    SchemaBundle.writeBundle(path, data, 3)
+    assert SchemaBundle.isBundle(path)
+    assert SchemaBundle.readBundle(path, 3) == data
+
+
+def test_version_mismatch(tmp_path):
+    path = str(tmp_path / "app.schema")
+    SchemaBundle.writeBundle(path, {}, 3)
+    with pytest.raises(BadSchemaException):
+        SchemaBundle.readBundle(path, 4)
+
+
+def test_not_a_bundle(tmp_path):
+    path = tmp_path / "app.json"
+    path.write_text('{"blocks": {}}')
+    assert not SchemaBundle.isBundle(str(path))
+    assert not SchemaBundle.isBundle(str(tmp_path / "missing"))
+    with pytest.raises(BadSchemaException):
+        SchemaBundle.readBundle(str(path), 3)
@@ -0,0 +1,99 @@
+import copy
+import json
+
+from peacock_trame.app.core.input.ExecutableInfo import ExecutableInfo
+from peacock_trame.app.core.input.SchemaDiff import SchemaChange, SchemaDiff
+
+
+def param(cpp_type="double", basic_type="Real", default="0", options=None):
+    data = {
+        "cpp_type": cpp_type,
+        "basic_type": basic_type,
+        "default": default,
+        "required": False,
+        "group_name": "",
+        "description": "",
+    }
+    if options:
+        data["options"] = options
+    return data
+
+
+SCHEMA = {
+    "blocks": {
+        "Kernels": {
+            "star": {
+                "subblock_types": {
+                    "Diffusion": {"parameters": {"coef": param()}},
+                    "Reaction": {"parameters": {"rate": param(default="1")}},
+                }
+            }
+        },
+        "Executioner": {
+            "types": {
+                "Steady": {
+                    "parameters": {
+                        "solve_type": param(
+                            "MooseEnum", "String", "NEWTON", "NEWTON PJFNK"
+                        )
+                    }
+                }
+            }
+        },
+        "Outputs": {"parameters": {"csv": param("bool", "Boolean", "0")}},
+    }
+}
+
+
+def addNames(data):
+    for key, val in data.items():
+        if isinstance(val, dict):
+            if key == "parameters":
+                for name, p in val.items():
+                    p["name"] = name
+            addNames(val)
+    return data
+
+
+def load(tmp_path, data, lazy):
+    data = addNames(copy.deepcopy(data))
+    path = tmp_path / ("schema%s.json" % len(list(tmp_path.iterdir())))
+    path.write_text(json.dumps(data))
+    info = ExecutableInfo(lazy=lazy)
+    info.readFromFiles(str(path))
+    return info
+
+
+def changes(diff):
+    return sorted((c.kind, c.path) for c in diff.changes)
+
+
+def test_same_schema(tmp_path):
+    old = load(tmp_path, SCHEMA, False)
+    new = load(tmp_path, SCHEMA, True)
+    assert SchemaDiff(old, new).isEmpty()
+
+
+def test_changes(tmp_path):
+    data = copy.deepcopy(SCHEMA)
+    types = data["blocks"]["Kernels"]["star"]["subblock_types"]
+    del types["Reaction"]
+    types["Diffusion"]["parameters"]["coef"]["cpp_type"] = "int"
+    types["Diffusion"]["parameters"]["coef"]["description"] = "Only the doc changed"
+    steady = data["blocks"]["Executioner"]["types"]["Steady"]
+    steady["parameters"]["solve_type"]["options"] = "NEWTON"
+    steady["parameters"]["solve_type"]["default"] = "PJFNK"
+    data["blocks"]["Outputs"]["parameters"] = {"exodus": param("bool", "Boolean")}
+    data["blocks"]["Mesh"] = {}
+
+    for lazy in (False, True):
+        diff = SchemaDiff(load(tmp_path, SCHEMA, lazy), load(tmp_path, data, lazy))
+        assert changes(diff) == [
+            (SchemaChange.BLOCK_ADDED, "/Mesh"),
+            (SchemaChange.DEFAULT_CHANGED, "/Executioner/Steady/solve_type"),
+            (SchemaChange.OPTIONS_CHANGED, "/Executioner/Steady/solve_type"),
+            (SchemaChange.PARAM_ADDED, "/Outputs/exodus"),
+            (SchemaChange.PARAM_REMOVED, "/Outputs/csv"),
+            (SchemaChange.PARAM_RETYPED, "/Kernels/*/Diffusion/coef"),
+            (SchemaChange.TYPE_REMOVED, "/Kernels/*/Reaction"),
+        ]
@@ -0,0 +1,149 @@
+import json
+import pickle
+
+from peacock_trame.app.core.input.ExecutableInfo import ExecutableInfo
+from peacock_trame.app.core.input.InputTree import InputTree
+
+
+def param(name, cpp_type):
+    return {
+        "name": name,
+        "cpp_type": cpp_type,
+        "basic_type": "String",
+        "default": "",
+        "required": False,
+        "group_name": "",
+        "description": "",
+    }
+
+
+SCHEMA = {
+    "blocks": {
+        "BCs": {
+            "star": {
+                "subblock_types": {
+                    "DirichletBC": {
+                        "description": "Imposes the essential boundary condition",
+                        "parameters": {
+                            "boundary": param("boundary", "std::vector<BoundaryName>"),
+                            "value": param("value", "double"),
+                        },
+                    },
+                    "NeumannBC": {
+                        "parameters": {
+                            "boundary": param("boundary", "std::vector<BoundaryName>")
+                        }
+                    },
+                }
+            }
+        },
+        "UserObjects": {
+            "star": {
+                "associated_types": ["UserObjectName"],
+                "subblock_types": {"Terminator": {"parameters": {}}},
+            }
+        },
+        "Executioner": {
+            "types": {
+                "Steady": {
+                    "parameters": {"solve_type": param("solve_type", "MooseEnum")}
+                }
+            },
+            "actions": {
+                "CreateExecutionerAction": {
+                    "parameters": {"solve_type": param("solve_type", "MooseEnum")}
+                }
+            },
+        },
+    }
+}
+
+
+def test_index(tmp_path):
+    path = tmp_path / "schema.json"
+    path.write_text(json.dumps(SCHEMA))
+    for lazy in (False, True):
+        info = ExecutableInfo(lazy=lazy)
+        info.readFromFiles(str(path))
+        index = pickle.loads(pickle.dumps(info.index))
+
+        assert index.blocksForType("DirichletBC") == ["/BCs/*"]
+        assert index.blocksForType("Steady") == ["/Executioner"]
+        assert index.blocksForType("Missing") == ()
+        assert index.parameterOwners("boundary") == [
+            "/BCs/*/DirichletBC",
+            "/BCs/*/NeumannBC",
+        ]
+        assert sorted(index.parameterOwners("solve_type")) == [
+            "/Executioner",
+            "/Executioner/Steady",
+        ]
+        assert index.parametersOfCppType("double") == [("/BCs/*/DirichletBC", "value")]
+        assert index.associatedBlocks("UserObjectName") == ["/UserObjects"]
+        assert info.type_to_block_map == {"UserObjectName": ["/UserObjects"]}
+
+
+def test_search(tmp_path):
+    path = tmp_path / "schema.json"
+    path.write_text(json.dumps(SCHEMA))
+    info = ExecutableInfo(lazy=True)
+    info.readFromFiles(str(path))
+    search = pickle.loads(pickle.dumps(info.index.search))
+
+    def found(query):
+        return [(p, name) for p, name, score in search.search(query)]
+
+    assert found("essential boundary")[0] == ("/BCs/*/DirichletBC", "")
+    # words of the names, the whole name and the start of the last word
+    assert found("dirichlet") == [("/BCs/*/DirichletBC", "")]
+    assert found("dirichletbc ") == [("/BCs/*/DirichletBC", "")]
+    assert sorted(found("solve typ")) == [
+        ("/Executioner", "solve_type"),
+        ("/Executioner/Steady", "solve_type"),
+    ]
+    assert found("essential missing") == []
+    assert found("the") == []
+
+    block = info.findBlock("/BCs/*/DirichletBC")
+    assert block.description == "Imposes the essential boundary condition"
+    assert "boundary" in block.parameters
+
+
+def test_workers(tmp_path):
+    path = tmp_path / "schema.json"
+    path.write_text(json.dumps(SCHEMA))
+    for lazy in (False, True):
+        info = ExecutableInfo(lazy=lazy)
+        info.readFromFiles(str(path))
+        pooled = ExecutableInfo(lazy=lazy, workers=2)
+        pooled.readFromFiles(str(path))
+
+        assert pooled.fingerprints == info.fingerprints
+        assert pooled.dumpDefaultTree() == info.dumpDefaultTree()
+        assert pooled.type_to_block_map == info.type_to_block_map
+        assert pooled.index.parameter_owners == info.index.parameter_owners
+        assert pooled.search("boundary") == info.search("boundary")
+        assert pooled.timings["total"] >= pooled.timings["merge"]
+        block = pooled.findBlock("/BCs/*/DirichletBC")
+        assert "value" in block.parameters
+        pickle.dumps(pooled.toPickle())
+
+
+def test_moved_type(tmp_path):
+    path = tmp_path / "schema.json"
+    path.write_text(json.dumps(SCHEMA))
+    old = ExecutableInfo()
+    old.readFromFiles(str(path))
+    schema = json.loads(json.dumps(SCHEMA))
+    bcs = schema["blocks"]["BCs"]["star"]["subblock_types"]
+    schema["blocks"]["FVBCs"] = {"star": {"subblock_types": {"NeumannBC": {}}}}
+    del bcs["NeumannBC"]
+    path.write_text(json.dumps(schema))
+    new = ExecutableInfo()
+    new.readFromFiles(str(path))
+
+    tree = InputTree(old)
+    assert tree.setInputFileData("[BCs]\n[left]\ntype = NeumannBC\n[]\n[]\n")
+    assert tree.migrate(new) == [
+        "Type NeumannBC of /BCs/left no longer exists, it can now go in /FVBCs/*"
+    ]
@@ -0,0 +1,58 @@
+import json
+import pickle
+from array import array
+
+from peacock_trame.app.core.input import SchemaBundle, SchemaStore
+from peacock_trame.app.core.input.ExecutableInfo import ExecutableInfo
+
+
+def test_round_trip(tmp_path):
+    blob = bytes(range(256)) * 64
+    postings = array("I", range(5000))
+    data = {"blob": blob, "again": blob, "postings": postings, "small": b"abc"}
+    path = str(tmp_path / "store")
+    with open(path, "wb") as f:
+        f.write(b"header")
+        SchemaStore.dump(f, data)
+
+    loaded = SchemaStore.load(path, len(b"header"))
+    # big buffers are mapped, the same buffer only once
+    assert isinstance(loaded["blob"], memoryview)
+    assert loaded["blob"] is loaded["again"]
+    assert loaded["blob"] == blob
+    assert loaded["postings"].format == "I"
+    assert loaded["postings"].tolist() == postings.tolist()
+    assert loaded["small"] == b"abc"
+
+    # mapped buffers are copied when pickled the regular way
+    copied = pickle.loads(SchemaStore.dumps(loaded))
+    assert copied == data
+    assert SchemaStore.privateSize(loaded) < len(blob)
+
+
+def test_mapped_bundle(tmp_path):
+    schema = {
+        "blocks": {
+            "Kernels": {
+                "description": "Kernels " + "x" * 5000,
+                "star": {"subblock_types": {"Diffusion": {"parameters": {}}}},
+            }
+        }
+    }
+    json_file = tmp_path / "app.json"
+    json_file.write_text(json.dumps(schema))
+    info = ExecutableInfo(lazy=True)
+    info.readFromFiles(str(json_file))
+
+    path = str(tmp_path / "app.schema")
+    info.writeBundle(path, mapped=True)
+    mapped = ExecutableInfo(lazy=True)
+    mapped.readFromBundle(path)
+    assert list(mapped.path_map["/Kernels"].star_node.types) == ["Diffusion"]
+    assert mapped.search("diffusion")[0][0] == "/Kernels/*/Diffusion"
+
+    # and written back to a regular bundle
+    SchemaBundle.writeBundle(path, mapped.toPickle(), mapped.CACHE_VERSION)
+    info = ExecutableInfo(lazy=True)
+    info.readFromBundle(path)
+    assert list(info.path_map["/Kernels"].star_node.types) == ["Diffusion"]
@@ -0,0 +1,29 @@
+from peacock_trame.app.core.common.TextBuffer import TextBuffer
+
+TEXT = "[Kernels]\n  [diff]\n    coef = 1\n  []\n[]\n"
+
+
+def test_changes():
+    buf = TextBuffer(TEXT)
+    assert buf.lineCount() == 6 and buf.length == len(TEXT)
+
+    # typing on a line
+    assert buf.applyChanges([[2, 11, 2, 12, "25"]], len(TEXT)) == (2, 2)
+    assert buf.line(2) == "    coef = 25" and buf.length == len(TEXT) + 1
+
+    # a block pasted after diff and a line removed, applied one after the other
+    changes = [[3, 4, 3, 4, "\n  [new]\n  []"], [0, 9, 1, 8, ""]]
+    assert buf.applyChanges(changes) == (0, 4)
+    text = "[Kernels]\n    coef = 25\n  []\n  [new]\n  []\n[]\n"
+    assert buf.text() == text and buf.length == len(text)
+
+    # not the text the changes were made to
+    assert buf.applyChanges([[0, 0, 0, 0, "#"]], len(TEXT)) is None
+    assert buf.applyChanges([[9, 0, 9, 0, "#"]]) is None
+
+
+def test_utf16_columns():
+    # characters outside of the basic plane take two columns in the browser
+    buf = TextBuffer("# \U0001f99a peacock\n")
+    buf.applyChange(0, 5, 0, 12, "bird")
+    assert buf.text() == "# \U0001f99a bird\n" and buf.length == 10
@@ -0,0 +1,30 @@
+from peacock_trame.app.core.common.utils import text_edits
+
+
+def apply(text, edits):
+    # the offsets are in UTF-16 code units and refer to the original text
+    data = text.encode("utf-16-le")
+    parts, pos = [], 0
+    for start, end, new in edits:
+        assert pos <= start <= end
+        parts += [data[2 * pos : 2 * start], new.encode("utf-16-le")]
+        pos = end
+    parts.append(data[2 * pos :])
+    return b"".join(parts).decode("utf-16-le")
+
+
+def test_text_edits():
+    old = "[Kernels]\n  [diff]\n    coef = 1\n  []\n[]\n"
+    assert text_edits(old, old) == []
+    new = old.replace("coef = 1", "coef = 25")
+    assert text_edits(old, new) == [[30, 31, "25"]]
+
+    new = old.replace("[]\n[]", "[]\n  [new]\n  []\n[]").replace("[diff]", "[d]")
+    edits = text_edits(old, new)
+    assert len(edits) == 2 and apply(old, edits) == new
+
+    # characters outside of the basic plane count twice in the browser
+    old = "# \U0001f99a\nx = 1\n"
+    assert text_edits(old, old.replace("1", "2")) == [[9, 10, "2"]]
+    for new in ["", "x = 1\n", "# é\n" + old, old * 3]:
+        assert apply(old, text_edits(old, new)) == new
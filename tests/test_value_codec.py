@@ -0,0 +1,45 @@
+import pickle
+
+from peacock_trame.app.core.input.ParameterInfo import (
+    ParameterInfo,
+    ParameterSchema,
+    parseValue,
+)
+from peacock_trame.app.core.input.ValueCodec import NumericArray
+
+
+def param(basic_type, value):
+    pinfo = ParameterInfo(None, "x")
+    pinfo.schema = ParameterSchema.get(
+        cpp_type="std::vector<double>", basic_type=basic_type, default="1 2"
+    )
+    pinfo.setValue(value)
+    return pinfo
+
+
+def test_numeric_arrays():
+    value = parseValue("Array:Real", "0 1e-3 2.5 -0.0 inf")
+    assert type(value) is NumericArray
+    assert value == [0.0, 0.001, 2.5, -0.0, float("inf")]
+    assert param("Array:Real", "0 1e-3 2.5").inputFileValue() == "'0.0 0.001 2.5'"
+    assert param("Array:Integer", [1, "007"]).inputFileValue() == "'1 7'"
+
+    assert not param("Array:Real", "1.0 2").hasChanged()
+    assert param("Array:Real", "1 2 3").hasChanged()
+
+    value = parseValue("Array:Integer", "1 2 3")
+    assert pickle.loads(pickle.dumps(value)) == value
+    assert value[1] == 2 and list(value) == [1, 2, 3] and repr(value) == "[1, 2, 3]"
+
+
+def test_numeric_array_fallback():
+    # out of range for numpy, kept as python integers
+    value = parseValue("Array:Integer", "1 99999999999999999999")
+    assert value == [1, 99999999999999999999]
+    assert param("Array:Integer", value).inputFileValue() == "'1 99999999999999999999'"
+
+    try:
+        parseValue("Array:Real", "1 ${x}")
+        assert False
+    except ValueError:
+        pass
@@ -28,17 +28,48 @@ window.setImmediate = window.setTimeout;
 
 export default {
   name: 'Editor',
-  props: ['contents', 'filepath'],
+  props: ['contents', 'edits', 'filepath'],
   watch: {
     contents(contents) {
       this.valueSetFromParent = true;
       this.editor.setValue(contents);
     },
+    edits(edits) {
+      if (!edits || !this.editor) return;
+      const model = this.editor.getModel();
+      // no base when the edits follow the previous ones sent here
+      const base =
+        edits.base === null
+          ? this.applied.edits === edits.version - 1 && this.applied.version
+          : edits.base;
+      if (!edits.edits.length || model.getVersionId() !== base) {
+        // changed here since the server computed the edits
+        this.$emit('resync', {
+          version: model.getVersionId(),
+          text: model.getValue(),
+        });
+        return;
+      }
+      // all the offsets are in the text before the edits
+      const operations = edits.edits.map(([start, end, text]) => ({
+        range: monaco.Range.fromPositions(
+          model.getPositionAt(start),
+          model.getPositionAt(end)
+        ),
+        text,
+        forceMoveMarkers: true,
+      }));
+      this.valueSetFromParent = edits.version;
+      // undoable, unlike setValue, and the cursor stays where it is
+      this.editor.executeEdits('peacock', operations);
+    },
   },
   data() {
     return {
       editor: undefined,
       valueSetFromParent: false,
+      // last edits of the server applied and the version they left
+      applied: { edits: undefined, version: undefined },
     };
   },
   methods: {
@@ -181,10 +212,40 @@ export default {
     MonacoServices.install(monaco);
     this.connectToLangServer();
 
-    this.editor.onDidChangeModelContent(() => {
-      if (!this.valueSetFromParent)
-        this.$emit('change', this.editor.getValue());
-      else this.valueSetFromParent = false;
+    let version = this.editor.getModel().getVersionId();
+    this.editor.onDidChangeModelContent((event) => {
+      const base = version;
+      version = event.versionId;
+      if (this.valueSetFromParent !== false) {
+        const edits = this.valueSetFromParent;
+        this.valueSetFromParent = false;
+        if (edits === true) return;
+        this.applied = { edits, version };
+        this.$emit('change', { version, edits });
+        return;
+      }
+      // only the ranges that changed, applied one after the other
+      // like the content changes of the language server protocol
+      const changes = event.changes.map(({ range, text }) => [
+        range.startLineNumber - 1,
+        range.startColumn - 1,
+        range.endLineNumber - 1,
+        range.endColumn - 1,
+        text,
+      ]);
+      // length of the text the changes were made to
+      const length = event.changes.reduce(
+        (length, change) => length - change.text.length + change.rangeLength,
+        this.editor.getModel().getValueLength()
+      );
+      this.$emit('change', { version, base, length, changes });
+    });
+    // the server may have changed the text since the contents were set,
+    // and the versions start over with this model
+    this.$emit('resync', {
+      version,
+      text: this.editor.getValue(),
+      mounted: true,
     });
   },
   inject: ['trame'],